@@ -1,14 +1,43 @@
+import os
+
 import dash
 from dash import html, dcc, page_container
 
+from utilidades.arranque import PerfilArranque
+from utilidades import metricas
+
+perfil = PerfilArranque()
+
+# pages_folder="" : las páginas se importan abajo, una a una, para medir
+# el arranque. Sus dependencias pesadas se cargan en el primer uso.
 app = dash.Dash(
     __name__,
     use_pages=True,
+    pages_folder="",
     suppress_callback_exceptions=True
 )
 
 server = app.server
 
+# latencia y tamaño de respuesta por callback, en /metrics (Prometheus)
+metricas.registrar(server)
+
+# ----------------------------------------------------------
+# CARGA DE PÁGINAS Y PERFIL DE ARRANQUE
+# ----------------------------------------------------------
+perfil.importar_paginas(os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages"))
+perfil.medir_layouts(dash.page_registry)
+
+# PRECARGAR_PAGINAS=1 construye todas las páginas al arrancar (workers
+# que prefieren pagar el coste antes de la primera visita)
+if os.environ.get("PRECARGAR_PAGINAS") == "1":
+    perfil.precargar(dash.page_registry)
+
+
+@server.route("/_arranque")
+def reporte_arranque():
+    return perfil.reporte(), 200, {"Content-Type": "text/plain; charset=utf-8"}
+
 # ----------------------------------------------------------
 # ORDENAR PÁGINAS: "inicio" debe aparecer primero
 # ----------------------------------------------------------
@@ -57,4 +86,5 @@ app.layout = html.Div(className="app-container", children=[
 # EJECUCIÓN
 # ----------------------------------------------------------
 if __name__ == "__main__":
+    print(perfil.reporte())
     app.run(debug=True)
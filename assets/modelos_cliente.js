@@ -0,0 +1,227 @@
+// ------------------------------------------------------
+// Modelos baratos evaluados en el navegador (clientside callbacks)
+// ------------------------------------------------------
+// Mismas cuentas que modelos/sir.py y crecimiento_poblacion.py: el
+// navegador calcula las curvas y solo reemplaza los datos de las trazas
+// de la figura base (Patch), sin pasar por el servidor. Cada función
+// recibe al final la figura actual (utilidades/cliente.py), que solo se
+// usa si esta versión de Dash no tiene dash_clientside.Patch.
+
+(function () {
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        modelos: {
+            crecimiento: function (r, P0, tmax, figura) {
+                if ([r, P0, tmax].some(v => v === null || v === undefined)) {
+                    return window.dash_clientside.no_update;
+                }
+                const t = linspace(0, tmax, 200);
+                const P = t.map(ti => P0 * Math.exp(r * ti));
+                return nuevoParche(figura)
+                    .assign(["data", 0, "x"], t)
+                    .assign(["data", 0, "y"], P)
+                    .build();
+            },
+
+            sir: function (beta, gamma, S0, I0, R0, tol, figura) {
+                if ([beta, gamma, S0, I0, R0, tol].some(v => v === null || v === undefined)) {
+                    return [window.dash_clientside.no_update, window.dash_clientside.no_update];
+                }
+                // Dormand–Prince 5(4) adaptativo, tmax = 60, como sir_adaptativo,
+                // y la curva reducida con LTTB como indices_lttb_varias
+                const res = sirAdaptativo(beta, gamma, S0, I0, R0, 60, tol, 8);
+                const k = indicesLttbVarias(res.t, [res.S, res.I, res.R], PUNTOS_GRAFICO);
+                const t = k.map(j => res.t[j]);
+                const parche = nuevoParche(figura);
+                [res.S, res.I, res.R].forEach((serie, n) => {
+                    parche.assign(["data", n, "x"], t).assign(["data", n, "y"], k.map(j => serie[j]));
+                });
+                return [parche.build(), textoEstadisticas(res.estadisticas)];
+            }
+        }
+    });
+
+    // tablero de Butcher, error local y salida densa: los de modelos/sir.py
+    const A21 = 1 / 5;
+    const A31 = 3 / 40, A32 = 9 / 40;
+    const A41 = 44 / 45, A42 = -56 / 15, A43 = 32 / 9;
+    const A51 = 19372 / 6561, A52 = -25360 / 2187, A53 = 64448 / 6561, A54 = -212 / 729;
+    const A61 = 9017 / 3168, A62 = -355 / 33, A63 = 46732 / 5247, A64 = 49 / 176, A65 = -5103 / 18656;
+    const A71 = 35 / 384, A73 = 500 / 1113, A74 = 125 / 192, A75 = -2187 / 6784, A76 = 11 / 84;
+    const E1 = 71 / 57600, E3 = -71 / 16695, E4 = 71 / 1920, E5 = -17253 / 339200, E6 = 22 / 525, E7 = -1 / 40;
+    const D1 = -12715105075 / 11282082432, D3 = 87487479700 / 32700410799, D4 = -10690763975 / 1880347072;
+    const D5 = 701980252875 / 199316789632, D6 = -1453857185 / 822651844, D7 = 69997945 / 29380423;
+
+    // PASOS_MAXIMO de modelos/sir.py y ANCHO_PX de utilidades/submuestreo.py
+    const PASOS_MAXIMO = 2000;
+    const PUNTOS_GRAFICO = 1000;
+
+    // misma secuencia de operaciones que sir_adaptativo (modelos/sir.py)
+    function sirAdaptativo(beta, gamma, S0, I0, R0, tmax, tol, muestras) {
+        const total = S0 + I0 + R0;
+        const f = (s, i) => {
+            const contagio = beta * s * i;
+            return [-contagio, contagio - gamma * i];
+        };
+        let s = S0, i = I0;
+        let [ks1, ki1] = f(s, i);
+        let t = 0.0, h = tmax / 100;
+        let pasos = 0, rechazados = 0, nfev = 1, errorMax = 0.0;
+        const T = [], S = [], I = [];
+
+        while (t < tmax && pasos + rechazados < PASOS_MAXIMO) {
+            h = Math.min(h, tmax - t);
+            const [ks2, ki2] = f(s + h * (A21 * ks1), i + h * (A21 * ki1));
+            const [ks3, ki3] = f(s + h * (A31 * ks1 + A32 * ks2), i + h * (A31 * ki1 + A32 * ki2));
+            const [ks4, ki4] = f(s + h * (A41 * ks1 + A42 * ks2 + A43 * ks3),
+                                 i + h * (A41 * ki1 + A42 * ki2 + A43 * ki3));
+            const [ks5, ki5] = f(s + h * (A51 * ks1 + A52 * ks2 + A53 * ks3 + A54 * ks4),
+                                 i + h * (A51 * ki1 + A52 * ki2 + A53 * ki3 + A54 * ki4));
+            const [ks6, ki6] = f(s + h * (A61 * ks1 + A62 * ks2 + A63 * ks3 + A64 * ks4 + A65 * ks5),
+                                 i + h * (A61 * ki1 + A62 * ki2 + A63 * ki3 + A64 * ki4 + A65 * ki5));
+            const sNuevo = s + h * (A71 * ks1 + A73 * ks3 + A74 * ks4 + A75 * ks5 + A76 * ks6);
+            const iNuevo = i + h * (A71 * ki1 + A73 * ki3 + A74 * ki4 + A75 * ki5 + A76 * ki6);
+            const [ks7, ki7] = f(sNuevo, iNuevo);
+            nfev += 6;
+
+            const errorS = h * (E1 * ks1 + E3 * ks3 + E4 * ks4 + E5 * ks5 + E6 * ks6 + E7 * ks7);
+            const errorI = h * (E1 * ki1 + E3 * ki3 + E4 * ki4 + E5 * ki5 + E6 * ki6 + E7 * ki7);
+            const err = Math.max(Math.abs(errorS) / (tol * (1.0 + Math.max(Math.abs(s), Math.abs(sNuevo)))),
+                                 Math.abs(errorI) / (tol * (1.0 + Math.max(Math.abs(i), Math.abs(iNuevo)))));
+
+            if (err <= 1.0) {
+                const densoS = h * (D1 * ks1 + D3 * ks3 + D4 * ks4 + D5 * ks5 + D6 * ks6 + D7 * ks7);
+                const densoI = h * (D1 * ki1 + D3 * ki3 + D4 * ki4 + D5 * ki5 + D6 * ki6 + D7 * ki7);
+                for (let m = 0; m < muestras; m++) {
+                    const theta = m / muestras;
+                    T.push(t + h * theta);
+                    S.push(denso(theta, h, s, sNuevo, ks1, ks7, densoS));
+                    I.push(denso(theta, h, i, iNuevo, ki1, ki7, densoI));
+                }
+                t += h;
+                pasos += 1;
+                s = sNuevo; i = iNuevo; ks1 = ks7; ki1 = ki7;
+                errorMax = Math.max(errorMax, Math.abs(errorS), Math.abs(errorI));
+            } else if (Number.isNaN(err)) {
+                break;
+            } else {
+                rechazados += 1;
+            }
+            h *= err > 0 ? Math.min(5.0, Math.max(0.2, 0.9 * Math.pow(err, -0.2))) : 5.0;
+            if (h < 1e-12 * tmax) {
+                break;
+            }
+        }
+        T.push(t); S.push(s); I.push(i);
+        return {
+            t: T, S: S, I: I, R: S.map((sk, k) => total - sk - I[k]),
+            estadisticas: {pasos: pasos, rechazados: rechazados, nfev: nfev, error_max: errorMax,
+                           t_final: t, tmax: tmax},
+        };
+    }
+
+    // como texto_estadisticas_rk
+    function textoEstadisticas(e) {
+        let texto = `Dormand–Prince 5(4): ${e.pasos} pasos (${e.rechazados} rechazados) · ` +
+            `evaluaciones f: ${e.nfev} · error local estimado máx.: ${exponencial(e.error_max)}`;
+        if (e.t_final < e.tmax) {
+            texto += ` · detenido en t = ${Number(e.t_final.toPrecision(3))} de ${e.tmax} ` +
+                `(máximo de ${PASOS_MAXIMO} pasos; β muy grande)`;
+        }
+        return texto;
+    }
+
+    // LTTB como indices_lttb (utilidades/submuestreo.py): el primer y el
+    // último punto y, en cada tramo, el de mayor triángulo con sus vecinos
+    function indicesLttb(x, y, n) {
+        const N = y.length;
+        if (n >= N || n < 3) {
+            return Array.from({length: N}, (_, j) => j);
+        }
+        const bordes = Array.from({length: n - 1}, (_, j) => Math.floor(j * (N - 2) / (n - 2)) + 1);
+        bordes[n - 2] = N - 1;
+        const idx = [0];
+        let a = 0;
+        for (let j = 0; j < n - 2; j++) {
+            const lo = bordes[j], hi = bordes[j + 1];
+            const [sigLo, sigHi] = j + 2 < bordes.length ? [bordes[j + 1], bordes[j + 2]] : [N - 1, N];
+            let mx = 0, my = 0, finitos = 0;
+            for (let m = sigLo; m < sigHi; m++) {
+                mx += x[m];
+                if (Number.isFinite(y[m])) {
+                    my += y[m];
+                    finitos += 1;
+                }
+            }
+            mx /= sigHi - sigLo;
+            my = finitos ? my / finitos : y[a];
+
+            const ax = x[a], ay = y[a];
+            let mejor = lo, areaMejor = -Infinity;
+            for (let m = lo; m < hi; m++) {
+                let area = Math.abs((ax - mx) * (y[m] - ay) - (ax - x[m]) * (my - ay));
+                area = Number.isFinite(area) ? area : -1.0;
+                if (area > areaMejor) {
+                    mejor = m;
+                    areaMejor = area;
+                }
+            }
+            a = mejor;
+            idx.push(a);
+        }
+        idx.push(N - 1);
+        return idx;
+    }
+
+    // como indices_lttb_varias: unión ordenada de los índices de cada serie
+    function indicesLttbVarias(x, ys, n) {
+        const union = new Set();
+        ys.forEach(y => indicesLttb(x, y, n).forEach(j => union.add(j)));
+        return Array.from(union).sort((p, q) => p - q);
+    }
+
+    // salida densa de orden 4 del paso (y0 -> y1) en t0 + θh
+    function denso(theta, h, y0, y1, k1, k7, d) {
+        const r2 = y1 - y0;
+        const r3 = h * k1 - r2;
+        const r4 = r2 - h * k7 - r3;
+        return y0 + theta * (r2 + (1 - theta) * (r3 + theta * (r4 + (1 - theta) * d)));
+    }
+
+    // como el formato ".1e" de Python (exponente con al menos dos cifras)
+    function exponencial(x) {
+        return x.toExponential(1).replace(/e([+-])(\d)$/, "e$10$2");
+    }
+
+    // Patch de Dash si existe; si no, las mismas asignaciones sobre una
+    // copia de la figura actual, y build() devuelve la figura completa
+    function nuevoParche(figura) {
+        if (window.dash_clientside.Patch) {
+            return new window.dash_clientside.Patch();
+        }
+        const copia = JSON.parse(JSON.stringify(figura || {data: [], layout: {}}));
+        return {
+            assign(ruta, valor) {
+                let destino = copia;
+                ruta.slice(0, -1).forEach(clave => {
+                    if (destino[clave] === undefined || destino[clave] === null) {
+                        destino[clave] = {};
+                    }
+                    destino = destino[clave];
+                });
+                destino[ruta[ruta.length - 1]] = valor;
+                return this;
+            },
+            build() {
+                return copia;
+            }
+        };
+    }
+
+    // como numpy.linspace: paso (fin - inicio) / (n - 1) y el último punto exacto
+    function linspace(inicio, fin, n) {
+        const paso = (fin - inicio) / (n - 1);
+        const t = Array.from({length: n}, (_, k) => inicio + k * paso);
+        t[n - 1] = fin;
+        return t;
+    }
+})();
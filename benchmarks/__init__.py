@@ -0,0 +1 @@
+# Mediciones de rendimiento que se ejecutan sin servidor Dash.
@@ -0,0 +1,237 @@
+"""
+Micro-benchmarks de los núcleos numéricos, sin servidor Dash.
+
+Cada caso se mide con timeit: unas llamadas de calentamiento (cachés,
+importaciones diferidas, primera asignación de memoria) y el mínimo de
+muchas repeticiones cortas. El ruido de la máquina (otros procesos,
+frecuencia de la CPU) solo puede alargar una repetición, así que el
+mínimo es el estimador estable del coste del código. Las repeticiones
+se hacen por rondas, una de cada caso por ronda: las de un caso quedan
+repartidas a lo largo de toda la corrida y un tramo ruidoso de la
+máquina no se lleva todas las de un mismo caso. Lo que queda es un
+cambio de velocidad de toda la máquina entre corridas (en una máquina
+virtual, hasta ±30 %): un trabajo fijo de referencia, medido en las
+mismas rondas, lo estima y los tiempos se corrigen por él. Se compara con la
+línea base guardada en benchmarks/linea_base.json y el programa termina
+con código 1 si algún caso es más lento que la línea base en más del
+umbral (50 % por defecto: por encima del ruido que queda tras la
+corrección, hasta ±35 % por caso en una máquina virtual, y una
+ralentización de 2× no pasa) y al menos
+0.1 ms, para no confundir el ruido de los casos de microsegundos con una
+regresión.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.kernels                 # comparar con la línea base
+    python -m benchmarks.kernels --umbral 0.75   # tolerar hasta +75 %
+    python -m benchmarks.kernels -k sir          # solo casos que contengan "sir"
+    python -m benchmarks.kernels --guardar       # reescribir la línea base
+
+Variables de entorno: BENCH_UMBRAL (umbral relativo) y BENCH_MINIMO_MS.
+
+La línea base depende de la máquina: regenérala con --guardar al cambiar
+de equipo antes de comparar optimizaciones.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+import numpy as np
+
+RUTA_LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "linea_base.json")
+UMBRAL = float(os.environ.get("BENCH_UMBRAL", 0.5))
+REPETICIONES = 20
+CALENTAMIENTO = 3       # llamadas sin medir antes de calibrar
+DURACION_REPETICION = 0.05
+# diferencias por debajo de esto son ruido del temporizador, no regresiones
+MINIMO_MS = float(os.environ.get("BENCH_MINIMO_MS", 0.1))
+REFERENCIA = "(referencia)"
+
+
+def referencia():
+    # trabajo fijo de intérprete y de NumPy: su tiempo frente al de la
+    # línea base da la velocidad de la máquina en esta corrida
+    total = 0.0
+    for k in range(2000):
+        total += k * 0.5
+    return np.sort(np.sin(np.linspace(0.0, total, 10**5)))
+
+
+def _paginas():
+    # las páginas llaman a register_page al importarse: basta una app sin
+    # carpeta de páginas ni servidor
+    import dash
+    dash.Dash(__name__, use_pages=True, pages_folder="")
+    from pages import Ejercicio2, Ejercicio3, crecimiento_poblacion, modelo_sir_rumor, resultados_modelo_sir
+    return Ejercicio2, Ejercicio3, crecimiento_poblacion, modelo_sir_rumor, resultados_modelo_sir
+
+
+def casos():
+    """Diccionario nombre -> función sin argumentos a medir."""
+    from scipy.integrate import odeint, solve_ivp
+
+    from modelos.estabilidad import parte_real_dominante
+    from modelos.estocastico import simular
+    from modelos.redes import red_aleatoria, simular_red
+    from modelos.expresiones import compilar
+    from modelos.sir import resumen_analitico, sir_euler
+    from modelos.trayectorias import rk4_lote
+    from utilidades.submuestreo import indices_lttb
+
+    Ejercicio2, Ejercicio3, crecimiento_poblacion, modelo_sir_rumor, resultados_modelo_sir = _paginas()
+
+    c = {}
+
+    # --- SIR / rumor ---
+    c["modelo_sir"] = lambda: resultados_modelo_sir.modelo_sir(0.3, 0.1, 0.99, 0.01, 0.0)
+    c["modelo_sir_rumor"] = lambda: modelo_sir_rumor.modelo_sir_rumor(0.4, 0.2, 0.95, 0.05, 0.0)
+    betas = np.linspace(0.05, 1.5, 500)
+    c["sir_euler[lote=500]"] = lambda: sir_euler(betas, 0.1, 0.99, 0.01, 0.0)
+    betas_lote = np.linspace(0.05, 1.5, 10**5)
+    c["resumen_analitico"] = lambda: resumen_analitico(0.3, 0.1, 0.99, 0.01)
+    c["resumen_analitico[lote=1e5]"] = lambda: resumen_analitico(betas_lote, 0.1, 0.99, 0.01)
+
+    # --- rumor estocástico (réplicas en bloque) ---
+    c["estocastico[gillespie,N=1000,rep=250]"] = lambda: simular(0.4, 0.2, 0.95, 0.05, 0.0, 1000, replicas=250,
+                                                                  metodo="gillespie", rng=0)
+    c["estocastico[tau,N=1e6,rep=250]"] = lambda: simular(0.4, 0.2, 0.95, 0.05, 0.0, 10**6, replicas=250, rng=0)
+
+    # --- rumor en red dispersa ---
+    red = red_aleatoria(10**5, 10, rng=0)
+    c["red_aleatoria[n=1e5,k=10]"] = lambda: red_aleatoria(10**5, 10, rng=0)
+    c["simular_red[n=1e5,k=10]"] = lambda: simular_red(red, 0.4, 0.2, 1e-3, 0.0, rng=0)
+
+    # --- crecimiento exponencial ---
+    for tmax in (10, 1000):
+        c[f"crecimiento_modelo[tmax={tmax}]"] = lambda tmax=tmax: crecimiento_poblacion.crecimiento_modelo(0.1, 10, tmax)
+
+    # --- SEIR con odeint ---
+    N = Ejercicio2.N_default
+    for tmax in (160, 1000):
+        t = np.linspace(0, tmax, tmax * 5)
+        y0 = [N - 10.0, 0.0, 10.0, 0.0]
+        c[f"seir_rhs+odeint[tmax={tmax}]"] = (
+            lambda t=t, y0=y0: odeint(Ejercicio2.seir_rhs, y0, t, args=(N, 0.5, 0.2, 1 / 7))
+        )
+        c[f"seir_rhs+odeint+Dfun[tmax={tmax}]"] = (
+            lambda t=t, y0=y0: odeint(Ejercicio2.seir_rhs, y0, t, args=(N, 0.5, 0.2, 1 / 7), Dfun=Ejercicio2.seir_jac)
+        )
+
+    # --- depredador-presa con solve_ivp ---
+    args = (1.0, 50.0, 0.02, 0.5, 10.0, 0.1)
+    for tmax in (200, 2000):
+        t_eval = np.linspace(0, tmax, 2000)
+        c[f"Ejercicio3.rhs+solve_ivp[tmax={tmax}]"] = (
+            lambda tmax=tmax, t_eval=t_eval: solve_ivp(
+                Ejercicio3.rhs, [0, tmax], [10.0, 2.0], t_eval=t_eval, args=args, method="RK45", rtol=1e-6)
+        )
+
+    # --- estabilidad en el DFE ---
+    betas_200 = np.linspace(0.0, 1.0, 200)
+    c["jacobian_DFE+dominant_real_part_eig[n=200]"] = lambda: [
+        Ejercicio2.dominant_real_part_eig(Ejercicio2.jacobian_DFE(N, b, 0.2, 1 / 7)) for b in betas_200
+    ]
+    betas_1e5 = np.linspace(0.0, 1.0, 10**5)
+    betas_1e6 = np.linspace(0.0, 1.0, 10**6)
+    c["parte_real_dominante[eig,n=1e5]"] = lambda: parte_real_dominante(betas_1e5, 0.2, 1 / 7, "eig")
+    c["parte_real_dominante[cerrado,n=1e6]"] = lambda: parte_real_dominante(betas_1e6, 0.2, 1 / 7)
+
+    # --- campo vectorial ---
+    for n in (50, 200):
+        X, Y = np.meshgrid(np.linspace(-5, 5, n), np.linspace(-5, 5, n))
+        c[f"campo[n={n}]"] = lambda X=X, Y=Y: (compilar("-y")(X, Y), compilar("np.cos(x)")(X, Y))
+    semillas = np.linspace(-5, 5, 1000)
+    fx, fy = compilar("y"), compilar("-sin(x) - 0.2*y")
+    c["rk4_lote[semillas=1000,pasos=200]"] = lambda: rk4_lote(fx, fy, semillas, semillas[::-1], 10.0, 200)
+
+    # --- submuestreo ---
+    x = np.linspace(0, 100, 10**6)
+    y = np.sin(x)
+    c["indices_lttb[1e6->1000]"] = lambda: indices_lttb(x, y, 1000)
+
+    return c
+
+
+def medir(funciones, repeticiones=REPETICIONES):
+    """
+    Mínimo del tiempo por llamada (s) de cada función de `funciones`
+    (nombre -> función) en `repeticiones` rondas; en cada ronda, una
+    repetición de ~DURACION_REPETICION s por función. Antes, CALENTAMIENTO
+    llamadas por función, que también fijan cuántas van en una repetición.
+    """
+    temporizadores = {}
+    for nombre, funcion in funciones.items():
+        temporizador = timeit.Timer(funcion)
+        una = min(temporizador.repeat(repeat=CALENTAMIENTO, number=1))
+        temporizadores[nombre] = temporizador, max(1, int(DURACION_REPETICION / max(una, 1e-9)))
+
+    minimos = dict.fromkeys(funciones, float("inf"))
+    for _ in range(repeticiones):
+        for nombre, (temporizador, llamadas) in temporizadores.items():
+            minimos[nombre] = min(minimos[nombre], temporizador.timeit(llamadas) / llamadas)
+    return minimos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filtro", default="", help="solo casos cuyo nombre contenga este texto")
+    parser.add_argument("--umbral", type=float, default=UMBRAL, help="regresión tolerada (0.25 = +25 %%)")
+    parser.add_argument("--minimo-ms", type=float, default=MINIMO_MS,
+                        help="aumento absoluto mínimo (ms) para contar como regresión")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--guardar", action="store_true", help="guardar los resultados como línea base")
+    args = parser.parse_args(argv)
+
+    linea_base, referencia_base = {}, None
+    if os.path.exists(RUTA_LINEA_BASE):
+        with open(RUTA_LINEA_BASE, encoding="utf-8") as f:
+            guardado = json.load(f)
+        linea_base, referencia_base = guardado.get("casos", {}), guardado.get("referencia")
+
+    funciones = {nombre: funcion for nombre, funcion in casos().items() if args.filtro in nombre}
+    resultados = medir({REFERENCIA: referencia, **funciones}, args.repeticiones)
+    # > 1: la máquina va más lenta que cuando se guardó la línea base
+    tiempo_referencia = resultados.pop(REFERENCIA)
+    velocidad = tiempo_referencia / referencia_base if referencia_base else 1.0
+    regresiones = []
+    print(f"velocidad relativa de la máquina: {1 / velocidad:.2f} (los cambios están corregidos por ella)")
+    print(f"{'caso':<46}{'ms':>12}{'base (ms)':>12}{'cambio':>10}")
+    for nombre, segundos in resultados.items():
+        base = linea_base.get(nombre)
+        if base:
+            cambio = segundos / (base * velocidad) - 1
+            lento = cambio > args.umbral and (segundos - base * velocidad) * 1000 > args.minimo_ms
+            marca = "  REGRESIÓN" if lento else ""
+            if marca:
+                regresiones.append(nombre)
+            print(f"{nombre:<46}{segundos * 1000:>12.3f}{base * 1000:>12.3f}{cambio:>+10.0%}{marca}")
+        else:
+            print(f"{nombre:<46}{segundos * 1000:>12.3f}{'—':>12}")
+
+    if args.guardar:
+        # en la escala de la referencia ya guardada, para que un -k parcial
+        # no mezcle corridas a distinta velocidad
+        referencia_base = referencia_base or tiempo_referencia
+        linea_base.update({nombre: segundos / velocidad for nombre, segundos in resultados.items()})
+        with open(RUTA_LINEA_BASE, "w", encoding="utf-8") as f:
+            json.dump({
+                "maquina": {"python": platform.python_version(), "numpy": np.__version__,
+                            "procesador": platform.processor() or platform.machine()},
+                "estadistico": f"mínimo de {args.repeticiones} repeticiones",
+                "referencia": referencia_base,
+                "casos": dict(sorted(linea_base.items())),
+            }, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Línea base guardada en {RUTA_LINEA_BASE}")
+        return 0
+
+    if regresiones:
+        print(f"\n{len(regresiones)} caso(s) por encima de su umbral: {', '.join(regresiones)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
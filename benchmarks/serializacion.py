@@ -0,0 +1,118 @@
+"""
+Tamaño de la respuesta y tiempo de codificación de la figura de cada
+página, en tres modos:
+
+  listas    JSON con listas de floats (lo que envía plotly < 6)
+  plotly    serialización por defecto de la versión instalada
+  compacto  utilidades.serializacion.compactar_figura (FIGURAS_COMPACTAS=1)
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.serializacion [--repeticiones 20]
+"""
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+
+import app  # noqa: F401  (registra las páginas)
+from dash._utils import to_json
+from utilidades.serializacion import compactar_figura, decodificar_arreglo
+
+
+def _a_listas(obj):
+    if isinstance(obj, dict):
+        if "bdata" in obj and "dtype" in obj:
+            return decodificar_arreglo(obj).tolist()
+        return {k: _a_listas(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_a_listas(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+
+def _sin_progreso(*_):
+    pass
+
+
+def _figura(base, parche):
+    """Figura completa que ve el navegador: la base de la página con las asignaciones del Patch."""
+    import plotly.graph_objects as go
+
+    fig = base.to_dict()
+    for operacion in parche.to_plotly_json()["operations"]:
+        *ruta, ultima = operacion["location"]
+        destino = fig
+        for clave in ruta:
+            destino = destino.setdefault(clave, {}) if isinstance(destino, dict) else destino[clave]
+        valor = operacion["params"]["value"]
+        destino[ultima] = decodificar_arreglo(valor) if isinstance(valor, dict) and "bdata" in valor else valor
+    return go.Figure(fig)
+
+
+def figuras():
+    """Figura representativa de cada página, con parámetros por defecto."""
+    import pandas as pd
+    import plotly.express as px
+    from pages import Ejercicio2, Ejercicio3, campo_vectorial, modelo_sir_rumor, resultados_modelo_sir
+
+    # los callbacks devuelven un Patch sobre la figura base de su página
+    seir = Ejercicio2.figura_simulacion()
+    yield "SEIR (tmax=160)", _figura(seir, Ejercicio2.run_simulation(1, 0.5, 0.2, 1 / 7, 10, 160)[0])
+    yield "SEIR (tmax=2000)", _figura(seir, Ejercicio2.run_simulation(1, 0.5, 0.2, 1 / 7, 10, 2000)[0])
+    yield "Tanteo β (10^6 puntos)", _figura(
+        Ejercicio2.figura_tanteo(), Ejercicio2.run_stability_sweep(_sin_progreso, 1, 0.0, 1.0, 10**6, 0.2, 1 / 7))
+    yield "SIR", _figura(resultados_modelo_sir.figura_base(), resultados_modelo_sir.actualizar(0.3, 0.1, 0.99, 0.01, 0.0)[0])
+    yield "SIR rumor", _figura(modelo_sir_rumor.figura_base(),
+                               modelo_sir_rumor.actualizar_grafico(0.4, 0.2, 0.95, 0.05, 0.0)[0])
+
+    data, _ = Ejercicio3.run_sim(_sin_progreso, 1, 1.0, 50.0, 0.02, 0.5, 10.0, 0.1, 10.0, 2.0, 200.0)
+    yield "Depredador-presa", _figura(Ejercicio3.figura_series(), Ejercicio3.pintar_simulacion(data)[0])
+
+    yield "Campo vectorial (n=200)", campo_vectorial.generar_campo(1, [], "y", "-x", 5, 5, 200)[0]
+
+    # cripto sin red: 3 monedas, 30 días horarios
+    t = pd.date_range(end=pd.Timestamp.now(), periods=720, freq="h")
+    df = pd.concat([
+        pd.DataFrame({"timestamp": t, "price": 100 * (1 + np.cumsum(np.random.randn(720)) / 100), "coin": c})
+        for c in ("bitcoin", "ethereum", "solana")
+    ])
+    yield "Cripto (sintético)", px.line(df, x="timestamp", y="price", color="coin")
+
+
+def _medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        salida = funcion()
+        tiempos.append(time.perf_counter() - t0)
+    return len(salida.encode("utf-8")), statistics.median(tiempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'página':<26}{'listas':>18}{'plotly':>18}{'compacto':>18}")
+    print(f"{'':<26}" + f"{'KB / ms':>18}" * 3)
+    for nombre, fig in figuras():
+        # versión solo-JSON de la figura, para reconstruir el modo "listas"
+        listas = _a_listas(json.loads(to_json(fig)))
+        fila = []
+        for funcion in (
+            lambda: json.dumps(listas),
+            lambda: to_json(fig),
+            lambda: to_json(compactar_figura(fig, forzar=True)),
+        ):
+            kb, ms = _medir(funcion, args.repeticiones)
+            fila.append(f"{kb / 1024:>9.1f} / {ms:<6.2f}")
+        print(f"{nombre:<26}" + "".join(f"{c:>18}" for c in fila))
+
+
+if __name__ == "__main__":
+    main()
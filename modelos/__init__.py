@@ -0,0 +1 @@
+# Núcleos numéricos compartidos por las páginas de la app.
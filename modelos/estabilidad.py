@@ -0,0 +1,81 @@
+import numpy as np
+
+# ------------------------------------------------------
+# Barridos de estabilidad del SEIR en el equilibrio libre de enfermedad
+# ------------------------------------------------------
+# Orden de variables: [S, E, I, R]. En el DFE las columnas de S y R son
+# nulas, así que el espectro es {0, 0} más los autovalores del bloque
+# (E, I):
+#     [[-sigma,  beta ],
+#      [ sigma, -gamma]]
+
+def jacobianos_DFE(beta, sigma, gamma):
+    """Apila los Jacobianos del DFE en un arreglo de forma lote + (4, 4)."""
+    beta, sigma, gamma = np.broadcast_arrays(
+        *(np.asarray(p, dtype=float) for p in (beta, sigma, gamma))
+    )
+    J = np.zeros(beta.shape + (4, 4))
+    J[..., 1, 1] = -sigma
+    J[..., 1, 2] = beta
+    J[..., 2, 1] = sigma
+    J[..., 2, 2] = -gamma
+    J[..., 0, 2] = -beta
+    J[..., 3, 2] = gamma
+    return J
+
+
+def autovalores_bloque_EI(beta, sigma, gamma):
+    """
+    Autovalores (lambda_+, lambda_-) del bloque (E, I) por el polinomio
+    característico  lambda^2 + (sigma+gamma) lambda + sigma (gamma-beta) = 0.
+    """
+    beta, sigma, gamma = np.broadcast_arrays(
+        *(np.asarray(p, dtype=float) for p in (beta, sigma, gamma))
+    )
+    tr = -(sigma + gamma)
+    disc = (sigma - gamma) ** 2 + 4.0 * sigma * beta
+    raiz = np.sqrt(disc.astype(complex))
+    return (tr + raiz) / 2.0, (tr - raiz) / 2.0
+
+
+def autovalores_DFE(beta, sigma, gamma, metodo="cerrado"):
+    """
+    Los cuatro autovalores del Jacobiano en el DFE para todo el lote,
+    con forma lote + (4,).
+
+    metodo="cerrado" usa el polinomio característico; metodo="eig" apila
+    los Jacobianos y llama una sola vez a np.linalg.eigvals.
+    """
+    if metodo == "eig":
+        return np.linalg.eigvals(jacobianos_DFE(beta, sigma, gamma))
+    if metodo != "cerrado":
+        raise ValueError(f"Método desconocido: {metodo!r}")
+
+    l_mas, l_menos = autovalores_bloque_EI(beta, sigma, gamma)
+    eigs = np.zeros(l_mas.shape + (4,), dtype=complex)
+    eigs[..., 2] = l_mas
+    eigs[..., 3] = l_menos
+    return eigs
+
+
+def parte_real_dominante(beta, sigma, gamma, metodo="cerrado"):
+    """Mayor parte real de los autovalores del DFE para cada punto del lote."""
+    return np.max(np.real(autovalores_DFE(beta, sigma, gamma, metodo)), axis=-1)
+
+
+def parte_real_dominante_EI(beta, sigma, gamma):
+    """
+    Mayor parte real del bloque (E, I), sin los dos autovalores nulos de
+    S y R. Su signo coincide con el de R0 - 1.
+    """
+    l_mas, _ = autovalores_bloque_EI(beta, sigma, gamma)
+    return np.real(l_mas)
+
+
+def mapa_estabilidad(betas, gammas, sigma):
+    """
+    Barrido 2-D beta x gamma. Devuelve una matriz (len(gammas), len(betas))
+    con la mayor parte real del bloque (E, I), lista para un heatmap.
+    """
+    B, G = np.meshgrid(np.asarray(betas, dtype=float), np.asarray(gammas, dtype=float))
+    return parte_real_dominante_EI(B, sigma, G)
@@ -0,0 +1,169 @@
+import numpy as np
+
+# ------------------------------------------------------
+# SIR estocástico (rumores) con muchas réplicas a la vez
+# ------------------------------------------------------
+# Mismos compartimentos que modelos/sir.py, pero con individuos: en una
+# comunidad de N personas, s ignorantes e i difusores, el rumor pasa a un
+# ignorante con tasa β·s·i/N y un difusor lo abandona con tasa γ·i. En
+# proporciones (s/N, i/N) el promedio sigue las ecuaciones deterministas;
+# las réplicas muestran lo que estas no dicen: que el rumor se extinga al
+# principio por azar y cuánto varía el tamaño final.
+#
+# Todas las réplicas avanzan juntas como arreglos NumPy: un paso del bucle
+# es un evento (Gillespie) o un salto de tiempo (tau-leaping) de todas las
+# réplicas vivas, nunca un bucle de Python por réplica.
+
+METODOS = ("gillespie", "tau")
+PERCENTILES = (5, 25, 50, 75, 95)
+PUNTOS_MALLA = 121
+TAU_DEFECTO = 0.05
+# un brote con tamaño final menor que esta fracción de S0 cuenta como
+# extinción temprana (la distribución es bimodal: casi 0 o cerca del
+# tamaño final determinista)
+UMBRAL_BROTE = 0.1
+# Gillespie hace hasta ~2N eventos por réplica: por encima, tau-leaping
+POBLACION_MAX_GILLESPIE = 20_000
+
+
+def _conteos(S0, I0, R0, N):
+    """Individuos iniciales de cada compartimento (proporciones de N)."""
+    s0, i0, r0 = (int(round(float(x) * N)) for x in (S0, I0, R0))
+    if min(s0, i0, r0) < 0:
+        raise ValueError("las poblaciones iniciales deben ser no negativas")
+    return s0, i0, r0
+
+
+def gillespie(beta, gamma, N, s0, i0, malla, replicas, rng):
+    """
+    Algoritmo directo de Gillespie (exacto). Devuelve S, I en individuos
+    con forma (len(malla), replicas): el estado de cada réplica en cada
+    instante de la malla.
+
+    Cada vuelta sortea el siguiente evento de todas las réplicas vivas a la
+    vez; una réplica sale del bucle cuando su próximo evento cae después
+    del final de la malla (o ya no quedan difusores).
+    """
+    n = len(malla)
+    S = np.full(replicas, s0, dtype=np.int64)
+    I = np.full(replicas, i0, dtype=np.int64)
+    t = np.zeros(replicas)
+    serie_S = np.empty((n, replicas), dtype=np.int64)
+    serie_I = np.empty((n, replicas), dtype=np.int64)
+    registrados = np.zeros(replicas, dtype=np.int64)   # puntos de la malla ya escritos
+    vivas = np.arange(replicas)
+
+    while vivas.size:
+        s, i = S[vivas], I[vivas]
+        tasa_contagio = beta * s * i / N
+        tasa_total = tasa_contagio + gamma * i
+        with np.errstate(divide="ignore"):
+            t_siguiente = t[vivas] + rng.standard_exponential(vivas.size) / tasa_total
+
+        # el estado actual vale en [t, t_siguiente): se copia a los puntos
+        # de la malla de ese intervalo (cero, uno o varios por réplica)
+        hasta = np.searchsorted(malla, t_siguiente)
+        cuantos = hasta - registrados[vivas]
+        if cuantos.any():
+            total = cuantos.sum()
+            inicio = np.cumsum(cuantos) - cuantos
+            filas = np.arange(total) + np.repeat(registrados[vivas] - inicio, cuantos)
+            columnas = np.repeat(vivas, cuantos)
+            serie_S[filas, columnas] = np.repeat(s, cuantos)
+            serie_I[filas, columnas] = np.repeat(i, cuantos)
+            registrados[vivas] = hasta
+
+        sigue = hasta < n
+        vivas = vivas[sigue]
+        contagio = rng.random(vivas.size) * tasa_total[sigue] < tasa_contagio[sigue]
+        S[vivas] -= contagio
+        I[vivas] += 2 * contagio - 1          # contagio: +1; abandono: -1
+        t[vivas] = t_siguiente[sigue]
+
+    return serie_S, serie_I
+
+
+def tau_leaping(beta, gamma, N, s0, i0, malla, replicas, rng, tau=TAU_DEFECTO):
+    """
+    Tau-leaping con saltos binomiales: en un salto τ cada ignorante se
+    entera con probabilidad 1 - exp(-β·i/N·τ) y cada difusor abandona con
+    1 - exp(-γ·τ). A diferencia de los saltos de Poisson, nunca deja
+    compartimentos negativos. El sesgo es O(τ); τ se ajusta para que cada
+    intervalo de la malla tenga un número entero de saltos.
+    """
+    n = len(malla)
+    S = np.full(replicas, s0, dtype=np.int64)
+    I = np.full(replicas, i0, dtype=np.int64)
+    serie_S = np.empty((n, replicas), dtype=np.int64)
+    serie_I = np.empty((n, replicas), dtype=np.int64)
+    serie_S[0], serie_I[0] = S, I
+
+    for k in range(1, n):
+        intervalo = malla[k] - malla[k - 1]
+        saltos = max(1, int(np.ceil(intervalo / tau - 1e-9)))
+        paso = intervalo / saltos
+        p_abandono = -np.expm1(-gamma * paso)
+        for _ in range(saltos):
+            contagios = rng.binomial(S, -np.expm1(-beta * paso / N * I))
+            abandonos = rng.binomial(I, p_abandono)
+            S -= contagios
+            I += contagios - abandonos
+        serie_S[k], serie_I[k] = S, I
+
+    return serie_S, serie_I
+
+
+def simular(beta, gamma, S0, I0, R0, N, tmax=60, replicas=1000, metodo="tau",
+            rng=None, puntos=PUNTOS_MALLA, tau=TAU_DEFECTO):
+    """
+    `replicas` trayectorias estocásticas del SIR de rumores en una
+    comunidad de N personas (S0, I0, R0 en proporciones, como en la versión
+    determinista). Devuelve t con forma (puntos,) y S, I, R en proporciones
+    con forma (puntos, replicas).
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"método desconocido: {metodo!r} (opciones: {', '.join(METODOS)})")
+    N = int(N)
+    if N < 1 or beta < 0 or gamma < 0:
+        raise ValueError("se requiere N >= 1, β >= 0 y γ >= 0")
+    if metodo == "gillespie" and N > POBLACION_MAX_GILLESPIE:
+        raise ValueError(f"Gillespie está limitado a N <= {POBLACION_MAX_GILLESPIE}: usa tau-leaping")
+    s0, i0, r0 = _conteos(S0, I0, R0, N)
+    rng = np.random.default_rng(rng)
+    t = np.linspace(0, tmax, puntos)
+
+    if metodo == "gillespie":
+        S, I = gillespie(beta, gamma, N, s0, i0, t, replicas, rng)
+    else:
+        S, I = tau_leaping(beta, gamma, N, s0, i0, t, replicas, rng, tau=tau)
+    R = (s0 + i0 + r0) - S - I
+    return t, S / N, I / N, R / N
+
+
+def bandas(X, percentiles=PERCENTILES):
+    """Percentiles entre réplicas de cada instante: forma (len(percentiles), puntos)."""
+    return np.percentile(X, percentiles, axis=1)
+
+
+def resumen_replicas(beta, gamma, S0, N, S, I):
+    """
+    Extinción y tamaño final a partir de las réplicas (S, I de `simular`):
+
+      tamanos            tamaño final S0 - S(tmax) de cada réplica
+      p_extincion        fracción de réplicas sin difusores en tmax
+      p_extincion_temprana  fracción con tamaño final < UMBRAL_BROTE·S0
+      p_ramificacion     aproximación de proceso de ramificación
+                         (γ/(β·S0))^i0 si el R0 efectivo es > 1, si no 1
+    """
+    tamanos = S[0] - S[-1]
+    i0 = int(round(I[0, 0] * N))
+    r_efectivo = beta * S0 / gamma if gamma > 0 else np.inf
+    # R ≤ 1 (incluido β = 0 o S0 = 0): la ramificación se extingue seguro
+    p_ramificacion = 1.0 if r_efectivo <= 1 else (1.0 / r_efectivo) ** i0
+    return {
+        "tamanos": tamanos,
+        "p_extincion": float(np.mean(I[-1] == 0)),
+        "p_extincion_temprana": float(np.mean(tamanos < UMBRAL_BROTE * S0)),
+        "p_ramificacion": float(p_ramificacion),
+        "percentiles_tamano": dict(zip(PERCENTILES, np.percentile(tamanos, PERCENTILES))),
+    }
@@ -0,0 +1,73 @@
+import numpy as np
+
+# ------------------------------------------------------
+# Métricas por eventos del integrador (solve_ivp)
+# ------------------------------------------------------
+# Picos, cruces de umbral y extinciones se localizan como raíces de una
+# función g(t, y) durante la integración: solve_ivp las refina sobre el
+# interpolante del paso, así que la precisión es la del integrador y no
+# depende de cuántos puntos se dibujen después.
+
+
+def cruce(componente, nivel, direccion=0, terminal=False):
+    """Evento y[componente] = nivel (direccion: +1 subiendo, -1 bajando, 0 ambas)."""
+    def g(t, y, *args):
+        return y[componente] - nivel
+    g.direction = direccion
+    g.terminal = terminal
+    return g
+
+
+def pico(rhs, componente):
+    """Máximos locales de y[componente]: su derivada pasa de + a -."""
+    def g(t, y, *args):
+        return rhs(t, y, *args)[componente]
+    g.direction = -1
+    return g
+
+
+def extincion(componente, nivel=1.0):
+    """
+    Primera vez que y[componente] baja de `nivel` (p. ej. menos de un
+    individuo) viniendo de arriba. Empezar justo en `nivel` no cuenta: g
+    arrancaría en 0 y el redondeo del interpolante hace fallar el brentq
+    de solve_ivp, así que el umbral se sube un margen relativo ínfimo.
+    """
+    return cruce(componente, nivel + 1e-12 * max(abs(nivel), 1.0), direccion=-1)
+
+
+def integrar_con_eventos(rhs, t_span, y0, eventos, args=(), **opciones):
+    """
+    solve_ivp con salida densa y los eventos del dict `eventos`
+    (nombre -> función g). Devuelve (sol, resultados), con resultados
+    nombre -> lista de (t, y) de cada vez que ocurrió el evento.
+    """
+    from scipy.integrate import solve_ivp
+
+    nombres = list(eventos)
+    sol = solve_ivp(rhs, t_span, y0, args=args, events=[eventos[n] for n in nombres],
+                    dense_output=True, **opciones)
+    resultados = {
+        n: [(float(t), np.asarray(y)) for t, y in zip(sol.t_events[i], sol.y_events[i])]
+        for i, n in enumerate(nombres)
+    }
+    return sol, resultados
+
+
+def maximo_global(sol, resultados, componente, nombre="pico"):
+    """
+    (t, valor) del máximo de y[componente] en todo el intervalo: el mayor
+    de los picos detectados y de los dos extremos (la serie puede ser
+    monótona y no tener pico interior).
+    """
+    t0, t1 = sol.t[0], sol.t[-1]
+    candidatos = [(t, y[componente]) for t, y in resultados.get(nombre, [])]
+    candidatos += [(t0, sol.y[componente][0]), (t1, sol.y[componente][-1])]
+    t, valor = max(candidatos, key=lambda c: c[1])
+    return float(t), float(valor)
+
+
+def primer_evento(resultados, nombre):
+    """Tiempo de la primera ocurrencia de `nombre`, o None si no ocurrió."""
+    ocurrencias = resultados.get(nombre, [])
+    return ocurrencias[0][0] if ocurrencias else None
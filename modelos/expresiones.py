@@ -0,0 +1,181 @@
+"""
+Expresiones del usuario (campo vectorial): validación por lista blanca
+sobre el AST y compilación cacheada. Las pruebas de la lista blanca están
+en tests/test_expresiones.py.
+"""
+import ast
+import functools
+import math
+import operator
+
+import numpy as np
+
+# ------------------------------------------------------
+# Expresiones del usuario: AST con lista blanca, compiladas y cacheadas
+# ------------------------------------------------------
+# Solo se aceptan números, las variables permitidas, operadores
+# aritméticos y llamadas a las funciones de FUNCIONES (también como
+# np.<func>). Cualquier otro nodo (atributos arbitrarios, subíndices,
+# lambdas, comprensiones, ...) se rechaza antes de compilar. No se admiten
+# torres (a**b**c) y las partes constantes se evalúan al validar: un
+# exponente constante está acotado, y una potencia de constantes no puede
+# pasar de 10^_MAX_LOG10. Con floats de Python, a diferencia de los
+# arreglos de NumPy, (9**99)**99 o 1/0 no dan inf sino OverflowError o
+# ZeroDivisionError al evaluar.
+
+FUNCIONES = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "arcsin": np.arcsin, "arccos": np.arccos, "arctan": np.arctan,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "exp": np.exp, "log": np.log, "sqrt": np.sqrt, "abs": np.abs,
+    "sign": np.sign,
+}
+CONSTANTES = {"pi": np.pi, "e": np.e}
+VARIABLES = ("x", "y")
+
+_OPERADORES = (
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv,
+    ast.UAdd, ast.USub,
+)
+_MAX_LONGITUD = 500
+_MAX_EXPONENTE = 100
+_MAX_LOG10 = 300        # |resultado| de una potencia de constantes (float llega a ~1.8e308)
+
+_BINARIOS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+    ast.Pow: operator.pow, ast.Mod: operator.mod, ast.FloorDiv: operator.floordiv,
+}
+
+
+class ExpresionInvalida(ValueError):
+    pass
+
+
+def _validar(nodo, variables):
+    if isinstance(nodo, ast.Expression):
+        _validar(nodo.body, variables)
+    elif isinstance(nodo, ast.BinOp):
+        if not isinstance(nodo.op, _OPERADORES):
+            raise ExpresionInvalida(f"Operador no permitido: {type(nodo.op).__name__}")
+        if isinstance(nodo.op, ast.Pow):
+            _validar_exponente(nodo.right)
+        _validar(nodo.left, variables)
+        _validar(nodo.right, variables)
+    elif isinstance(nodo, ast.UnaryOp):
+        if not isinstance(nodo.op, _OPERADORES):
+            raise ExpresionInvalida(f"Operador no permitido: {type(nodo.op).__name__}")
+        _validar(nodo.operand, variables)
+    elif isinstance(nodo, ast.Constant):
+        if isinstance(nodo.value, bool) or not isinstance(nodo.value, (int, float)):
+            raise ExpresionInvalida(f"Constante no permitida: {nodo.value!r}")
+    elif isinstance(nodo, ast.Name):
+        if nodo.id not in variables and nodo.id not in CONSTANTES:
+            raise ExpresionInvalida(f"Nombre desconocido: {nodo.id}")
+    elif isinstance(nodo, ast.Call):
+        if nodo.keywords or not nodo.args:
+            raise ExpresionInvalida("Llamada a función no permitida")
+        _nombre_funcion(nodo.func)
+        for arg in nodo.args:
+            _validar(arg, variables)
+    else:
+        raise ExpresionInvalida(f"Construcción no permitida: {type(nodo).__name__}")
+
+
+def _validar_exponente(nodo):
+    if isinstance(nodo, ast.BinOp) and isinstance(nodo.op, ast.Pow):
+        raise ExpresionInvalida("Potencias encadenadas no permitidas")
+
+
+def _constante(nodo):
+    """
+    Valor (float) de un subárbol ya validado que no depende de las
+    variables, o None si depende. Recorre todo el árbol, así que también
+    comprueba las partes constantes de una expresión con variables.
+    """
+    if isinstance(nodo, ast.Expression):
+        return _constante(nodo.body)
+    if isinstance(nodo, ast.Constant):
+        return float(nodo.value)
+    if isinstance(nodo, ast.Name):
+        return CONSTANTES.get(nodo.id)
+    if isinstance(nodo, ast.UnaryOp):
+        valor = _constante(nodo.operand)
+        return None if valor is None else (-valor if isinstance(nodo.op, ast.USub) else valor)
+    if isinstance(nodo, ast.Call):
+        valores = [_constante(arg) for arg in nodo.args]
+        if None in valores:
+            return None
+        with np.errstate(all="ignore"):
+            return float(FUNCIONES[_nombre_funcion(nodo.func)](*valores))
+
+    izquierda, derecha = _constante(nodo.left), _constante(nodo.right)
+    if isinstance(nodo.op, ast.Pow) and derecha is not None:
+        if abs(derecha) > _MAX_EXPONENTE:
+            raise ExpresionInvalida(f"Exponente demasiado grande (máximo {_MAX_EXPONENTE})")
+        if izquierda not in (None, 0.0) and derecha * math.log10(abs(izquierda)) > _MAX_LOG10:
+            raise ExpresionInvalida(f"Potencia demasiado grande (máximo 1e{_MAX_LOG10})")
+    if izquierda is None or derecha is None:
+        return None
+    try:
+        valor = _BINARIOS[type(nodo.op)](izquierda, derecha)
+    except ZeroDivisionError:
+        raise ExpresionInvalida("División por cero") from None
+    if isinstance(valor, complex):
+        raise ExpresionInvalida("Potencia sin valor real (base negativa, exponente no entero)")
+    return valor
+
+
+def _nombre_funcion(func):
+    # admite sin(x) y np.sin(x)
+    if isinstance(func, ast.Name) and func.id in FUNCIONES:
+        return func.id
+    if (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+            and func.value.id == "np" and func.attr in FUNCIONES):
+        return func.attr
+    raise ExpresionInvalida("Función no permitida")
+
+
+class _QuitarNp(ast.NodeTransformer):
+    # np.sin(x) -> sin(x): así el espacio de nombres no necesita el módulo numpy.
+    # Las constantes enteras pasan a float para que 9**9**9 desborde a inf
+    # en lugar de construir un entero gigante.
+    def visit_Constant(self, nodo):
+        return ast.copy_location(ast.Constant(value=float(nodo.value)), nodo)
+
+    def visit_Call(self, nodo):
+        self.generic_visit(nodo)
+        nodo.func = ast.copy_location(ast.Name(id=_nombre_funcion(nodo.func), ctx=ast.Load()), nodo.func)
+        return nodo
+
+
+@functools.lru_cache(maxsize=256)
+def compilar(texto, variables=VARIABLES):
+    """
+    Valida y compila `texto` una sola vez (caché por texto). Devuelve una
+    función f(*valores) que evalúa la expresión con NumPy y siempre
+    devuelve un arreglo con la forma de las variables de entrada.
+    """
+    texto = (texto or "").strip()
+    if not texto:
+        raise ExpresionInvalida("Expresión vacía")
+    if len(texto) > _MAX_LONGITUD:
+        raise ExpresionInvalida("Expresión demasiado larga")
+    try:
+        arbol = ast.parse(texto, mode="eval")
+    except SyntaxError as error:
+        raise ExpresionInvalida(f"Sintaxis inválida: {error.msg}") from None
+
+    _validar(arbol, variables)
+    _constante(arbol)
+    arbol = ast.fix_missing_locations(_QuitarNp().visit(arbol))
+    codigo = compile(arbol, "<expresion>", "eval")
+    globales = {"__builtins__": {}, **FUNCIONES, **CONSTANTES}
+
+    def evaluar(*valores):
+        entorno = dict(zip(variables, valores))
+        resultado = eval(codigo, globales, entorno)
+        forma = np.broadcast_shapes(*(np.shape(v) for v in valores))
+        return np.broadcast_to(np.asarray(resultado, dtype=float), forma)
+
+    return evaluar
+
@@ -0,0 +1,54 @@
+import numpy as np
+
+# ------------------------------------------------------
+# Elección de integrador y estadísticas del solver
+# ------------------------------------------------------
+# Un método explícito (RK45) sobre un problema rígido queda limitado por
+# estabilidad, no por precisión: necesita del orden de |λ|·T pasos, con
+# λ el autovalor más negativo del Jacobiano. Cuando esa cota es grande se
+# pasa a un método implícito que aprovecha el Jacobiano analítico.
+
+# |Re λ|·T a partir del cual se considera rígido el problema
+UMBRAL_RIGIDEZ = 500.0
+METODO_NO_RIGIDO = "RK45"
+METODO_RIGIDO = "LSODA"      # alterna Adams/BDF según detecte rigidez
+METODOS = ("auto", "RK45", "LSODA", "BDF", "Radau")
+
+
+def indice_rigidez(jacobianos, tmax):
+    """max(-Re λ)·tmax sobre una colección de Jacobianos (forma (..., n, n))."""
+    J = np.asarray(jacobianos, dtype=float)
+    J = J[np.isfinite(J).all(axis=(-2, -1))]
+    if J.size == 0:
+        return 0.0
+    decaimiento = -np.linalg.eigvals(J).real
+    return float(max(decaimiento.max(), 0.0) * tmax)
+
+
+def elegir_metodo(jacobianos, tmax, metodo="auto"):
+    """Método de solve_ivp: el pedido, o el automático según `indice_rigidez`."""
+    if metodo and metodo != "auto":
+        return metodo
+    if indice_rigidez(jacobianos, tmax) > UMBRAL_RIGIDEZ:
+        return METODO_RIGIDO
+    return METODO_NO_RIGIDO
+
+
+def estadisticas_solve_ivp(sol, metodo):
+    """Contadores de un resultado de solve_ivp con dense_output."""
+    return {
+        "metodo": metodo,
+        "pasos": int(len(sol.t) - 1),
+        "nfev": int(sol.nfev),
+        "njev": int(sol.njev),
+        "nlu": int(sol.nlu),
+    }
+
+
+def texto_estadisticas(stats):
+    """Línea corta para mostrar junto a la gráfica."""
+    texto = (f"Integrador: {stats['metodo']} · pasos: {stats['pasos']} · "
+             f"evaluaciones f: {stats['nfev']} · Jacobianos: {stats['njev']}")
+    if stats.get("nlu"):
+        texto += f" · factorizaciones LU: {stats['nlu']}"
+    return texto
@@ -0,0 +1,249 @@
+import numpy as np
+
+# ------------------------------------------------------
+# Motor SIR vectorizado (Euler explícito por lotes)
+# ------------------------------------------------------
+def sir_euler(beta, gamma, S0, I0, R0, tmax=60, steps=600):
+    """
+    Integra el modelo SIR con Euler explícito para uno o muchos juegos de
+    parámetros a la vez.
+
+    beta, gamma, S0, I0, R0 pueden ser escalares o arreglos (se aplica
+    broadcasting entre ellos). Cada paso de tiempo es una sola operación
+    NumPy sobre todo el lote.
+
+    Devuelve t con forma (steps,) y S, I, R con forma lote + (steps,).
+    Con parámetros escalares S, I, R son vectores de longitud steps.
+    """
+    beta, gamma, S0, I0, R0 = np.broadcast_arrays(
+        *(np.asarray(p, dtype=float) for p in (beta, gamma, S0, I0, R0))
+    )
+    t = np.linspace(0, tmax, steps)
+    dt = t[1] - t[0]
+
+    if beta.size == 1:
+        return (t,) + _sir_euler_escalar(
+            *(p.item() for p in (beta, gamma, S0, I0, R0)), float(dt), steps, beta.shape
+        )
+
+    # orden tiempo-lote: cada paso escribe filas contiguas
+    S = np.empty((steps,) + beta.shape)
+    I = np.empty((steps,) + beta.shape)
+    R = np.empty((steps,) + beta.shape)
+
+    S[0], I[0], R[0] = S0, I0, R0
+    beta_dt, gamma_dt = beta * dt, gamma * dt
+
+    for k in range(steps - 1):
+        s, i = S[k], I[k]
+        contagio = beta_dt * s * i
+        recuperacion = gamma_dt * i
+
+        np.subtract(s, contagio, out=S[k + 1])
+        np.add(i, contagio - recuperacion, out=I[k + 1])
+        np.add(R[k], recuperacion, out=R[k + 1])
+
+    return t, np.moveaxis(S, 0, -1), np.moveaxis(I, 0, -1), np.moveaxis(R, 0, -1)
+
+
+def _sir_euler_escalar(beta, gamma, s, i, r, dt, steps, forma):
+    # una sola trayectoria: floats de Python, sin el coste fijo de cada
+    # operación NumPy sobre arreglos de un elemento
+    S, I, R = [s], [i], [r]
+    for _ in range(steps - 1):
+        contagio = beta * s * i * dt
+        recuperacion = gamma * i * dt
+        s, i, r = s - contagio, i + contagio - recuperacion, r + recuperacion
+        S.append(s)
+        I.append(i)
+        R.append(r)
+    return tuple(np.array(v).reshape(forma + (steps,)) for v in (S, I, R))
+
+
+# ------------------------------------------------------
+# Runge–Kutta adaptativo (Dormand–Prince 5(4)) para una trayectoria
+# ------------------------------------------------------
+# Cada paso da dos soluciones, de orden 5 y 4, con las mismas 7
+# evaluaciones (la última se reutiliza como primera del paso siguiente);
+# su diferencia estima el error local. El paso se acepta si ese error,
+# escalado por tol·(1 + |y|), es <= 1 y se ajusta con el factor
+# 0.9·err^(-1/5) acotado a [0.2, 5]: pasos largos mientras la dinámica
+# es lenta y cortos alrededor del brote. Solo se integran S e I (f no
+# depende de R); R = S0 + I0 + R0 - S - I, invariante lineal que
+# Runge–Kutta conserva. La curva entre pasos sale de la salida densa de
+# orden 4 del método. assets/modelos_cliente.js repite las mismas
+# cuentas en el navegador.
+#
+# Con S ≈ 0 la ecuación de S tiene autovalor ≈ -β y el paso explícito
+# queda acotado por h ≲ 3/β: el coste crece con β. Como max_step en
+# solve_ivp, PASOS_MAXIMO (aceptados + rechazados) corta la integración
+# antes de tmax y las estadísticas lo dicen.
+
+TOL_DEFECTO = 1e-6
+TOLERANCIAS = (1e-3, 1e-4, 1e-6, 1e-8)
+MUESTRAS_POR_PASO = 8   # puntos de la curva por paso aceptado
+H_MINIMO = 1e-12        # relativo a tmax
+PASOS_MAXIMO = 2000     # β ≤ 100 con tol = 1e-8 cabe (≤ 1600 intentos)
+
+# tablero de Butcher
+A21 = 1 / 5
+A31, A32 = 3 / 40, 9 / 40
+A41, A42, A43 = 44 / 45, -56 / 15, 32 / 9
+A51, A52, A53, A54 = 19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729
+A61, A62, A63, A64, A65 = 9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656
+A71, A73, A74, A75, A76 = 35 / 384, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84
+# b5 - b4 (error local) y coeficientes de la salida densa (Hairer, dopri5)
+E1, E3, E4, E5, E6, E7 = 71 / 57600, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40
+D1, D3, D4 = -12715105075 / 11282082432, 87487479700 / 32700410799, -10690763975 / 1880347072
+D5, D6, D7 = 701980252875 / 199316789632, -1453857185 / 822651844, 69997945 / 29380423
+
+
+def sir_adaptativo(beta, gamma, S0, I0, R0, tmax=60, tol=TOL_DEFECTO, muestras_por_paso=MUESTRAS_POR_PASO):
+    """
+    Integra el SIR (escalares) de 0 a tmax con Dormand–Prince 5(4) y paso
+    adaptativo. Devuelve t, S, I, R (salida densa, `muestras_por_paso`
+    puntos por paso aceptado) y un dict con pasos, rechazados, nfev,
+    error_max (mayor error local estimado de un paso aceptado) y t_final
+    (< tmax si se alcanzó PASOS_MAXIMO).
+    """
+    beta, gamma, tmax, tol = float(beta), float(gamma), float(tmax), float(tol)
+    total = float(S0) + float(I0) + float(R0)
+
+    def f(s, i):
+        contagio = beta * s * i
+        return -contagio, contagio - gamma * i
+
+    s, i = float(S0), float(I0)
+    ks1, ki1 = f(s, i)
+    t, h = 0.0, tmax / 100
+    pasos, rechazados, nfev, error_max = [], 0, 1, 0.0
+
+    while t < tmax and len(pasos) + rechazados < PASOS_MAXIMO:
+        h = min(h, tmax - t)
+        ks2, ki2 = f(s + h * (A21 * ks1), i + h * (A21 * ki1))
+        ks3, ki3 = f(s + h * (A31 * ks1 + A32 * ks2), i + h * (A31 * ki1 + A32 * ki2))
+        ks4, ki4 = f(s + h * (A41 * ks1 + A42 * ks2 + A43 * ks3),
+                     i + h * (A41 * ki1 + A42 * ki2 + A43 * ki3))
+        ks5, ki5 = f(s + h * (A51 * ks1 + A52 * ks2 + A53 * ks3 + A54 * ks4),
+                     i + h * (A51 * ki1 + A52 * ki2 + A53 * ki3 + A54 * ki4))
+        ks6, ki6 = f(s + h * (A61 * ks1 + A62 * ks2 + A63 * ks3 + A64 * ks4 + A65 * ks5),
+                     i + h * (A61 * ki1 + A62 * ki2 + A63 * ki3 + A64 * ki4 + A65 * ki5))
+        # la séptima etapa es la solución de orden 5 (FSAL)
+        s_nuevo = s + h * (A71 * ks1 + A73 * ks3 + A74 * ks4 + A75 * ks5 + A76 * ks6)
+        i_nuevo = i + h * (A71 * ki1 + A73 * ki3 + A74 * ki4 + A75 * ki5 + A76 * ki6)
+        ks7, ki7 = f(s_nuevo, i_nuevo)
+        nfev += 6
+
+        error_s = h * (E1 * ks1 + E3 * ks3 + E4 * ks4 + E5 * ks5 + E6 * ks6 + E7 * ks7)
+        error_i = h * (E1 * ki1 + E3 * ki3 + E4 * ki4 + E5 * ki5 + E6 * ki6 + E7 * ki7)
+        err = max(abs(error_s) / (tol * (1.0 + max(abs(s), abs(s_nuevo)))),
+                  abs(error_i) / (tol * (1.0 + max(abs(i), abs(i_nuevo)))))
+
+        if err <= 1.0:
+            # coeficientes de la salida densa del paso [t, t + h]
+            denso_s = h * (D1 * ks1 + D3 * ks3 + D4 * ks4 + D5 * ks5 + D6 * ks6 + D7 * ks7)
+            denso_i = h * (D1 * ki1 + D3 * ki3 + D4 * ki4 + D5 * ki5 + D6 * ki6 + D7 * ki7)
+            pasos.append((t, h, s, i, s_nuevo, i_nuevo, ks1, ki1, ks7, ki7, denso_s, denso_i))
+            t += h
+            s, i, ks1, ki1 = s_nuevo, i_nuevo, ks7, ki7
+            error_max = max(error_max, abs(error_s), abs(error_i))
+        elif err != err:
+            break                # NaN: parámetros fuera de dominio
+        else:
+            rechazados += 1
+        h *= min(5.0, max(0.2, 0.9 * err ** -0.2)) if err > 0 else 5.0
+        if h < H_MINIMO * tmax:
+            break                # el paso colapsa (solución que diverge)
+
+    t, S, I = _salida_densa(np.array(pasos).reshape(-1, 12), muestras_por_paso, t, s, i)
+    estadisticas = {"pasos": len(pasos), "rechazados": rechazados, "nfev": nfev, "error_max": error_max,
+                    "t_final": float(t[-1]), "tmax": tmax}
+    return t, S, I, total - S - I, estadisticas
+
+
+def _salida_densa(pasos, muestras, t_final, s_final, i_final):
+    # y(t0 + θh) = y0 + θ(Δ + (1-θ)(hk1 - Δ + θ(Δ - hk7 - (hk1 - Δ) + (1-θ)·denso)))
+    t0, h, s0, i0, s1, i1, ks1, ki1, ks7, ki7, denso_s, denso_i = (pasos[:, [c]] for c in range(12))
+    theta = np.arange(muestras)[None, :] / muestras
+    curvas = []
+    for y0, y1, k1, k7, denso in ((s0, s1, ks1, ks7, denso_s), (i0, i1, ki1, ki7, denso_i)):
+        r2 = y1 - y0
+        r3 = h * k1 - r2
+        r4 = r2 - h * k7 - r3
+        y = y0 + theta * (r2 + (1 - theta) * (r3 + theta * (r4 + (1 - theta) * denso)))
+        curvas.append(y.ravel())
+    t = (t0 + h * theta).ravel()
+    return np.append(t, t_final), np.append(curvas[0], s_final), np.append(curvas[1], i_final)
+
+
+def texto_estadisticas_rk(estadisticas):
+    """Línea corta para mostrar junto a la gráfica."""
+    texto = (f"Dormand–Prince 5(4): {estadisticas['pasos']} pasos "
+             f"({estadisticas['rechazados']} rechazados) · evaluaciones f: {estadisticas['nfev']} · "
+             f"error local estimado máx.: {estadisticas['error_max']:.1e}")
+    if estadisticas["t_final"] < estadisticas["tmax"]:
+        texto += (f" · detenido en t = {estadisticas['t_final']:.3g} de {estadisticas['tmax']:g} "
+                  f"(máximo de {PASOS_MAXIMO} pasos; β muy grande)")
+    return texto
+
+# ------------------------------------------------------
+# Pico y tamaño final sin integrar (cantidad conservada)
+# ------------------------------------------------------
+# Dividiendo dI/dt entre dS/dt: dI/dS = -1 + K/S con K = γ/β, así que
+#     S + I - K·ln S
+# se conserva a lo largo de toda la trayectoria. De ahí:
+#   - el pico de I ocurre en S = K (si S0 > K; si no, I solo decrece y el
+#     pico es I0):  I_max = S0 + I0 - K + K·ln(K / S0)
+#   - con I(∞) = 0, S(∞) es la raíz de S - K ln S = S0 + I0 - K ln S0:
+#     S(∞) = -K·W0(-(S0/K)·exp(-(S0 + I0)/K)),  W0 la rama principal de
+#     Lambert W.
+
+def resumen_analitico(beta, gamma, S0, I0):
+    """
+    Pico de I, S en el pico y tamaño final S0 - S(∞) del SIR, sin pasos
+    de tiempo. Acepta escalares o arreglos (broadcasting) y devuelve un
+    dict de arreglos con la forma del lote.
+    """
+    from scipy.special import lambertw
+
+    beta, gamma, S0, I0 = np.broadcast_arrays(
+        *(np.asarray(p, dtype=float) for p in (beta, gamma, S0, I0))
+    )
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        K = gamma / beta                     # β = 0: K = inf, no hay contagio
+        epidemia = S0 > K
+        s_pico = np.where(epidemia, K, S0)
+        pico_i = np.where(epidemia, S0 + I0 - K + K * np.log(K / S0), I0)
+
+        argumento = -(S0 / K) * np.exp(-(S0 + I0) / K)
+        # W0 está definida desde -1/e; el redondeo puede dejar el argumento
+        # un ulp por debajo cuando S0 + I0 ≈ K
+        argumento = np.maximum(argumento, -np.exp(-1.0))
+        s_final = np.where(np.isfinite(K), -K * lambertw(argumento, 0).real, S0)
+    return {"pico_i": pico_i, "s_pico": s_pico, "tamano_final": S0 - s_final}
+
+
+def contrastar_trayectoria(resumen, beta, gamma, S, I):
+    """
+    Compara un resumen analítico (escalar) con una trayectoria numérica
+    S(t), I(t) del mismo SIR. Devuelve el error relativo del pico, el del
+    tamaño final (None si la trayectoria termina con la epidemia aún en
+    curso) y la deriva máxima de la cantidad conservada S + I - K ln S,
+    relativa a S0 + I0.
+    """
+    S, I = np.asarray(S, dtype=float), np.asarray(I, dtype=float)
+    pico_i = float(resumen["pico_i"])
+    tamano_final = float(resumen["tamano_final"])
+
+    error_pico = abs(I.max() - pico_i) / pico_i if pico_i else 0.0
+    # epidemia terminada: I final despreciable frente al pico
+    terminada = I[-1] <= 1e-3 * max(pico_i, 1e-300)
+    error_final = None
+    if terminada and tamano_final:
+        error_final = abs((S[0] - S[-1]) - tamano_final) / tamano_final
+
+    deriva = 0.0
+    if beta > 0 and np.all(S > 0):
+        C = S + I - gamma / beta * np.log(S)
+        deriva = float(np.max(np.abs(C - C[0])) / (S[0] + I[0]))
+    return {"error_pico": float(error_pico), "error_final": error_final, "deriva": deriva}
@@ -0,0 +1,340 @@
+"""
+Tablas precalculadas de resultados del SIR (pico de I, tiempo del pico y
+tamaño final) sobre una malla densa de parámetros.
+
+El SIR de las páginas
+    dS/dt = -β S I,   dI/dt = β S I - γ I
+con τ = γ·t, u = S/S0 y v = I/S0 queda
+    du/dτ = -ρ u v,   dv/dτ = ρ u v - v,   u(0) = 1, v(0) = I0/S0
+con ρ = (β/γ)·S0. Los resultados en (β/γ, I0, S0) salen entonces de una
+tabla en dos ejes, ρ e ι = I0/S0:
+    pico de I = S0·v_pico,   t_pico = τ_pico / γ,   tamaño final = S0·(1 - u(∞)).
+El constructor integra toda la malla a la vez (RK4 vectorizado) y guarda
+cada resultado como un .npy que las páginas abren con mmap y consultan
+por interpolación bilineal, sin integrar.
+
+Uso (desde la raíz del repositorio):
+    python -m modelos.tablas_sir                        # malla por defecto
+    python -m modelos.tablas_sir --rho 801 --iota 241   # más densa
+
+Variables de entorno: TABLAS_SIR_DIR (carpeta de las tablas, por defecto
+cache/tablas_sir) y TABLAS_SIR_CONSTRUIR ("1" para que, si faltan, la
+primera consulta de `resumen_sir` lance el constructor en un proceso
+aparte, ~30 s de CPU). Sin tablas, mientras se construyen o fuera del
+rango de la malla, `resumen_sir` integra el punto pedido.
+
+El pico y el tamaño final también tienen forma cerrada
+(modelos.sir.resumen_analitico): `resumen_sir` los toma de ahí y usa
+las tablas solo para el tiempo del pico. Las columnas v_pico y
+tamano_final sirven para contrastar la integración con esa forma
+cerrada al construir.
+"""
+import argparse
+import functools
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+RUTA_TABLAS = os.environ.get(
+    "TABLAS_SIR_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "tablas_sir"),
+)
+
+# ejes logarítmicos: nombre -> (mínimo, máximo, puntos por defecto). El
+# rango de ρ es simétrico en log alrededor de 1 y con un número impar de
+# puntos, así ρ = 1 (umbral epidémico, donde el pico deja de estar en
+# τ = 0) es un nodo y ninguna celda interpola a través del quiebre.
+EJES = {
+    "rho": (0.05, 20.0, 401),
+    "iota": (1e-6, 1.0, 121),
+}
+RESULTADOS = ("v_pico", "tau_pico", "tamano_final")
+
+# integración de la malla: paso y horizonte en τ (RK4 es estable hasta
+# ρ·v·h ≈ 2.8); una celda cuyo v no bajó de TOLERANCIA_FINAL queda en
+# NaN y se integra al consultarla (ρ justo por debajo de 1 decae lento)
+PASO_TAU = 0.025
+TAU_MAXIMO = 400.0
+TOLERANCIA_FINAL = 1e-9
+
+CONSTRUIR_EN_FONDO = os.environ.get("TABLAS_SIR_CONSTRUIR") == "1"
+# un cerrojo más viejo que esto es de una construcción que murió a medias
+CERROJO_CADUCO = 3600
+
+
+# ------------------------------------------------------
+# Constructor (fuera de línea)
+# ------------------------------------------------------
+def eje(nombre, puntos=None):
+    minimo, maximo, por_defecto = EJES[nombre]
+    return np.geomspace(minimo, maximo, puntos or por_defecto)
+
+
+def integrar_malla(rho, iota, paso=PASO_TAU, tau_maximo=TAU_MAXIMO):
+    """
+    RK4 de paso fijo en τ sobre todas las combinaciones de (rho, iota)
+    (arreglos 1-D). Devuelve v_pico, tau_pico y tamano_final (relativo a
+    S0) con forma (len(rho), len(iota)).
+    """
+    P, V = np.meshgrid(rho, iota, indexing="ij")
+    r = P.ravel()
+    u, v = np.ones(r.size), V.ravel().copy()
+    h = paso
+
+    def f(u, v):
+        contagio = r * u * v
+        return -contagio, contagio - v
+
+    # pico: mejor muestra y sus dos vecinas, para ajustar una parábola
+    mejor, k_mejor = v.copy(), np.zeros(v.size, dtype=np.int64)
+    izq, der = v.copy(), v.copy()
+    pasos = int(round(tau_maximo / h))
+    for k in range(1, pasos + 1):
+        k1u, k1v = f(u, v)
+        k2u, k2v = f(u + 0.5 * h * k1u, v + 0.5 * h * k1v)
+        k3u, k3v = f(u + 0.5 * h * k2u, v + 0.5 * h * k2v)
+        k4u, k4v = f(u + h * k3u, v + h * k3v)
+        v_previo = v
+        u = u + h / 6.0 * (k1u + 2 * k2u + 2 * k3u + k4u)
+        v = v + h / 6.0 * (k1v + 2 * k2v + 2 * k3v + k4v)
+
+        der = np.where(k_mejor == k - 1, v, der)
+        sube = v > mejor
+        if sube.any():
+            mejor = np.where(sube, v, mejor)
+            izq = np.where(sube, v_previo, izq)
+            k_mejor = np.where(sube, k, k_mejor)
+
+    # vértice de la parábola por (k-1, k, k+1); en τ = 0 el pico es ι
+    curvatura = izq - 2 * mejor + der
+    interior = (k_mejor > 0) & (curvatura < 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        delta = np.where(interior, 0.5 * (izq - der) / curvatura, 0.0)
+    v_pico = mejor - 0.25 * (izq - der) * delta
+    tau_pico = (k_mejor + delta) * h
+
+    tamano_final = 1.0 - u
+    tamano_final[v > TOLERANCIA_FINAL] = np.nan
+
+    forma = P.shape
+    return v_pico.reshape(forma), tau_pico.reshape(forma), tamano_final.reshape(forma)
+
+
+def construir(ruta=RUTA_TABLAS, puntos=None, bloque=32):
+    """Integra la malla (por bloques de ρ) y guarda ejes y resultados como .npy."""
+    puntos = puntos or {}
+    ejes = {nombre: eje(nombre, puntos.get(nombre)) for nombre in EJES}
+    forma = tuple(len(v) for v in ejes.values())
+    os.makedirs(ruta, exist_ok=True)
+
+    salidas = {
+        nombre: np.lib.format.open_memmap(os.path.join(ruta, f"{nombre}.npy.tmp"), mode="w+",
+                                          dtype=np.float64, shape=forma)
+        for nombre in RESULTADOS
+    }
+    for inicio in range(0, forma[0], bloque):
+        fin = min(inicio + bloque, forma[0])
+        for nombre, valores in zip(RESULTADOS, integrar_malla(ejes["rho"][inicio:fin], ejes["iota"])):
+            salidas[nombre][inicio:fin] = valores
+
+    # todo se escribe en .tmp y se reemplaza al final, los ejes primero,
+    # para que un lector nunca vea tablas a medias; entre un reemplazo y
+    # otro las formas no coinciden y _abrir_tablas rechaza la mezcla
+    for nombre, valores in ejes.items():
+        with open(os.path.join(ruta, f"{nombre}.npy.tmp"), "wb") as f:
+            np.save(f, valores)
+        os.replace(os.path.join(ruta, f"{nombre}.npy.tmp"), os.path.join(ruta, f"{nombre}.npy"))
+    for nombre, valores in salidas.items():
+        valores.flush()
+        os.replace(os.path.join(ruta, f"{nombre}.npy.tmp"), os.path.join(ruta, f"{nombre}.npy"))
+    return forma
+
+
+_construcciones = {}      # ruta -> hilo que espera al constructor
+
+
+def construir_en_fondo(ruta=RUTA_TABLAS):
+    """
+    Lanza `python -m modelos.tablas_sir` en otro proceso (no compite por
+    el GIL con el servidor) si nadie lo está haciendo ya: un cerrojo
+    creado con O_EXCL en `ruta` lo reserva también entre procesos. Se
+    intenta una vez por proceso y ruta. Devuelve True si lo lanzó.
+    """
+    if ruta in _construcciones:
+        return False
+    os.makedirs(ruta, exist_ok=True)
+    cerrojo = os.path.join(ruta, "construyendo.lock")
+    try:
+        if time.time() - os.path.getmtime(cerrojo) > CERROJO_CADUCO:
+            os.remove(cerrojo)
+    except OSError:
+        pass
+    try:
+        os.close(os.open(cerrojo, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return False
+
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    orden = [sys.executable, "-m", "modelos.tablas_sir", "--salida", os.path.abspath(ruta)]
+    proceso = subprocess.Popen(orden, cwd=raiz, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def esperar():
+        try:
+            proceso.wait()
+        finally:
+            os.remove(cerrojo)
+
+    _construcciones[ruta] = hilo = threading.Thread(target=esperar, name="tablas_sir", daemon=True)
+    hilo.start()
+    return True
+
+
+# ------------------------------------------------------
+# Consulta (páginas)
+# ------------------------------------------------------
+@functools.lru_cache(maxsize=4)
+def _abrir_tablas(ruta, firma):
+    # `firma` (fechas de modificación) solo forma parte de la clave
+    ejes = {nombre: np.log(np.load(os.path.join(ruta, f"{nombre}.npy"))) for nombre in EJES}
+    tablas = {nombre: np.load(os.path.join(ruta, f"{nombre}.npy"), mmap_mode="r") for nombre in RESULTADOS}
+    forma = tuple(len(v) for v in ejes.values())
+    if any(t.shape != forma for t in tablas.values()):
+        raise ValueError(f"tablas de {ruta} con ejes de otra malla (reconstrucción a medias)")
+    return ejes, tablas
+
+
+def cargar_tablas(ruta=RUTA_TABLAS):
+    """
+    log de los ejes (en memoria) y resultados (mmap) de `ruta`, o None si
+    no están. La caché va por fecha de modificación de los archivos: las
+    tablas que construye o reconstruye otro proceso se ven en cuanto se
+    reemplazan, y su ausencia no se guarda.
+    """
+    try:
+        firma = tuple(os.stat(os.path.join(ruta, f"{nombre}.npy")).st_mtime_ns for nombre in (*EJES, *RESULTADOS))
+        return _abrir_tablas(ruta, firma)
+    except (OSError, ValueError):
+        return None
+
+
+def _celda(coordenadas, valor):
+    # índice inferior y peso del vecino superior en un eje creciente
+    k = int(np.searchsorted(coordenadas, valor, side="right")) - 1
+    k = min(max(k, 0), len(coordenadas) - 2)
+    peso = (valor - coordenadas[k]) / (coordenadas[k + 1] - coordenadas[k])
+    return k, peso
+
+
+def interpolar(rho, iota, columnas=RESULTADOS, ruta=RUTA_TABLAS):
+    """
+    `columnas` interpoladas (bilineal en log ρ, log ι) como dict
+    nombre -> valor, o None si no hay tablas, el punto cae fuera de la
+    malla o alguna celda vecina no convergió.
+    """
+    cargadas = cargar_tablas(ruta)
+    if cargadas is None or rho <= 0 or iota <= 0:
+        return None
+    ejes, tablas = cargadas
+    celdas = []
+    for nombre, valor in zip(EJES, (rho, iota)):
+        valor = np.log(valor)
+        if not ejes[nombre][0] <= valor <= ejes[nombre][-1]:
+            return None
+        celdas.append(_celda(ejes[nombre], valor))
+
+    (a, pa), (b, pb) = celdas
+    resultado = {}
+    for nombre in columnas:
+        (v00, v01), (v10, v11) = tablas[nombre][a:a + 2, b:b + 2]
+        valor = (1 - pa) * ((1 - pb) * v00 + pb * v01) + pa * ((1 - pb) * v10 + pb * v11)
+        if not np.isfinite(valor):
+            return None
+        resultado[nombre] = float(valor)
+    return resultado
+
+
+def integrar_punto(rho, iota):
+    """Mismos resultados que la tabla, integrando solo este punto (solve_ivp)."""
+    from modelos.eventos import cruce, integrar_con_eventos, maximo_global, pico
+
+    def rhs(tau, y):
+        contagio = rho * y[0] * y[1]
+        return [-contagio, contagio - y[1]]
+
+    # termina cuando v es despreciable: a partir de ahí u ya no cambia
+    fin = cruce(1, TOLERANCIA_FINAL, direccion=-1, terminal=True)
+    sol, eventos = integrar_con_eventos(rhs, [0.0, 1e6], [1.0, iota], {"pico": pico(rhs, 1), "fin": fin},
+                                        method="LSODA", rtol=1e-10, atol=1e-13)
+    tau_pico, v_pico = maximo_global(sol, eventos, 1)
+    return {"v_pico": v_pico, "tau_pico": tau_pico, "tamano_final": float(1.0 - sol.y[0][-1])}
+
+
+def resumen_sir(beta, gamma, S0, I0):
+    """
+    Pico de I y tamaño final S0 - S(∞) (forma cerrada) y tiempo del pico
+    en las unidades de la página: interpolado de las tablas si se puede,
+    integrado si no. Devuelve (dict, origen) con el origen del tiempo del
+    pico, "tabla" o "integración", o (None, None) si los parámetros no
+    tienen sentido. Si faltan las tablas, lanza su construcción.
+    """
+    from modelos.sir import resumen_analitico
+
+    if None in (beta, gamma, S0, I0) or gamma <= 0 or beta < 0 or S0 <= 0 or I0 <= 0:
+        return None, None
+    rho, iota = beta / gamma * S0, I0 / S0
+    if CONSTRUIR_EN_FONDO and cargar_tablas() is None:
+        construir_en_fondo()
+    if rho <= 1:
+        # I solo decrece: el pico es I0, en t = 0
+        resultado, origen = {"tau_pico": 0.0}, "tabla"
+    else:
+        resultado, origen = interpolar(rho, iota, ("tau_pico",)), "tabla"
+        if resultado is None:
+            resultado, origen = integrar_punto(rho, iota), "integración"
+    analitico = resumen_analitico(beta, gamma, S0, I0)
+    return {
+        "pico_i": float(analitico["pico_i"]),
+        "t_pico": resultado["tau_pico"] / gamma,
+        "tamano_final": float(analitico["tamano_final"]),
+    }, origen
+
+
+def contrastar(ruta=RUTA_TABLAS):
+    """Máximo error relativo de v_pico y tamano_final de las tablas frente a la forma cerrada."""
+    from modelos.sir import resumen_analitico
+
+    ejes, tablas = cargar_tablas(ruta)
+    P, V = np.meshgrid(np.exp(ejes["rho"]), np.exp(ejes["iota"]), indexing="ij")
+    # en variables (u, v): β/γ = ρ, S0 = 1, I0 = ι
+    analitico = resumen_analitico(P, 1.0, 1.0, V)
+    errores = {}
+    for tabla, columna in (("v_pico", "pico_i"), ("tamano_final", "tamano_final")):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relativo = np.abs(tablas[tabla] - analitico[columna]) / np.abs(analitico[columna])
+        errores[tabla] = float(np.nanmax(relativo[analitico[columna] > 0]))
+    return errores
+
+
+# ------------------------------------------------------
+# Programa
+# ------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--salida", default=RUTA_TABLAS, help="carpeta de las tablas .npy")
+    for nombre, (_, _, puntos) in EJES.items():
+        parser.add_argument(f"--{nombre}", type=int, default=puntos, help=f"puntos en el eje {nombre} (impar en rho)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    forma = construir(args.salida, {nombre: getattr(args, nombre) for nombre in EJES})
+    print(f"tablas {forma} en {args.salida} ({time.perf_counter() - t0:.1f} s)")
+    for nombre, error in contrastar(args.salida).items():
+        print(f"  {nombre}: error relativo máximo frente a la forma cerrada {error:.2e}")
+
+
+if __name__ == "__main__":
+    main()
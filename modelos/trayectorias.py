@@ -0,0 +1,51 @@
+import numpy as np
+
+# ------------------------------------------------------
+# Integración de muchas semillas a la vez (RK4 vectorizado)
+# ------------------------------------------------------
+def rk4_lote(fx, fy, x0, y0, t_final, pasos=200):
+    """
+    Integra dx/dt = fx(x, y), dy/dt = fy(x, y) desde todas las semillas
+    (x0[i], y0[i]) a la vez con RK4 de paso fijo. t_final negativo integra
+    hacia atrás. Cada etapa evalúa fx y fy una sola vez sobre todo el lote.
+
+    Devuelve X, Y con forma (pasos + 1, n_semillas).
+    """
+    x = np.array(x0, dtype=float).ravel()
+    y = np.array(y0, dtype=float).ravel()
+    h = float(t_final) / pasos
+
+    X = np.empty((pasos + 1, x.size))
+    Y = np.empty((pasos + 1, x.size))
+    X[0], Y[0] = x, y
+
+    with np.errstate(all="ignore"):
+        for k in range(pasos):
+            k1x, k1y = fx(x, y), fy(x, y)
+            xm, ym = x + 0.5 * h * k1x, y + 0.5 * h * k1y
+            k2x, k2y = fx(xm, ym), fy(xm, ym)
+            xm, ym = x + 0.5 * h * k2x, y + 0.5 * h * k2y
+            k3x, k3y = fx(xm, ym), fy(xm, ym)
+            xm, ym = x + h * k3x, y + h * k3y
+            k4x, k4y = fx(xm, ym), fy(xm, ym)
+            x = x + h / 6.0 * (k1x + 2 * k2x + 2 * k3x + k4x)
+            y = y + h / 6.0 * (k1y + 2 * k2y + 2 * k3y + k4y)
+            X[k + 1], Y[k + 1] = x, y
+
+    return X, Y
+
+
+def recortar(X, Y, xmax, ymax):
+    """
+    Pone NaN en cada trayectoria desde que sale de la caja
+    [-xmax, xmax] x [-ymax, ymax] (o diverge), para no dibujarla fuera.
+    """
+    fuera = ~(np.isfinite(X) & np.isfinite(Y) & (np.abs(X) <= xmax) & (np.abs(Y) <= ymax))
+    fuera = np.logical_or.accumulate(fuera, axis=0)
+    return np.where(fuera, np.nan, X), np.where(fuera, np.nan, Y)
+
+
+def polilinea(X, Y):
+    """Une todas las trayectorias (columnas) en una sola polilínea separada por NaN."""
+    hueco = np.full((1, X.shape[1]), np.nan)
+    return np.vstack([X, hueco]).T.ravel(), np.vstack([Y, hueco]).T.ravel()
@@ -1,11 +1,20 @@
 # /pages/EjercicioSEIR.py
+import functools
+
 import dash
 from dash import html, dcc, Input, Output, State
 import numpy as np
-import pandas as pd
-from scipy.integrate import odeint
 import numpy.linalg as LA
-import plotly.express as px
+import plotly.graph_objects as go
+
+from modelos.estabilidad import parte_real_dominante, mapa_estabilidad
+from modelos.eventos import extincion, integrar_con_eventos, maximo_global, pico, primer_evento
+from modelos.integracion import estadisticas_solve_ivp, texto_estadisticas
+from utilidades.cache import memoizar
+from utilidades.metricas import instrumentar
+from utilidades.serializacion import parche_trazas
+from utilidades.submuestreo import indices_lttb, muestrear_denso
+from utilidades.trabajos import callback_en_fondo
 
 dash.register_page(__name__, path="/Semana1:2", name="SEIR - Estabilidad")
 
@@ -18,6 +27,17 @@ def seir_rhs(y, t, N, beta, sigma, gamma):
     dRdt =  gamma * I
     return [dSdt, dEdt, dIdt, dRdt]
 
+def seir_jac(y, t, N, beta, sigma, gamma):
+    # Jacobiano analítico de seir_rhs (Dfun de odeint), orden [S, E, I, R]
+    S, E, I, R = y
+    bI, bS = beta * I / N, beta * S / N
+    return [
+        [-bI,  0.0,   -bS,    0.0],
+        [ bI, -sigma,  bS,    0.0],
+        [0.0,  sigma, -gamma, 0.0],
+        [0.0,  0.0,    gamma, 0.0],
+    ]
+
 def jacobian_DFE(N, beta, sigma, gamma):
     # Orden: [S, E, I, R]
     J = np.array([
@@ -28,6 +48,30 @@ def jacobian_DFE(N, beta, sigma, gamma):
     ])
     return J
 
+def seir_ivp(t, y, *args):
+    # mismo sistema con la firma de solve_ivp (t primero)
+    return seir_rhs(y, t, *args)
+
+@memoizar("seir_ivp")
+def integrar_seir(N, beta, sigma, gamma, I0, tmax):
+    E0 = 0.0
+    R0_init = 0.0
+    S0 = N - I0 - E0 - R0_init
+    y0 = [S0, E0, I0, R0_init]
+    # LSODA (pasa de Adams a BDF si el problema se vuelve rígido) con el
+    # Jacobiano analítico. El pico de I y su extinción (I < 1 individuo)
+    # salen de eventos del integrador, no de la malla de la gráfica.
+    sol, eventos = integrar_con_eventos(
+        seir_ivp, [0, float(tmax)], y0,
+        {"pico": pico(seir_ivp, 2), "extincion": extincion(2, 1.0)},
+        args=(N, beta, sigma, gamma), method="LSODA", rtol=1e-8, atol=1e-6,
+        jac=lambda t, y, *args: seir_jac(y, t, *args),
+    )
+    return sol.sol, estadisticas_solve_ivp(sol, "LSODA"), {
+        "pico": maximo_global(sol, eventos, 2),
+        "extincion": primer_evento(eventos, "extincion"),
+    }
+
 def dominant_real_part_eig(J):
     eigs = LA.eigvals(J)
     return np.max(np.real(eigs)), eigs
@@ -40,80 +84,158 @@ gamma_default = 1/7.0
 I0_default = 10.0
 tmax_default = 160
 tsteps_default = 801
+n_sweep_max = 1_000_000
+n_mapa_max = 1000
+bloque_sweep = 50_000
+
+# --- figuras base (los callbacks solo cambian sus datos) ---
+COMPARTIMENTOS = ("Susceptibles", "Expuestos", "Infectados", "Recuperados")
+
+@functools.lru_cache(maxsize=1)
+def figura_simulacion():
+    fig = go.Figure([go.Scatter(x=[], y=[], mode="lines", name=nombre) for nombre in COMPARTIMENTOS])
+    # pico de I (anotado)
+    fig.add_scatter(x=[], y=[], mode="markers+text", name="Pico I",
+                    marker=dict(size=10, color="#1e3a8a"), textposition="top center")
+    fig.update_layout(title="Dinámica SEIR", template="plotly_white",
+                      xaxis_title="Tiempo", yaxis_title="Población",
+                      legend_title_text="Compartimentos")
+    return fig
+
+@functools.lru_cache(maxsize=1)
+def figura_tanteo():
+    fig = go.Figure(go.Scattergl(x=[], y=[], mode="lines", name="max Re λ"))
+    # primer cruce del umbral
+    fig.add_scatter(x=[], y=[], mode="markers+text", name="Cruce",
+                    marker=dict(size=8, color="#ff7f0e"), textposition="bottom right")
+    fig.update_layout(template="plotly_white", showlegend=False,
+                      title="Tanteo de estabilidad: mayor parte real vs R0",
+                      xaxis_title="R0 (β/γ)", yaxis_title="Mayor parte real autovalores")
+    fig.add_hline(y=0.0, line_dash="dash", line_color="red",
+                  annotation_text="Umbral estabilidad (0)", annotation_position="top left")
+    return fig
+
+@functools.lru_cache(maxsize=1)
+def figura_mapa():
+    # escala divergente centrada en 0: azul estable, rojo inestable
+    fig = go.Figure(go.Heatmap(x=[], y=[], z=[], colorscale="RdBu_r", zmid=0.0,
+                               colorbar=dict(title="max Re λ (E, I)")))
+    # frontera R0 = 1  (β = γ)
+    fig.add_scatter(x=[], y=[], mode="lines", line=dict(color="black", dash="dash"), name="R0 = 1")
+    fig.update_layout(template="plotly_white",
+                      title="Mapa de estabilidad del DFE (bloque E, I)",
+                      xaxis_title="β", yaxis_title="γ")
+    return fig
 
 # --- layout ---
-layout = html.Div(className="app-container", children=[
-
-    html.Div(className="app-header", children=[html.H1("SEIR: estabilidad y tanteos")]),
-
-    # controles principales
-    html.Div(style={"display":"flex","gap":"20px","flexWrap":"wrap","padding":"18px"}, children=[
-
-        html.Div(style={"flex":"1","minWidth":"300px","padding":"16px","borderRight":"1px solid #ccc"}, children=[
-            html.H3("Parámetros de simulación"),
-            html.Label("β (tasa de transmisión)"),
-            dcc.Slider(id="beta-slider", min=0.0, max=1.5, step=0.01, value=beta_default,
-                       marks={0:"0",0.25:"0.25",0.5:"0.5",1.0:"1.0",1.5:"1.5"}),
-            html.Label("σ (tasa de progresión E→I, 1/días)"),
-            dcc.Slider(id="sigma-slider", min=0.02, max=1.0, step=0.01, value=sigma_default,
-                       marks={0.02:"0.02",0.2:"0.2",0.5:"0.5",1.0:"1.0"}),
-            html.Label("γ (tasa de recuperación, 1/días)"),
-            dcc.Slider(id="gamma-slider", min=0.02, max=1.0, step=0.005, value=gamma_default,
-                       marks={0.02:"0.02",0.142857:"1/7",0.2:"0.2",0.5:"0.5"}),
-            html.Br(),
-            html.Label("Infectados iniciales I(0)"),
-            dcc.Input(id="i0-input", type="number", value=I0_default, min=0, step=1),
-            html.Br(), html.Br(),
-            html.Label("Duración simulación (días)"),
-            dcc.Input(id="tmax-input", type="number", value=tmax_default, min=10, step=10),
-            html.Br(), html.Br(),
-            html.Button("Simular", id="sim-btn", n_clicks=0, style={"padding":"8px 12px"})
+def layout():
+    return html.Div(className="app-container", children=[
+
+        html.Div(className="app-header", children=[html.H1("SEIR: estabilidad y tanteos")]),
+
+        # controles principales
+        html.Div(style={"display":"flex","gap":"20px","flexWrap":"wrap","padding":"18px"}, children=[
+
+            html.Div(style={"flex":"1","minWidth":"300px","padding":"16px","borderRight":"1px solid #ccc"}, children=[
+                html.H3("Parámetros de simulación"),
+                html.Label("β (tasa de transmisión)"),
+                dcc.Slider(id="beta-slider", min=0.0, max=1.5, step=0.01, value=beta_default,
+                           marks={0:"0",0.25:"0.25",0.5:"0.5",1.0:"1.0",1.5:"1.5"}),
+                html.Label("σ (tasa de progresión E→I, 1/días)"),
+                dcc.Slider(id="sigma-slider", min=0.02, max=1.0, step=0.01, value=sigma_default,
+                           marks={0.02:"0.02",0.2:"0.2",0.5:"0.5",1.0:"1.0"}),
+                html.Label("γ (tasa de recuperación, 1/días)"),
+                dcc.Slider(id="gamma-slider", min=0.02, max=1.0, step=0.005, value=gamma_default,
+                           marks={0.02:"0.02",0.142857:"1/7",0.2:"0.2",0.5:"0.5"}),
+                html.Br(),
+                html.Label("Infectados iniciales I(0)"),
+                dcc.Input(id="i0-input", type="number", value=I0_default, min=0, step=1),
+                html.Br(), html.Br(),
+                html.Label("Duración simulación (días)"),
+                dcc.Input(id="tmax-input", type="number", value=tmax_default, min=10, step=10),
+                html.Br(), html.Br(),
+                html.Button("Simular", id="sim-btn", n_clicks=0, style={"padding":"8px 12px"})
+            ]),
+
+            # resultados analíticos y autovalores
+            html.Div(style={"flex":"1.2","minWidth":"320px","padding":"16px"}, children=[
+                html.H3("Resultados analíticos (DFE)"),
+                dcc.Markdown(id="analytic-output", mathjax=True),
+                html.H4("Autovalores del Jacobiano en DFE"),
+                html.Pre(id="eigs-text", style={"whiteSpace":"pre-wrap","fontSize":"13px","background":"#fff","padding":"8px","borderRadius":"6px"})
+            ])
         ]),
 
-        # resultados analíticos y autovalores
-        html.Div(style={"flex":"1.2","minWidth":"320px","padding":"16px"}, children=[
-            html.H3("Resultados analíticos (DFE)"),
-            dcc.Markdown(id="analytic-output", mathjax=True),
-            html.H4("Autovalores del Jacobiano en DFE"),
-            html.Pre(id="eigs-text", style={"whiteSpace":"pre-wrap","fontSize":"13px","background":"#fff","padding":"8px","borderRadius":"6px"})
-        ])
-    ]),
+        # gráficos: simulación + tanteo estabilidad
+        html.Div(style={"display":"flex","gap":"20px","flexWrap":"wrap","padding":"8px"}, children=[
 
-    # gráficos: simulación + tanteo estabilidad
-    html.Div(style={"display":"flex","gap":"20px","flexWrap":"wrap","padding":"8px"}, children=[
+            html.Div(style={"flex":"1.2","minWidth":"380px","padding":"12px","background":"#fff","borderRadius":"8px"}, children=[
+                html.H3("Simulación S, E, I, R"),
+                dcc.Graph(id="sim-graph", figure=figura_simulacion(), config={"displayModeBar": True}, style={"height":"520px"}),
+                html.Div(id="solver-stats", style={"fontSize":"12px","color":"#555"})
+            ]),
 
-        html.Div(style={"flex":"1.2","minWidth":"380px","padding":"12px","background":"#fff","borderRadius":"8px"}, children=[
-            html.H3("Simulación S, E, I, R"),
-            dcc.Graph(id="sim-graph", config={"displayModeBar": True}, style={"height":"520px"})
+            html.Div(style={"flex":"0.9","minWidth":"360px","padding":"12px","background":"#fff","borderRadius":"8px"}, children=[
+                html.H3("Tanteo de estabilidad en β"),
+                html.Label("Rango de β para tanteo"),
+                dcc.Input(id="beta-min", type="number", value=0.0, step=0.01, style={"width":"120px","marginRight":"8px"}),
+                dcc.Input(id="beta-max", type="number", value=1.0, step=0.01, style={"width":"120px"}),
+                html.Br(), html.Br(),
+                html.Label("Puntos en el barrido"),
+                dcc.Input(id="n-points", type="number", value=200, min=10, max=n_sweep_max, step=1),
+                html.Br(), html.Br(),
+                html.Label("Cálculo de autovalores"),
+                dcc.RadioItems(id="sweep-method", value="cerrado", inline=True, options=[
+                    {"label": "Polinomio característico", "value": "cerrado"},
+                    {"label": "eigvals por lotes", "value": "eig"},
+                ]),
+                html.Br(),
+                html.Button("Ejecutar tanteo", id="sweep-btn", n_clicks=0, style={"padding":"8px 12px"}),
+                html.Button("Cancelar", id="sweep-cancel", n_clicks=0, disabled=True, style={"padding":"8px 12px","marginLeft":"8px"}),
+                html.Progress(id="sweep-progress", value="0", max="100", style={"width":"100%","marginTop":"8px"}),
+                dcc.Graph(id="stability-graph", figure=figura_tanteo(), style={"height":"420px"}),
+                html.Hr(),
+                html.H3("Mapa de estabilidad β × γ"),
+                html.Label("Rango de γ para el mapa"),
+                dcc.Input(id="gamma-min", type="number", value=0.02, step=0.01, style={"width":"120px","marginRight":"8px"}),
+                dcc.Input(id="gamma-max", type="number", value=1.0, step=0.01, style={"width":"120px"}),
+                html.Br(), html.Br(),
+                html.Label("Puntos por eje"),
+                dcc.Input(id="n-points-map", type="number", value=200, min=10, max=n_mapa_max, step=1),
+                html.Br(), html.Br(),
+                html.Button("Ejecutar mapa", id="map-btn", n_clicks=0, style={"padding":"8px 12px"}),
+                dcc.Graph(id="stability-map", figure=figura_mapa(), style={"height":"420px"})
+            ])
         ]),
 
-        html.Div(style={"flex":"0.9","minWidth":"360px","padding":"12px","background":"#fff","borderRadius":"8px"}, children=[
-            html.H3("Tanteo de estabilidad en β"),
-            html.Label("Rango de β para tanteo"),
-            dcc.Input(id="beta-min", type="number", value=0.0, step=0.01, style={"width":"120px","marginRight":"8px"}),
-            dcc.Input(id="beta-max", type="number", value=1.0, step=0.01, style={"width":"120px"}),
-            html.Br(), html.Br(),
-            html.Label("Puntos en el barrido"),
-            dcc.Input(id="n-points", type="number", value=200, min=10, max=2000, step=1),
-            html.Br(), html.Br(),
-            html.Button("Ejecutar tanteo", id="sweep-btn", n_clicks=0, style={"padding":"8px 12px"}),
-            dcc.Graph(id="stability-graph", style={"height":"420px"})
+        # resumen numérico del pico
+        html.Div(style={"maxWidth":"1000px","margin":"20px auto","padding":"12px"}, children=[
+            html.H4("Resumen numérico"),
+            html.Div(id="summary-metrics", style={"background":"#fff","padding":"10px","borderRadius":"6px"})
         ])
-    ]),
-
-    # resumen numérico del pico
-    html.Div(style={"maxWidth":"1000px","margin":"20px auto","padding":"12px"}, children=[
-        html.H4("Resumen numérico"),
-        html.Div(id="summary-metrics", style={"background":"#fff","padding":"10px","borderRadius":"6px"})
     ])
-])
 
 # --- callbacks ---
+def texto_extincion(t_ext, I0, I_final, tmax, umbral=1.0):
+    """
+    Texto de la extinción (I < umbral). El evento solo detecta cruces de
+    bajada: si I arranca en el umbral o por debajo y termina por debajo
+    sin haberlo cruzado no hay brote que se extinga, y se dice así en
+    lugar de "no se extingue".
+    """
+    if t_ext is not None:
+        return f"Extinción de la infección (I < {umbral:g}): {t_ext:.2f} días"
+    if I_final < umbral:
+        return (f"I0 = {I0:g} ya está en el umbral o por debajo (I ≤ {umbral:g}) y no lo supera: "
+                f"no hay brote que se extinga")
+    return f"La infección no se extingue (I ≥ {umbral:g}) antes de t = {float(tmax):g} días"
+
 @dash.callback(
     Output("sim-graph", "figure"),
     Output("analytic-output", "children"),
     Output("eigs-text", "children"),
     Output("summary-metrics", "children"),
+    Output("solver-stats", "children"),
     Input("sim-btn", "n_clicks"),
     State("beta-slider", "value"),
     State("sigma-slider", "value"),
@@ -121,33 +243,17 @@ layout = html.Div(className="app-container", children=[
     State("i0-input", "value"),
     State("tmax-input", "value")
 )
+@instrumentar
 def run_simulation(n_clicks, beta, sigma, gamma, I0, tmax):
     # parámetros
     N = N_default
     if I0 is None or I0 < 0:
         I0 = 1.0
-    E0 = 0.0
-    R0_init = 0.0
-    S0 = N - I0 - E0 - R0_init
-    y0 = [S0, E0, I0, R0_init]
-
-    # tiempo
-    t = np.linspace(0, float(tmax), int(max(101, np.round(float(tmax))*5)))
 
-    # integración
-    sol = odeint(seir_rhs, y0, t, args=(N, beta, sigma, gamma))
-    S, E, I, R = sol.T
-    df = pd.DataFrame({"Tiempo": t, "Susceptibles": S, "Expuestos": E, "Infectados": I, "Recuperados": R})
-    fig = px.line(df, x="Tiempo", y=["Susceptibles","Expuestos","Infectados","Recuperados"],
-                  labels={"value":"Población","variable":"Compartimentos"},
-                  title="Dinámica SEIR")
-    fig.update_layout(legend_title_text="Compartimentos", template="plotly_white")
-    fig.update_traces(mode="lines")
-
-    # pico de I
-    idx_peak = np.argmax(I)
-    t_peak = float(t[idx_peak])
-    I_peak = float(I[idx_peak])
+    # integración (memoizada por parámetros); métricas por eventos
+    sol, stats, metricas = integrar_seir(N, beta, sigma, gamma, I0, tmax)
+    t_peak, I_peak = metricas["pico"]
+    t_ext = metricas["extincion"]
 
     # Jacobiano y autovalores en DFE
     J = jacobian_DFE(N, beta, sigma, gamma)
@@ -172,28 +278,38 @@ $$R_0=\\dfrac{{\\beta}}{{\\gamma}}={R0_basic:.4f}$$
     summary = html.Div([
         html.P(f"Tiempo pico de infectados: {t_peak:.2f} días"),
         html.P(f"Infectados máximos (I_peak): {I_peak:.1f} individuos"),
+        html.P(texto_extincion(t_ext, I0, float(sol(float(tmax))[2]), tmax)),
         html.P(f"R0 calculado: {R0_basic:.4f}"),
         html.P(f"Mayor parte real de autovalores en DFE: {dom_real:.6f} (estable si <0)")
     ])
 
-    # anotar pico en la figura
-    fig.add_scatter(x=[t_peak], y=[I_peak], mode="markers+text",
-                    marker=dict(size=10, color="#1e3a8a"),
-                    text=[f" pico I≈{I_peak:.0f}"],
-                    textposition="top center")
-
-    return fig, analytic_md, eigs_text, summary
+    # la gráfica se evalúa del interpolante a resolución de pantalla; las
+    # métricas no dependen de estos puntos
+    # (solo se reemplazan los datos de las trazas de figura_simulacion)
+    t, series = muestrear_denso(sol, 0.0, float(tmax))
+    parche = parche_trazas(
+        *({"x": t, "y": serie} for serie in series),
+        {"x": [t_peak], "y": [I_peak], "text": [f" pico I≈{I_peak:.0f}"]},
+    )
+    return parche, analytic_md, eigs_text, summary, texto_estadisticas(stats)
 
-@dash.callback(
+@callback_en_fondo(
     Output("stability-graph", "figure"),
     Input("sweep-btn", "n_clicks"),
     State("beta-min", "value"),
     State("beta-max", "value"),
     State("n-points", "value"),
     State("sigma-slider", "value"),
-    State("gamma-slider", "value")
+    State("gamma-slider", "value"),
+    State("sweep-method", "value"),
+    progress=Output("sweep-progress", "value"),
+    cancel=Input("sweep-cancel", "n_clicks"),
+    running=[
+        (Output("sweep-btn", "disabled"), True, False),
+        (Output("sweep-cancel", "disabled"), False, True),
+    ],
 )
-def run_stability_sweep(n_clicks, beta_min, beta_max, n_points, sigma, gamma):
+def run_stability_sweep(set_progress, n_clicks, beta_min, beta_max, n_points, sigma, gamma, metodo="cerrado"):
     # validaciones básicas
     if beta_min is None: beta_min = 0.0
     if beta_max is None or beta_max <= beta_min: beta_max = max(beta_min + 0.1, 1.0)
@@ -201,34 +317,60 @@ def run_stability_sweep(n_clicks, beta_min, beta_max, n_points, sigma, gamma):
         n = int(n_points)
     except:
         n = 200
-    n = max(10, min(n, 2000))
+    n = max(10, min(n, n_sweep_max))
 
     betas = np.linspace(float(beta_min), float(beta_max), n)
-    dom_reals = []
-    r0s = []
-    for b in betas:
-        J = jacobian_DFE(N_default, b, sigma, gamma)
-        dom_real, eigs = dominant_real_part_eig(J)
-        dom_reals.append(dom_real)
-        r0s.append(b / gamma if gamma != 0 else np.nan)
-
-    df_sweep = pd.DataFrame({"beta": betas, "R0": r0s, "maxRe": dom_reals})
-
-    # figura: maxRe vs R0 (y=0 line)
-    fig = px.line(df_sweep, x="R0", y="maxRe",
-                  labels={"R0":"R0 (β/γ)","maxRe":"Mayor parte real autovalores"},
-                  title="Tanteo de estabilidad: mayor parte real vs R0")
-    fig.update_layout(template="plotly_white")
-    # línea umbral y=0
-    fig.add_hline(y=0.0, line_dash="dash", line_color="red",
-                  annotation_text="Umbral estabilidad (0)", annotation_position="top left")
-    # marcar el primer cruce (si existe)
-    crosses = df_sweep[df_sweep["maxRe"] >= 0]
-    if not crosses.empty:
-        first = crosses.iloc[0]
-        fig.add_scatter(x=[first["R0"]], y=[first["maxRe"]],
-                        mode="markers+text",
-                        marker=dict(size=8, color="#ff7f0e"),
-                        text=[f"cruce R0≈{first['R0']:.3f}"],
-                        textposition="bottom right")
-    return fig
+    # por bloques, para poder informar el progreso
+    dom_reals = np.empty(n)
+    for inicio in range(0, n, bloque_sweep):
+        fin = min(inicio + bloque_sweep, n)
+        dom_reals[inicio:fin] = parte_real_dominante(betas[inicio:fin], sigma, gamma, metodo or "cerrado")
+        set_progress(str(int(100 * fin / n)))
+    r0s = betas / gamma if gamma != 0 else np.full(n, np.nan)
+
+    k = indices_lttb(betas, dom_reals)
+    # marcar el primer cruce (si existe); sin cruce el marcador queda vacío
+    crosses = np.flatnonzero(dom_reals >= 0)
+    cruce = {"x": [], "y": [], "text": []}
+    if crosses.size:
+        c = crosses[0]
+        cruce = {"x": [r0s[c]], "y": [dom_reals[c]], "text": [f"cruce R0≈{r0s[c]:.3f}"]}
+    # figura: maxRe vs R0 sobre figura_tanteo (umbral y=0 ya dibujado)
+    return parche_trazas({"x": r0s[k], "y": dom_reals[k]}, cruce)
+
+@dash.callback(
+    Output("stability-map", "figure"),
+    Input("map-btn", "n_clicks"),
+    State("beta-min", "value"),
+    State("beta-max", "value"),
+    State("gamma-min", "value"),
+    State("gamma-max", "value"),
+    State("n-points-map", "value"),
+    State("sigma-slider", "value")
+)
+@instrumentar
+def run_stability_map(n_clicks, beta_min, beta_max, gamma_min, gamma_max, n_points, sigma):
+    if beta_min is None: beta_min = 0.0
+    if beta_max is None or beta_max <= beta_min: beta_max = max(beta_min + 0.1, 1.0)
+    if gamma_min is None or gamma_min <= 0: gamma_min = 0.02
+    if gamma_max is None or gamma_max <= gamma_min: gamma_max = max(gamma_min + 0.1, 1.0)
+    try:
+        n = int(n_points)
+    except:
+        n = 200
+    n = max(10, min(n, n_mapa_max))
+
+    betas = np.linspace(float(beta_min), float(beta_max), n)
+    gammas = np.linspace(float(gamma_min), float(gamma_max), n)
+    max_re = mapa_estabilidad(betas, gammas, sigma)
+
+    # escala simétrica alrededor de 0 (colores de figura_mapa)
+    lim = float(np.max(np.abs(max_re))) or 1.0
+    # frontera R0 = 1  (β = γ), vacía si no cae dentro del rango
+    g_lo = max(float(gamma_min), float(beta_min))
+    g_hi = min(float(gamma_max), float(beta_max))
+    frontera = [g_lo, g_hi] if g_hi > g_lo else []
+    return parche_trazas(
+        {"x": betas, "y": gammas, "z": max_re, "zmin": -lim, "zmax": lim},
+        {"x": frontera, "y": frontera},
+    )
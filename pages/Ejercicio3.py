@@ -1,11 +1,20 @@
 # Ejercicio3.py
+import functools
+import hashlib
+
 import dash
 from dash import html, dcc, callback, Input, Output, State
+from dash.exceptions import PreventUpdate
 from dash import dash_table
 import numpy as np
-import pandas as pd
-import plotly.express as px
-from scipy.integrate import solve_ivp
+import plotly.graph_objects as go
+
+from modelos.integracion import METODOS, elegir_metodo, estadisticas_solve_ivp, texto_estadisticas
+from utilidades.cache import memoizar, normalizar
+from utilidades.metricas import instrumentar
+from utilidades.serializacion import parche_trazas
+from utilidades.submuestreo import muestrear_denso, muestrear_denso_caja
+from utilidades.trabajos import callback_en_fondo, guardar_resultado, leer_resultado, limitar
 
 dash.register_page(__name__, path="/Semana2", name="Sistema Acoplado")
 
@@ -19,16 +28,56 @@ DEFAULTS = {
     "m": 0.1,       # mortalidad de y
     "x0": 10.0,
     "y0": 2.0,
-    "tmax": 200.0,
-    "npts": 2000
+    "tmax": 200.0
 }
 
+# puntos de la primera vista (trayectoria completa); el zoom pide más
+PUNTOS_GRUESOS = 500
+
 def rhs(t, z, r, kx, b, a, n, m):
     x, y = z
     dx = r * x * (1 - x / kx) - b * x * y
     dy = -m * y + (a * x * y) / (n + x)
     return [dx, dy]
 
+@memoizar("sistema_acoplado_solve_ivp", ignorar=("progreso",))
+def integrar(r, kx, b, a, n, m, x0, y0, tmax, progreso=None, metodo="auto"):
+    # importación diferida: pandas/plotly.express/scipy se cargan en el primer uso
+    from scipy.integrate import solve_ivp
+    args = (r, kx, b, a, n, m)
+    f = rhs
+    if progreso is not None:
+        # informa la fracción de [0, tmax] ya integrada
+        def f(t, z, *args):
+            progreso(min(t / tmax, 1.0))
+            return rhs(t, z, *args)
+
+    # rigidez estimada con el Jacobiano en la condición inicial y en los equilibrios
+    puntos = [(x0, y0)] + [(xe, ye) for _, xe, ye in equilibria(*args)[0]]
+    metodo = elegir_metodo([jacobian(x, y, *args) for x, y in puntos], tmax, metodo)
+    opciones = {}
+    if metodo != "RK45":
+        opciones["jac"] = lambda t, z, *args: jacobian(z[0], z[1], *args)
+
+    # sin t_eval: se guarda el interpolante (sol.sol) y cada vista lo
+    # evalúa a la resolución de pantalla, sin volver a integrar
+    sol = solve_ivp(f, [0, tmax], [x0, y0], args=args, method=metodo, rtol=1e-6,
+                    dense_output=True, **opciones)
+    return sol.sol, estadisticas_solve_ivp(sol, metodo)
+
+def clave_simulacion(params, metodo):
+    # misma simulación -> misma clave, en cualquier proceso; en el
+    # almacén de trabajos se guarda (interpolante, estadísticas)
+    return "ej3-sim-" + hashlib.sha1(repr(normalizar((params, metodo))).encode()).hexdigest()
+
+def interpolante(data):
+    """Interpolante de la simulación de `data` (se reintegra solo si expiró)."""
+    guardado = leer_resultado(data["clave"])
+    if guardado is None:
+        guardado = integrar(*data["params"], metodo=data["estadisticas"]["metodo"])
+        guardar_resultado(data["clave"], guardado)
+    return guardado[0]
+
 def equilibria(r, kx, b, a, n, m):
     E = []
     E.append(("E0", 0.0, 0.0))
@@ -53,62 +102,130 @@ def jacobian(x, y, r, kx, b, a, n, m):
     return J
 
 # ---- Layout ----
-layout = html.Div([
-    html.Div(className="app-header", children=[html.H1("Sistema acoplado (logístico + Holling II)")]),
-    html.Div(style={"display":"flex","gap":"20px"}, children=[
-        html.Div(style={"flex":"0 0 360px","padding":"10px","border":"1px solid #ddd"}, children=[
-            html.H3("Parámetros"),
-            html.Label("r (crecimiento x)"),
-            dcc.Input(id="r", type="number", value=DEFAULTS["r"], step=0.01),
-            html.Br(),
-            html.Label("k_x (capacidad carga)"),
-            dcc.Input(id="kx", type="number", value=DEFAULTS["kx"], step=1.0),
-            html.Br(),
-            html.Label("b (depredación)"),
-            dcc.Input(id="b", type="number", value=DEFAULTS["b"], step=0.001),
-            html.Br(),
-            html.Label("a (máx. conversión y)"),
-            dcc.Input(id="a", type="number", value=DEFAULTS["a"], step=0.01),
-            html.Br(),
-            html.Label("n (semisaturación)"),
-            dcc.Input(id="n", type="number", value=DEFAULTS["n"], step=0.1),
-            html.Br(),
-            html.Label("m (mortalidad y)"),
-            dcc.Input(id="m", type="number", value=DEFAULTS["m"], step=0.01),
-            html.Hr(),
-            html.H3("Condiciones iniciales"),
-            html.Label("x0"),
-            dcc.Input(id="x0", type="number", value=DEFAULTS["x0"], step=0.1),
-            html.Br(),
-            html.Label("y0"),
-            dcc.Input(id="y0", type="number", value=DEFAULTS["y0"], step=0.1),
-            html.Hr(),
-            html.Label("Tiempo máximo (tmax)"),
-            dcc.Input(id="tmax", type="number", value=DEFAULTS["tmax"], step=1.0),
-            html.Br(),
-            html.Label("Puntos (npts)"),
-            dcc.Input(id="npts", type="number", value=DEFAULTS["npts"], step=100),
-            html.Br(), html.Br(),
-            html.Button("Simular", id="simular", n_clicks=0, style={"width":"100%"}),
-            html.Div(id="warnings", style={"color":"darkred","marginTop":"8px"})
-        ]),
-        html.Div(style={"flex":"1","padding":"10px"}, children=[
-            dcc.Tabs(id="tabs", value="tab-time", children=[
-                dcc.Tab(label="Series temporales", value="tab-time"),
-                dcc.Tab(label="Plano fase", value="tab-phase"),
-                dcc.Tab(label="Equilibrios y Jacobiana", value="tab-eq"),
+# ---- Figuras base (los callbacks solo cambian sus datos) ----
+ESTILO_ESTADISTICAS = {"fontSize":"12px","color":"#555"}
+
+@functools.lru_cache(maxsize=1)
+def figura_series():
+    fig = go.Figure([go.Scatter(x=[], y=[], mode="lines", name=v) for v in ("x", "y")])
+    fig.update_layout(title="Series temporales (x, y)", xaxis_title="Tiempo",
+                      yaxis_title="Abundancia", legend_title_text="Variable")
+    return fig
+
+@functools.lru_cache(maxsize=1)
+def figura_fase():
+    # traza 0: trayectoria; traza 1: equilibrios
+    fig = go.Figure([
+        go.Scatter(x=[], y=[], mode="lines", name="trayectoria"),
+        go.Scatter(x=[], y=[], mode="markers+text", name="equilibrios",
+                   textposition="top center", marker=dict(size=8)),
+    ])
+    fig.update_layout(title="Plano fase (trayectoria desde condición inicial)",
+                      xaxis_title="x", yaxis_title="y", showlegend=False)
+    return fig
+
+def layout():
+    return html.Div([
+        html.Div(className="app-header", children=[html.H1("Sistema acoplado (logístico + Holling II)")]),
+        html.Div(style={"display":"flex","gap":"20px"}, children=[
+            html.Div(style={"flex":"0 0 360px","padding":"10px","border":"1px solid #ddd"}, children=[
+                html.H3("Parámetros"),
+                html.Label("r (crecimiento x)"),
+                dcc.Input(id="r", type="number", value=DEFAULTS["r"], step=0.01),
+                html.Br(),
+                html.Label("k_x (capacidad carga)"),
+                dcc.Input(id="kx", type="number", value=DEFAULTS["kx"], step=1.0),
+                html.Br(),
+                html.Label("b (depredación)"),
+                dcc.Input(id="b", type="number", value=DEFAULTS["b"], step=0.001),
+                html.Br(),
+                html.Label("a (máx. conversión y)"),
+                dcc.Input(id="a", type="number", value=DEFAULTS["a"], step=0.01),
+                html.Br(),
+                html.Label("n (semisaturación)"),
+                dcc.Input(id="n", type="number", value=DEFAULTS["n"], step=0.1),
+                html.Br(),
+                html.Label("m (mortalidad y)"),
+                dcc.Input(id="m", type="number", value=DEFAULTS["m"], step=0.01),
+                html.Hr(),
+                html.H3("Condiciones iniciales"),
+                html.Label("x0"),
+                dcc.Input(id="x0", type="number", value=DEFAULTS["x0"], step=0.1),
+                html.Br(),
+                html.Label("y0"),
+                dcc.Input(id="y0", type="number", value=DEFAULTS["y0"], step=0.1),
+                html.Hr(),
+                html.Label("Tiempo máximo (tmax)"),
+                dcc.Input(id="tmax", type="number", value=DEFAULTS["tmax"], step=1.0),
+                html.Br(),
+                html.Label("Integrador"),
+                dcc.Dropdown(id="metodo", value="auto", clearable=False, options=[
+                    {"label": "Automático (RK45 o LSODA según rigidez)" if m == "auto" else m, "value": m}
+                    for m in METODOS
+                ]),
+                html.Br(),
+                html.Button("Simular", id="simular", n_clicks=0, style={"width":"100%"}),
+                html.Progress(id="sim-progress", value="0", max="100", style={"width":"100%","marginTop":"6px"}),
+                html.Button("Cancelar", id="sim-cancel", n_clicks=0, disabled=True, style={"width":"100%"}),
+                html.Div(id="warnings", style={"color":"darkred","marginTop":"8px"})
             ]),
-            html.Div(id="tab-content")
+            html.Div(style={"flex":"1","padding":"10px"}, children=[
+                dcc.Tabs(id="tabs", value="tab-time", children=[
+                    # las tres pestañas están en el layout: cambiar de pestaña
+                    # no pasa por el servidor y las figuras solo reciben datos
+                    dcc.Tab(label="Series temporales", value="tab-time", children=[
+                        dcc.Graph(id="graph-time", figure=figura_series(), style={"height":"420px"}),
+                        html.Div(id="stats-time", style=ESTILO_ESTADISTICAS),
+                        html.H4("Tabla de equilibrio"),
+                        html.Div(id="tabla-time"),
+                    ]),
+                    dcc.Tab(label="Plano fase", value="tab-phase", children=[
+                        dcc.Graph(id="graph-phase", figure=figura_fase(), style={"height":"640px"}),
+                        html.Div(id="stats-phase", style=ESTILO_ESTADISTICAS),
+                        html.H4("Vector campo aproximado (malla)"),
+                        html.P("Se muestran las trayectorias y los puntos de equilibrio."),
+                    ]),
+                    dcc.Tab(label="Equilibrios y Jacobiana", value="tab-eq", children=[
+                        html.H3("Equilibrios y propiedades locales"),
+                        html.Div(id="tabla-eq"),
+                        html.Hr(),
+                        html.H4("Condiciones"),
+                        html.Ul([
+                            html.Li("Interior E* existe si a > m y y* > 0."),
+                            html.Li("y* positiva requiere x* < kx.")
+                        ]),
+                    ]),
+                ]),
+                # resultado compacto de la última simulación: equilibrios, vista
+                # gruesa de la trayectoria y la clave de su interpolante, que
+                # queda en el almacén de trabajos para refinar al hacer zoom
+                dcc.Store(id="sim-store"),
+                # parámetros de una simulación que no estaba en el almacén
+                dcc.Store(id="sim-pedido")
+            ])
         ])
     ])
-])  
     
 #    ---- Callbacks ----
+# Cálculo: al pulsar "Simular" se busca primero la simulación en el
+# almacén de trabajos (compartido entre procesos; la caché de `integrar`
+# vive en el proceso del trabajo y se pierde con él). Si está, se pinta
+# sin lanzar nada; si no, "sim-pedido" arranca el trabajo en segundo
+# plano, que integra y la deja en el almacén. Ambos escriben en
+# "sim-store" un resumen compacto.
+def leer_parametros(r, kx, b, a, n, m, x0, y0, tmax):
+    """Parámetros como floats, o None si alguno no es un número."""
+    try:
+        return [float(v) for v in (r, kx, b, a, n, m, x0, y0, tmax)]
+    except (TypeError, ValueError):
+        return None
+
+
 @callback(
-    Output("tab-content", "children"),
-    Output("warnings", "children"),
+    Output("sim-store", "data", allow_duplicate=True),
+    Output("warnings", "children", allow_duplicate=True),
+    Output("sim-pedido", "data"),
     Input("simular", "n_clicks"),
-    Input("tabs", "value"),
     State("r", "value"),
     State("kx", "value"),
     State("b", "value"),
@@ -118,30 +235,53 @@ layout = html.Div([
     State("x0", "value"),
     State("y0", "value"),
     State("tmax", "value"),
-    State("npts", "value"),
+    State("metodo", "value"),
+    prevent_initial_call="initial_duplicate",
 )
-def run_sim(n_clicks, active_tab, r, kx, b, a, n, m, x0, y0, tmax, npts):
-    warn = ""
-    try:
-        r, kx, b, a, n, m = map(float, (r, kx, b, a, n, m))
-        x0, y0 = float(x0), float(y0)
-        tmax = float(tmax)
-        npts = int(max(100, int(npts)))
-    except Exception as e:
-        return html.Div("Parámetros inválidos."), "Parámetros inválidos."
+@instrumentar
+def pedir_simulacion(n_clicks, r, kx, b, a, n, m, x0, y0, tmax, metodo="auto"):
+    params = leer_parametros(r, kx, b, a, n, m, x0, y0, tmax)
+    if params is None:
+        return None, "Parámetros inválidos.", dash.no_update
+    metodo = metodo or "auto"
+    clave = clave_simulacion(params, metodo)
+    guardado = leer_resultado(clave)
+    if guardado is None:
+        # n_clicks: repetir tras cancelar vuelve a cambiar el pedido
+        return dash.no_update, dash.no_update, {"params": params, "metodo": metodo, "n": n_clicks}
+    return (*resumen_simulacion(params, clave, *guardado), dash.no_update)
+
 
+@callback_en_fondo(
+    Output("sim-store", "data", allow_duplicate=True),
+    Output("warnings", "children", allow_duplicate=True),
+    Input("sim-pedido", "data"),
+    progress=Output("sim-progress", "value"),
+    cancel=Input("sim-cancel", "n_clicks"),
+    running=[
+        (Output("simular", "disabled"), True, False),
+        (Output("sim-cancel", "disabled"), False, True),
+    ],
+    prevent_initial_call=True,
+)
+def run_sim(set_progress, pedido):
+    if not pedido:
+        raise PreventUpdate
+    params, metodo = pedido["params"], pedido["metodo"]
+    informar = limitar(set_progress)
+    sol, stats = integrar(*params, progreso=lambda f: informar(str(int(100 * f))), metodo=metodo)
+    clave = clave_simulacion(params, metodo)
+    guardar_resultado(clave, (sol, stats))
+    set_progress("100")
+    return resumen_simulacion(params, clave, sol, stats)
+
+
+def resumen_simulacion(params, clave, sol, stats):
+    """Datos de "sim-store" (vista gruesa, equilibrios) y aviso de la simulación."""
+    r, kx, b, a, n, m, x0, y0, tmax = params
+    warn = ""
     E_list, interior = equilibria(r, kx, b, a, n, m)
-    t_eval = np.linspace(0, tmax, npts)
-    sol = solve_ivp(rhs, [0, tmax], [x0, y0], t_eval=t_eval, args=(r, kx, b, a, n, m), method="RK45", rtol=1e-6)
-    df_ts = pd.DataFrame({"t": sol.t, "x": sol.y[0], "y": sol.y[1]})
-    fig_time = px.line(df_ts, x="t", y=["x","y"], labels={"value":"Abundancia","variable":"Variable","t":"Tiempo"},
-                       title="Series temporales (x, y)")
-    fig_time.update_traces(mode="lines")
-    fig_phase = px.line(df_ts, x="x", y="y", title="Plano fase (trayectoria desde condición inicial)")
-    eq_x = [e[1] for e in E_list]
-    eq_y = [e[2] for e in E_list]
-    names = [e[0] for e in E_list]
-    fig_phase.add_scatter(x=eq_x, y=eq_y, mode="markers+text", text=names, textposition="top center", marker=dict(size=8))
+    t_sol, y_sol = muestrear_denso(sol, 0.0, tmax, PUNTOS_GRUESOS)
 
     rows = []
     for name, xe, ye in E_list:
@@ -159,42 +299,6 @@ def run_sim(n_clicks, active_tab, r, kx, b, a, n, m, x0, y0, tmax, npts):
             "autovalores": eigs_str
         })
 
-    df_eq = pd.DataFrame(rows)
-
-    if active_tab == "tab-phase":
-        content = html.Div([
-            dcc.Graph(figure=fig_phase, style={"height":"640px"}),
-            html.H4("Vector campo aproximado (malla)"),
-            html.P("Se muestran las trayectorias y los puntos de equilibrio.")
-        ])
-    elif active_tab == "tab-eq":
-        content = html.Div([
-            html.H3("Equilibrios y propiedades locales"),
-            dash_table.DataTable(
-                data=df_eq.to_dict("records"),
-                columns=[{"name":c, "id":c} for c in df_eq.columns],
-                style_table={"overflowX":"auto"},
-                style_cell={"textAlign":"left","minWidth":"120px"}
-            ),
-            html.Hr(),
-            html.H4("Condiciones"),
-            html.Ul([
-                html.Li("Interior E* existe si a > m y y* > 0."),
-                html.Li("y* positiva requiere x* < kx.")
-            ])
-        ])
-    else:
-        content = html.Div([
-            dcc.Graph(figure=fig_time, style={"height":"420px"}),
-            html.H4("Tabla de equilibrio"),
-            dash_table.DataTable(
-                data=df_eq.to_dict("records"),
-                columns=[{"name":c, "id":c} for c in df_eq.columns],
-                style_table={"overflowX":"auto"},
-                style_cell={"textAlign":"left","minWidth":"120px"}
-            )
-        ])
-
     if interior is None:
         warn = "No existe equilibrio interior E* (se requiere a > m)."
     else:
@@ -202,4 +306,115 @@ def run_sim(n_clicks, active_tab, r, kx, b, a, n, m, x0, y0, tmax, npts):
         if ystar <= 0 or xstar <= 0 or xstar >= kx:
             warn = f"Equilibrio interior calculado x*={xstar:.4g}, y*={ystar:.4g}. Puede no ser biológicamente válido (y*<=0 o x*>=kx)."
 
-    return content, warn
+    data = {
+        "params": params,
+        "clave": clave,
+        "equilibrios": rows,
+        "estadisticas": stats,
+        "t": t_sol.tolist(),
+        "x": y_sol[0].tolist(),
+        "y": y_sol[1].tolist(),
+    }
+    return data, warn
+
+
+def tabla_equilibrios(rows):
+    columns = list(rows[0].keys()) if rows else []
+    return dash_table.DataTable(
+        data=rows,
+        columns=[{"name":c, "id":c} for c in columns],
+        style_table={"overflowX":"auto"},
+        style_cell={"textAlign":"left","minWidth":"120px"}
+    )
+
+
+# Render: cada simulación nueva solo reemplaza los datos de las trazas de
+# las figuras base (vista gruesa guardada en el store), las tablas y las
+# estadísticas; uirevision = clave conserva el zoom mientras no cambie la
+# simulación.
+@callback(
+    Output("graph-time", "figure", allow_duplicate=True),
+    Output("graph-phase", "figure", allow_duplicate=True),
+    Output("stats-time", "children"),
+    Output("stats-phase", "children"),
+    Output("tabla-time", "children"),
+    Output("tabla-eq", "children"),
+    Input("sim-store", "data"),
+    prevent_initial_call=True,
+)
+@instrumentar
+def pintar_simulacion(data):
+    if not data:
+        raise PreventUpdate
+
+    rows = data["equilibrios"]
+    series = parche_trazas({"x": data["t"], "y": data["x"]}, {"x": data["t"], "y": data["y"]})
+    series["layout"]["uirevision"] = data["clave"]
+    fase_xy = parche_trazas(
+        {"x": data["x"], "y": data["y"]},
+        {"x": [e["x*"] for e in rows], "y": [e["y*"] for e in rows], "text": [e["Equilibrio"] for e in rows]},
+    )
+    fase_xy["layout"]["uirevision"] = data["clave"]
+    texto = texto_estadisticas(data["estadisticas"])
+    return series, fase_xy, texto, texto, tabla_equilibrios(rows), tabla_equilibrios(rows)
+
+
+# Zoom: cada relayout con un rango nuevo reemplaza solo los datos de la
+# trayectoria por la ventana visible, evaluada a resolución de pantalla
+# con el interpolante guardado. "Autoscale" vuelve a la vista gruesa.
+def rango_eje(relayout, eje):
+    if f"{eje}.range[0]" in relayout:
+        return relayout[f"{eje}.range[0]"], relayout[f"{eje}.range[1]"]
+    if f"{eje}.range" in relayout:
+        return tuple(relayout[f"{eje}.range"])
+    return None
+
+
+@callback(
+    Output("graph-time", "figure", allow_duplicate=True),
+    Input("graph-time", "relayoutData"),
+    State("sim-store", "data"),
+    prevent_initial_call=True,
+)
+@instrumentar
+def refinar_series(relayout, data):
+    if not data or not relayout:
+        raise PreventUpdate
+    rango = rango_eje(relayout, "xaxis")
+    if rango is None and not relayout.get("xaxis.autorange"):
+        raise PreventUpdate
+
+    if rango is None:
+        t, Y = data["t"], (data["x"], data["y"])
+    else:
+        tmax = data["params"][8]
+        t0, t1 = max(0.0, min(rango)), min(tmax, max(rango))
+        if t1 <= t0:
+            raise PreventUpdate
+        t, Y = muestrear_denso(interpolante(data), t0, t1)
+
+    return parche_trazas(*({"x": t, "y": serie} for serie in Y))
+
+
+@callback(
+    Output("graph-phase", "figure", allow_duplicate=True),
+    Input("graph-phase", "relayoutData"),
+    State("sim-store", "data"),
+    prevent_initial_call=True,
+)
+@instrumentar
+def refinar_fase(relayout, data):
+    if not data or not relayout:
+        raise PreventUpdate
+    rx, ry = rango_eje(relayout, "xaxis"), rango_eje(relayout, "yaxis")
+    if rx is None and ry is None:
+        if not (relayout.get("xaxis.autorange") or relayout.get("yaxis.autorange")):
+            raise PreventUpdate
+        x, y = data["x"], data["y"]
+    else:
+        sin_limite = (-np.inf, np.inf)
+        caja = (sorted(rx) if rx else sin_limite, sorted(ry) if ry else sin_limite)
+        x, y = muestrear_denso_caja(interpolante(data), caja)
+
+    # la traza 0 es la trayectoria; la 1, los equilibrios
+    return parche_trazas({"x": x, "y": y})
@@ -1,8 +1,12 @@
 import dash 
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, callback, ctx, Input, Output, State
 import numpy as np
 import plotly.graph_objects as go
-import plotly.figure_factory as ff 
+
+from modelos.expresiones import compilar
+from modelos.trayectorias import rk4_lote, recortar, polilinea
+from utilidades.metricas import fase, instrumentar
+from utilidades.serializacion import compactar_figura
 
 dash.register_page(__name__, path="/Campo_Vectorial", name="Campo_Vectorial")
 
@@ -16,6 +20,51 @@ COLOR_FONDO_PAPEL = '#ffffff'
 COLOR_GRID = '#ccc'
 COLOR_ZEROLINE = '#38bdf8'         
 
+N_MIN = 5
+N_MAX = 300
+SEMILLAS_MAX = 100   # por eje de la malla de semillas
+PASOS_TRAYECTORIA = 200
+RESOLUCION_CLIC = 100   # celdas por eje de la capa que recibe los clics
+
+
+def flechas_gl(X, Y, u, v, scale, arrow_scale=0.3, angle=np.pi / 9):
+    """
+    Geometría de todas las flechas (tallo + punta) como una sola polilínea
+    separada por NaN, para dibujarla con una única traza Scattergl.
+    Misma construcción que ff.create_quiver, pero vectorizada.
+    """
+    x0, y0 = X.ravel(), Y.ravel()
+    x1 = x0 + scale * u.ravel()
+    y1 = y0 + scale * v.ravel()
+
+    largo = np.hypot(x1 - x0, y1 - y0) * arrow_scale
+    theta = np.arctan2(y1 - y0, x1 - x0)
+    px1 = x1 - largo * np.cos(theta + angle)
+    py1 = y1 - largo * np.sin(theta + angle)
+    px2 = x1 - largo * np.cos(theta - angle)
+    py2 = y1 - largo * np.sin(theta - angle)
+
+    hueco = np.full_like(x0, np.nan)
+    xs = np.stack([x0, x1, hueco, px1, x1, px2, hueco], axis=1).ravel()
+    ys = np.stack([y0, y1, hueco, py1, y1, py2, hueco], axis=1).ravel()
+    return xs, ys
+
+def capa_clic(xmax, ymax, n=RESOLUCION_CLIC):
+    """
+    Heatmap transparente sobre todo el dominio. Flechas y trayectorias usan
+    hoverinfo="skip" y plotly no emite clickData para ellas; esta capa sí
+    (hoverinfo="none": sin etiqueta, pero con eventos). El punto del clic
+    es el centro de la celda, a menos de medio paso de malla del cursor.
+    """
+    dx, dy = 2.2 * xmax / n, 2.2 * ymax / n
+    return go.Heatmap(
+        z=np.zeros((n, n), dtype=np.uint8),
+        x0=-1.1 * xmax + dx / 2, dx=dx,
+        y0=-1.1 * ymax + dy / 2, dy=dy,
+        opacity=0, showscale=False,
+        hoverinfo="none", name="clic",
+    )
+
 layout = html.Div([
     
     html.Div([
@@ -43,10 +92,37 @@ layout = html.Div([
 
         html.Div([
             html.Label("Mallado (n):", className="label"),
-            dcc.Input(id="input-n-c5", type="number", value=15, className="input-field")
+            dcc.Input(id="input-n-c5", type="number", value=15, min=N_MIN, max=N_MAX, className="input-field")
+        ], className="input-group"),
+
+        html.Div([
+            html.Label("Semillas en malla (N × N, 0 = ninguna):", className="label"),
+            dcc.Input(id="input-semillas-c5", type="number", value=0, min=0, max=SEMILLAS_MAX, className="input-field")
+        ], className="input-group"),
+
+        html.Div([
+            html.Label("Tiempo de integración:", className="label"),
+            dcc.Input(id="input-t-c5", type="number", value=5, min=0, className="input-field")
+        ], className="input-group"),
+
+        html.Div([
+            html.Label("Sentido:", className="label"),
+            dcc.RadioItems(
+                id="sentido-c5",
+                options=[
+                    {"label": "Adelante", "value": "adelante"},
+                    {"label": "Atrás", "value": "atras"},
+                    {"label": "Ambos", "value": "ambos"},
+                ],
+                value="ambos",
+                inline=True
+            )
         ], className="input-group"),
 
         html.Button("Generar campo", id="btn-generar-c5", className="btn-generar"),
+        html.Button("Limpiar semillas", id="btn-limpiar-c5", className="btn-generar"),
+        # semillas añadidas con clic sobre la gráfica
+        dcc.Store(id="semillas-c5", data=[]),
 
         html.Div([
             html.H3("Ejemplos para probar:", className="subtitle"),
@@ -55,7 +131,13 @@ layout = html.Div([
                 html.Li("dx/dt = -x, dy/dt = -y  (Sumidero)"),
                 html.Li("dx/dt = y, dy/dt = -x  (Centro)"),
                 html.Li("dx/dt = -y, dy/dt = np.cos(x)"),
-            ], className="text-content")
+                html.Li("dx/dt = y, dy/dt = -sin(x) - 0.2*y  (Péndulo amortiguado, con semillas)"),
+            ], className="text-content"),
+            html.P("Haz clic sobre la gráfica para añadir semillas de trayectorias.",
+                   className="text-content"),
+            html.P("Se permiten x, y, números, + - * / ** %, pi, e y las funciones "
+                   "sin, cos, tan, exp, log, sqrt, abs, ... (también como np.sin).",
+                   className="text-content")
         ], className="content")
 
     ], className="content"), 
@@ -72,23 +154,56 @@ layout = html.Div([
 # CALLBACK
 # ----------------------------------------------
 
+@callback(
+    Output("semillas-c5", "data"),
+    Input("grafica-campo-c5", "clickData"),
+    Input("btn-limpiar-c5", "n_clicks"),
+    State("semillas-c5", "data"),
+    prevent_initial_call=True
+)
+def actualizar_semillas(click, n_limpiar, semillas):
+    if ctx.triggered_id == "btn-limpiar-c5" or not click:
+        return []
+    # el clic llega de la capa transparente (capa_clic): centro de su celda
+    punto = click["points"][0]
+    return (semillas or []) + [[punto["x"], punto["y"]]]
+
+
+def trazar_trayectorias(f_x, f_y, semillas, xmax, ymax, t_int, sentido):
+    """Integra todas las semillas juntas y devuelve la polilínea a dibujar."""
+    x0, y0 = semillas[:, 0], semillas[:, 1]
+    X, Y = np.empty((0, x0.size)), np.empty((0, x0.size))
+    if sentido in ("atras", "ambos"):
+        Xa, Ya = recortar(*rk4_lote(f_x, f_y, x0, y0, -t_int, PASOS_TRAYECTORIA), xmax, ymax)
+        X, Y = Xa[::-1], Ya[::-1]
+    if sentido in ("adelante", "ambos"):
+        Xd, Yd = recortar(*rk4_lote(f_x, f_y, x0, y0, t_int, PASOS_TRAYECTORIA), xmax, ymax)
+        X, Y = np.vstack([X, Xd[1:] if X.size else Xd]), np.vstack([Y, Yd[1:] if Y.size else Yd])
+    return polilinea(X, Y)
+
+
 @callback(
     [Output("grafica-campo-c5", "figure"),
      Output("info-campo-c5", "children")],
     Input("btn-generar-c5", "n_clicks"),
+    Input("semillas-c5", "data"),
     State("input-fx-c5", "value"),
     State("input-fy-c5", "value"),
     State("input-xmax-c5", "value"),
     State("input-ymax-c5", "value"),
     State("input-n-c5", "value"),
+    State("input-semillas-c5", "value"),
+    State("input-t-c5", "value"),
+    State("sentido-c5", "value"),
     prevent_initial_call=False
 )
-def generar_campo(n_clicks, fx_str, fy_str, xmax, ymax, n):
+@instrumentar
+def generar_campo(n_clicks, semillas_click, fx_str, fy_str, xmax, ymax, n,
+                  n_semillas=0, t_int=5, sentido="ambos"):
 
-    if n > 50:
-        n = 50
-    if n < 5:
-        n = 5
+    if n is None:
+        n = 15
+    n = int(min(max(n, N_MIN), N_MAX))
         
     x = np.linspace(-xmax, xmax, n)
     y = np.linspace(-ymax, ymax, n)
@@ -96,16 +211,14 @@ def generar_campo(n_clicks, fx_str, fy_str, xmax, ymax, n):
     info_mensaje = ""
 
     try:
-        diccionario = {
-            "x": X, "y": Y, "np": np,
-            "sin": np.sin, "cos": np.cos, "tan": np.tan,
-            "exp": np.exp, 'sqrt': np.sqrt, 'pi': np.pi, 'e': np.e 
-        }
-        fx = eval(fx_str, {}, diccionario)
-        fy = eval(fy_str, {}, diccionario)
+        # expresiones validadas y compiladas una sola vez por texto
+        f_x, f_y = compilar(fx_str), compilar(fy_str)
+        with np.errstate(all="ignore"):
+            fx = f_x(X, Y)
+            fy = f_y(X, Y)
 
         mag = np.sqrt(fx**2 + fy**2)
-        mag[mag == 0] = 1.0  
+        mag[(mag == 0) | ~np.isfinite(mag)] = 1.0  
         fx = fx / mag
         fy = fy / mag
 
@@ -123,35 +236,59 @@ def generar_campo(n_clicks, fx_str, fy_str, xmax, ymax, n):
         )
         return fig_error, f"Error en las expresiones: {str(error)}"
 
-    fig = ff.create_quiver(
-        X, Y, fx, fy,
-        scale=1.5 / n,
-        arrow_scale=0.3,
-        line=dict(color=COLOR_DATOS_SECUNDARIO, width=1.3),
-        name='Campo Vectorial'
-    )
+    xs, ys = flechas_gl(X, Y, fx, fy, scale=1.5 / n)
+    with fase("figura"):
+        fig = go.Figure([capa_clic(xmax, ymax), go.Scattergl(
+            x=xs, y=ys,
+            mode="lines",
+            line=dict(color=COLOR_DATOS_SECUNDARIO, width=1.3),
+            name='Campo Vectorial',
+            hoverinfo="skip"
+        )])
 
-    fig.update_layout(
-        title=dict(
-            text=f"<b>dx/dt = {fx_str}  |  dy/dt = {fy_str}</b>",
-            x=0.5,
-            font=dict(size=17, color=COLOR_TITULO)
-        ),
-        paper_bgcolor=COLOR_FONDO_PAPEL,
-        plot_bgcolor=COLOR_FONDO_GRAFICO,
-        font=dict(color=COLOR_TEXTO_SECUNDARIO),
-        margin=dict(l=40, r=40, t=60, b=40)
-    )
+    # semillas: malla N x N más las añadidas con clic
+    semillas = [np.asarray(semillas_click or [], dtype=float).reshape(-1, 2)]
+    n_semillas = int(min(max(n_semillas or 0, 0), SEMILLAS_MAX))
+    if n_semillas:
+        SX, SY = np.meshgrid(np.linspace(-xmax, xmax, n_semillas),
+                             np.linspace(-ymax, ymax, n_semillas))
+        semillas.append(np.column_stack([SX.ravel(), SY.ravel()]))
+    semillas = np.vstack(semillas)
 
-    fig.update_xaxes(
-        showgrid=True, gridcolor=COLOR_GRID,
-        zeroline=True, zerolinecolor=COLOR_ZEROLINE,
-        range=[-xmax*1.1, xmax*1.1]
-    )
-    fig.update_yaxes(
-        showgrid=True, gridcolor=COLOR_GRID,
-        zeroline=True, zerolinecolor=COLOR_ZEROLINE,
-        range=[-ymax*1.1, ymax*1.1]
-    )
+    if len(semillas) and t_int:
+        xs_t, ys_t = trazar_trayectorias(f_x, f_y, semillas, xmax, ymax, float(t_int), sentido)
+        with fase("figura"):
+            fig.add_trace(go.Scattergl(
+                x=xs_t, y=ys_t,
+                mode="lines",
+                line=dict(color=COLOR_DATOS_PRINCIPAL, width=1.2),
+                name="Trayectorias",
+                hoverinfo="skip"
+            ))
+        info_mensaje += f" Trayectorias: {len(semillas)} semillas."
+
+    with fase("figura"):
+        fig.update_layout(
+            title=dict(
+                text=f"<b>dx/dt = {fx_str}  |  dy/dt = {fy_str}</b>",
+                x=0.5,
+                font=dict(size=17, color=COLOR_TITULO)
+            ),
+            paper_bgcolor=COLOR_FONDO_PAPEL,
+            plot_bgcolor=COLOR_FONDO_GRAFICO,
+            font=dict(color=COLOR_TEXTO_SECUNDARIO),
+            margin=dict(l=40, r=40, t=60, b=40)
+        )
+
+        fig.update_xaxes(
+            showgrid=True, gridcolor=COLOR_GRID,
+            zeroline=True, zerolinecolor=COLOR_ZEROLINE,
+            range=[-xmax*1.1, xmax*1.1]
+        )
+        fig.update_yaxes(
+            showgrid=True, gridcolor=COLOR_GRID,
+            zeroline=True, zerolinecolor=COLOR_ZEROLINE,
+            range=[-ymax*1.1, ymax*1.1]
+        )
 
-    return fig, info_mensaje
+    return compactar_figura(fig), info_mensaje
@@ -1,51 +1,11 @@
 import dash
 from dash import html, dcc, Input, Output
-import requests
-import pandas as pd
-import plotly.express as px
 
-dash.register_page(__name__, path="/cripto", name="Criptomonedas")
-
-# -------------------------------------------------------
-# API COINGECKO – FUNCIONES
-# -------------------------------------------------------
-
-def obtener_monedas_disponibles():
-    url = "https://api.coingecko.com/api/v3/coins/list"
-    try:
-        r = requests.get(url, timeout=10)
-        coins = r.json()
-
-        common = ["bitcoin", "ethereum", "solana", "dogecoin", "cardano", "litecoin", "xrp"]
-
-        filtered = [c for c in coins if c["id"] in common]
-
-        return [
-            {"label": f"{c['id'].capitalize()} ({c['symbol'].upper()})", "value": c["id"]}
-            for c in filtered
-        ]
-    except:
-        return []
-
-
-def obtener_precio(coin_id, days=7):
-    url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
-
-    params = {
-        "vs_currency": "usd",
-        "days": days
-    }
-
-    r = requests.get(url, params=params, timeout=10)
-    data = r.json()
-
-    if "prices" not in data:
-        return pd.DataFrame(columns=["timestamp", "price", "coin"])
-
-    df = pd.DataFrame(data["prices"], columns=["timestamp", "price"])
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-    return df
+from utilidades.metricas import fase, instrumentar
+from utilidades.submuestreo import indices_lttb
+from utilidades.serializacion import compactar_figura
 
+dash.register_page(__name__, path="/cripto", name="Criptomonedas")
 
 # -------------------------------------------------------
 # LAYOUT
@@ -62,7 +22,9 @@ layout = html.Div(className="app-container", children=[
         html.Label("Selecciona criptomonedas:", style={"font-size": "18px"}),
         dcc.Dropdown(
             id="coin_selector",
-            options=obtener_monedas_disponibles(),
+            # se rellena al cargar la página (ver cargar_monedas): sin red
+            # ni requests/pandas al importar
+            options=[],
             multi=True,
             placeholder="Ejemplo: Bitcoin, Ethereum...",
         ),
@@ -90,41 +52,56 @@ layout = html.Div(className="app-container", children=[
 # CALLBACK
 # -------------------------------------------------------
 
+@dash.callback(
+    Output("coin_selector", "options"),
+    Input("coin_selector", "id"),
+)
+def cargar_monedas(_):
+    from utilidades.coingecko import opciones_monedas
+    return opciones_monedas()
+
+
 @dash.callback(
     Output("crypto_graph", "figure"),
     Input("coin_selector", "value"),
     Input("days_slider", "value"),
 )
+@instrumentar
 def actualizar_grafico(selected_coins, days):
+    import pandas as pd
+    import plotly.express as px
+    from utilidades.coingecko import obtener_precios
+
     if not selected_coins:
         return px.line(title="Selecciona criptomonedas para visualizar el gráfico")
 
-    df_total = pd.DataFrame()
-
-    for coin in selected_coins:
-        df = obtener_precio(coin, days)
-        if df.empty:
-            continue
-        df["coin"] = coin
-        df_total = pd.concat([df_total, df], ignore_index=True)
+    # todas las monedas en paralelo, una sola concatenación
+    df_total = obtener_precios(selected_coins, days)
 
     if df_total.empty:
         return px.line(title="No hay datos disponibles para las criptomonedas seleccionadas.")
 
-    fig = px.line(
-        df_total,
-        x="timestamp",
-        y="price",
-        color="coin",
-        title="Historial de precios (USD)",
-        line_shape="linear"
-    )
-
-    fig.update_layout(
-        xaxis_title="Fecha",
-        yaxis_title="Precio en USD",
-        legend_title="Criptomoneda",
-        template="plotly_dark"
-    )
-
-    return fig
+    # LTTB por moneda: como mucho un punto por píxel en cada serie
+    df_total = pd.concat([
+        g.iloc[indices_lttb(g["timestamp"].to_numpy(), g["price"].to_numpy())]
+        for _, g in df_total.groupby("coin", sort=False)
+    ], ignore_index=True)
+
+    with fase("figura"):
+        fig = px.line(
+            df_total,
+            x="timestamp",
+            y="price",
+            color="coin",
+            title="Historial de precios (USD)",
+            line_shape="linear"
+        )
+
+        fig.update_layout(
+            xaxis_title="Fecha",
+            yaxis_title="Precio en USD",
+            legend_title="Criptomoneda",
+            template="plotly_dark"
+        )
+
+    return compactar_figura(fig)
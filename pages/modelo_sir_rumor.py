@@ -1,8 +1,24 @@
+import base64
+import functools
+import io
+import time
+
 import dash
 from dash import html, dcc, register_page
 import numpy as np
 import plotly.graph_objs as go
 
+from modelos.redes import (GENERADORES, PASO_DEFECTO, PROBABILIDAD_RECABLEADO, cargar_lista_aristas, describir_red,
+                           generar_red, simular_red)
+from modelos.estocastico import METODOS, PERCENTILES, UMBRAL_BROTE, bandas, resumen_replicas, simular
+from modelos.sir import TOL_DEFECTO, TOLERANCIAS, sir_adaptativo, texto_estadisticas_rk
+from utilidades.submuestreo import indices_lttb_varias
+from utilidades.cliente import callback_modelo
+from utilidades.metricas import instrumentar
+from utilidades.resumen import registrar_resumen, tarjeta_resumen
+from utilidades.serializacion import parche_trazas
+from utilidades.trabajos import callback_en_fondo, limitar
+
 # Registrar página dentro del sistema de tu app.py
 register_page(
     __name__,
@@ -13,113 +29,452 @@ register_page(
 # ------------------------------------------------------
 # Modelo SIR adaptado a rumor propagación
 # ------------------------------------------------------
-def modelo_sir_rumor(beta, gamma, S0, I0, R0, tmax=60, steps=600):
+def modelo_sir_rumor(beta, gamma, S0, I0, R0, tmax=60, tol=TOL_DEFECTO):
     """
     Versión del modelo SIR aplicado a difusión de rumores:
       S(t) = personas que no conocen el rumor
       I(t) = personas que conocen y difunden el rumor
       R(t) = personas que pierden interés y dejan de difundir
     """
-    t = np.linspace(0, tmax, steps)
-    dt = t[1] - t[0]
+    return sir_adaptativo(beta, gamma, S0, I0, R0, tmax=tmax, tol=tol)
+
+@functools.lru_cache(maxsize=1)
+def figura_base():
+    """Figura sin datos: los callbacks solo reemplazan x/y de las trazas."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=[], y=[], name="No conocen (S)", mode="lines"))
+    fig.add_trace(go.Scatter(x=[], y=[], name="Difunden (I)", mode="lines"))
+    fig.add_trace(go.Scatter(x=[], y=[], name="Abandonan (R)", mode="lines"))
+    fig.update_layout(
+        title="Dinámica de difusión del rumor",
+        xaxis_title="Tiempo",
+        yaxis_title="Proporción de la población",
+        template="plotly_white",
+        height=550
+    )
+    return fig
 
-    S = np.zeros(steps)
-    I = np.zeros(steps)
-    R = np.zeros(steps)
+# ------------------------------------------------------
+# Réplicas estocásticas: bandas de percentiles y tamaño final
+# ------------------------------------------------------
+COMPARTIMENTOS = (("S", "No conocen", "99, 110, 250"), ("I", "Difunden", "239, 85, 59"), ("R", "Abandonan", "0, 204, 150"))
+BLOQUE_REPLICAS = 250   # réplicas por llamada al simulador (progreso y cancelación)
+REPLICAS_MAX = 5000
+CLASES_TAMANO = 40
+NOMBRES_METODO = {"gillespie": "Gillespie (exacto)", "tau": "Tau-leaping"}
 
-    S[0], I[0], R[0] = S0, I0, R0
+@functools.lru_cache(maxsize=1)
+def figura_estocastica():
+    """
+    Por compartimento: banda 5–95 %, banda 25–75 %, mediana de las réplicas
+    y la curva determinista encima (6 trazas, en ese orden).
+    """
+    fig = go.Figure()
+    for letra, nombre, rgb in COMPARTIMENTOS:
+        grupo = dict(legendgroup=letra, mode="lines")
+        fig.add_trace(go.Scatter(x=[], y=[], line=dict(width=0), showlegend=False, hoverinfo="skip", **grupo))
+        fig.add_trace(go.Scatter(x=[], y=[], line=dict(width=0), fill="tonexty", fillcolor=f"rgba({rgb}, 0.15)",
+                                 name=f"{nombre} ({letra}) 5–95 %", hoverinfo="skip", **grupo))
+        fig.add_trace(go.Scatter(x=[], y=[], line=dict(width=0), showlegend=False, hoverinfo="skip", **grupo))
+        fig.add_trace(go.Scatter(x=[], y=[], line=dict(width=0), fill="tonexty", fillcolor=f"rgba({rgb}, 0.3)",
+                                 name=f"{nombre} ({letra}) 25–75 %", hoverinfo="skip", **grupo))
+        fig.add_trace(go.Scatter(x=[], y=[], line=dict(color=f"rgb({rgb})"), name=f"{nombre} ({letra}) mediana", **grupo))
+        fig.add_trace(go.Scatter(x=[], y=[], line=dict(color=f"rgb({rgb})", dash="dash"),
+                                 name=f"{nombre} ({letra}) determinista", **grupo))
+    fig.update_layout(
+        title="Réplicas estocásticas: percentiles sobre la curva determinista",
+        xaxis_title="Tiempo",
+        yaxis_title="Proporción de la población",
+        template="plotly_white",
+        height=550
+    )
+    return fig
 
-    for k in range(steps - 1):
-        dS = -beta * S[k] * I[k]
-        dI = beta * S[k] * I[k] - gamma * I[k]
-        dR = gamma * I[k]
+@functools.lru_cache(maxsize=1)
+def figura_tamanos():
+    """Histograma (ya agrupado) del tamaño final de las réplicas."""
+    fig = go.Figure(go.Bar(x=[], y=[], name="Réplicas", marker_color="rgb(239, 85, 59)"))
+    fig.update_layout(
+        title="Distribución del tamaño final (S0 − S(tmax))",
+        xaxis_title="Fracción que llegó a conocer el rumor",
+        yaxis_title="Fracción de réplicas",
+        template="plotly_white",
+        bargap=0.05,
+        height=400
+    )
+    return fig
 
-        S[k + 1] = S[k] + dS * dt
-        I[k + 1] = I[k] + dI * dt
-        R[k + 1] = R[k] + dR * dt
+# ------------------------------------------------------
+# Difusión sobre una red de contactos
+# ------------------------------------------------------
+NOMBRES_RED = {"aleatoria": "aleatoria (Erdős–Rényi)", "mundo_pequeno": "mundo pequeño (Watts–Strogatz)",
+               "libre_escala": "libre de escala (Chung–Lu)", "archivo": "lista de aristas (archivo)"}
+NODOS_MAX = 2 * 10**6
+# nodos·⟨k⟩/2; los generadores sortean todas las aristas a la vez
+ARISTAS_MAX = 10**7
+# el archivo viaja en base64 en la petición y en la caché de trabajos
+ARCHIVO_MAX_BYTES = 50 * 2**20
 
-    return t, S, I, R
+@functools.lru_cache(maxsize=1)
+def figura_red():
+    """Curvas agregadas S/I/R de la red y, punteadas, las de mezcla homogénea."""
+    fig = go.Figure()
+    for letra, nombre, rgb in COMPARTIMENTOS:
+        fig.add_trace(go.Scatter(x=[], y=[], mode="lines", line=dict(color=f"rgb({rgb})"),
+                                 name=f"{nombre} ({letra}) en la red", legendgroup=letra))
+    for letra, nombre, rgb in COMPARTIMENTOS:
+        fig.add_trace(go.Scatter(x=[], y=[], mode="lines", line=dict(color=f"rgb({rgb})", dash="dot"),
+                                 name=f"{nombre} ({letra}) mezcla homogénea", legendgroup=letra))
+    fig.update_layout(
+        title="Difusión del rumor en la red de contactos",
+        xaxis_title="Tiempo",
+        yaxis_title="Proporción de nodos",
+        template="plotly_white",
+        height=550
+    )
+    return fig
 
 # ------------------------------------------------------
 # Layout con tu CSS
 # ------------------------------------------------------
-layout = html.Div(className="page-container", children=[
+def layout():
+    return html.Div(className="page-container", children=[
+
+        html.H1("Modelo SIR de Rumores", className="page-title"),
+
+        html.Div(className="card", children=[
+            html.P(
+                "Este modelo simula cómo se difunde un rumor en una comunidad usando una variación del modelo SIR. "
+                "Las personas pueden estar sin conocer el rumor (S), conocerlo y difundirlo (I), o dejar de difundirlo (R).",
+                className="page-text"
+            )
+        ]),
 
-    html.H1("Modelo SIR de Rumores", className="page-title"),
+        # Parámetros
+        html.Div(className="card", children=[
 
-    html.Div(className="card", children=[
-        html.P(
-            "Este modelo simula cómo se difunde un rumor en una comunidad usando una variación del modelo SIR. "
-            "Las personas pueden estar sin conocer el rumor (S), conocerlo y difundirlo (I), o dejar de difundirlo (R).",
-            className="page-text"
-        )
-    ]),
+            html.Div(className="input-block", children=[
+                html.Label("Tasa de difusión del rumor (β):", className="input-label"),
+                dcc.Input(id="beta_rumor", type="number", value=0.4, step=0.01, className="input-field")
+            ]),
 
-    # Parámetros
-    html.Div(className="card", children=[
+            html.Div(className="input-block", children=[
+                html.Label("Tasa de abandono (γ):", className="input-label"),
+                dcc.Input(id="gamma_rumor", type="number", value=0.2, step=0.01, className="input-field")
+            ]),
 
-        html.Div(className="input-block", children=[
-            html.Label("Tasa de difusión del rumor (β):", className="input-label"),
-            dcc.Input(id="beta_rumor", type="number", value=0.4, step=0.01, className="input-field")
+            html.Div(className="input-block", children=[
+                html.Label("Población susceptible inicial S₀:", className="input-label"),
+                dcc.Input(id="S0_rumor", type="number", value=0.95, step=0.01, className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Población difusora inicial I₀:", className="input-label"),
+                dcc.Input(id="I0_rumor", type="number", value=0.05, step=0.01, className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Población retirada inicial R₀:", className="input-label"),
+                dcc.Input(id="R0_rumor", type="number", value=0.0, step=0.01, className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Tolerancia del integrador:", className="input-label"),
+                dcc.Dropdown(id="tol_rumor", value=TOL_DEFECTO, clearable=False, className="input-field",
+                             options=[{"label": f"{tol:.0e}", "value": tol} for tol in TOLERANCIAS])
+            ]),
         ]),
 
-        html.Div(className="input-block", children=[
-            html.Label("Tasa de abandono (γ):", className="input-label"),
-            dcc.Input(id="gamma_rumor", type="number", value=0.2, step=0.01, className="input-field")
+        # resumen (pico y tamaño final) sin integrar
+        tarjeta_resumen("resumen-sir-rumor"),
+
+        html.Div(className="graph-container", children=[
+            dcc.Graph(id="grafico-sir-rumor", figure=figura_base()),
+            # pasos y error estimado del integrador adaptativo
+            html.Div(id="estadisticas-sir-rumor", style={"fontSize": "12px", "color": "#555"})
         ]),
 
-        html.Div(className="input-block", children=[
-            html.Label("Población susceptible inicial S₀:", className="input-label"),
-            dcc.Input(id="S0_rumor", type="number", value=0.95, step=0.01, className="input-field")
+        # réplicas estocásticas: bajo demanda, cuestan bastante más que la curva
+        html.Div(className="card", children=[
+            html.H3("Simulación estocástica"),
+            html.P(
+                "Con una comunidad finita de N personas el rumor puede extinguirse por azar antes de difundirse. "
+                "Se simulan muchas réplicas con los parámetros de arriba: Gillespie es exacto (cada contagio o "
+                "abandono es un evento); tau-leaping avanza a saltos de tiempo fijos y escala a comunidades grandes.",
+                className="page-text"
+            ),
+
+            html.Div(className="input-block", children=[
+                html.Label("Tamaño de la comunidad N:", className="input-label"),
+                dcc.Input(id="N_rumor", type="number", value=1000, min=1, step=1, className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Réplicas:", className="input-label"),
+                dcc.Input(id="replicas_rumor", type="number", value=1000, min=1, max=REPLICAS_MAX, step=1,
+                          className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Método:", className="input-label"),
+                dcc.Dropdown(id="metodo_estocastico_rumor", value="tau", clearable=False, className="input-field",
+                             options=[{"label": NOMBRES_METODO[m], "value": m} for m in METODOS])
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Semilla:", className="input-label"),
+                dcc.Input(id="semilla_rumor", type="number", value=0, min=0, step=1, className="input-field")
+            ]),
+
+            html.Button("Simular réplicas", id="estocastico-btn", n_clicks=0, style={"padding": "8px 12px"}),
+            html.Button("Cancelar", id="estocastico-cancel", n_clicks=0, disabled=True,
+                        style={"padding": "8px 12px", "marginLeft": "8px"}),
+            html.Progress(id="estocastico-progress", value="0", max="100", style={"width": "100%", "marginTop": "8px"}),
         ]),
 
-        html.Div(className="input-block", children=[
-            html.Label("Población difusora inicial I₀:", className="input-label"),
-            dcc.Input(id="I0_rumor", type="number", value=0.05, step=0.01, className="input-field")
+        html.Div(id="resumen-estocastico-rumor", className="card"),
+
+        html.Div(className="graph-container", children=[
+            dcc.Graph(id="grafico-estocastico-rumor", figure=figura_estocastica()),
+            dcc.Graph(id="grafico-tamanos-rumor", figure=figura_tamanos())
         ]),
 
-        html.Div(className="input-block", children=[
-            html.Label("Población retirada inicial R₀:", className="input-label"),
-            dcc.Input(id="R0_rumor", type="number", value=0.0, step=0.01, className="input-field")
+        # difusión en red: el rumor solo pasa por las aristas de un grafo
+        html.Div(className="card", children=[
+            html.H3("Difusión en una red de contactos"),
+            html.P(
+                "Sin mezcla homogénea: cada persona es un nodo y solo puede contar el rumor a sus vecinos. "
+                "La tasa por contacto es β/⟨k⟩, de modo que un nodo de grado medio tiene la tasa del modelo "
+                "homogéneo. Los difusores (I₀) y retirados (R₀) iniciales se eligen al azar; el resto no conoce el rumor.",
+                className="page-text"
+            ),
+
+            html.Div(className="input-block", children=[
+                html.Label("Red:", className="input-label"),
+                dcc.Dropdown(id="red_tipo_rumor", value="aleatoria", clearable=False, className="input-field",
+                             options=[{"label": NOMBRES_RED[tipo], "value": tipo} for tipo in GENERADORES + ("archivo",)])
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Nodos:", className="input-label"),
+                dcc.Input(id="red_nodos_rumor", type="number", value=100_000, min=10, max=NODOS_MAX, step=1,
+                          className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Grado medio ⟨k⟩:", className="input-label"),
+                dcc.Input(id="red_grado_rumor", type="number", value=10, min=1, step=1, className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Probabilidad de recableado (mundo pequeño):", className="input-label"),
+                dcc.Input(id="red_recableado_rumor", type="number", value=PROBABILIDAD_RECABLEADO, min=0, max=1,
+                          step=0.01, className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Semilla:", className="input-label"),
+                dcc.Input(id="red_semilla_rumor", type="number", value=0, min=0, step=1, className="input-field")
+            ]),
+
+            dcc.Upload(id="red_aristas_rumor", multiple=False, className="input-field", max_size=ARCHIVO_MAX_BYTES,
+                       children=html.Div("Lista de aristas: arrastra o elige un archivo (una arista «u v» por línea, "
+                                         f"hasta {ARCHIVO_MAX_BYTES // 2**20} MB)"),
+                       style={"border": "1px dashed #999", "borderRadius": "6px", "padding": "10px",
+                              "textAlign": "center", "margin": "8px 0"}),
+
+            html.Button("Simular en red", id="red-btn", n_clicks=0, style={"padding": "8px 12px"}),
+            html.Button("Cancelar", id="red-cancel", n_clicks=0, disabled=True,
+                        style={"padding": "8px 12px", "marginLeft": "8px"}),
+            html.Progress(id="red-progress", value="0", max="100", style={"width": "100%", "marginTop": "8px"}),
         ]),
-    ]),
 
-    html.Div(className="graph-container", children=[
-        dcc.Graph(id="grafico-sir-rumor")
+        html.Div(id="resumen-red-rumor", className="card"),
+
+        html.Div(className="graph-container", children=[
+            dcc.Graph(id="grafico-red-rumor", figure=figura_red())
+        ])
     ])
-])
 
 # ------------------------------------------------------
 # Callback
 # ------------------------------------------------------
-from dash import callback, Output, Input
+from dash import Output, Input, State, no_update
 
-@callback(
+@callback_modelo(
+    "sir",
     Output("grafico-sir-rumor", "figure"),
+    Output("estadisticas-sir-rumor", "children"),
     Input("beta_rumor", "value"),
     Input("gamma_rumor", "value"),
     Input("S0_rumor", "value"),
     Input("I0_rumor", "value"),
-    Input("R0_rumor", "value")
+    Input("R0_rumor", "value"),
+    Input("tol_rumor", "value")
 )
-def actualizar_grafico(beta, gamma, S0, I0, R0):
+@instrumentar
+def actualizar_grafico(beta, gamma, S0, I0, R0, tol=TOL_DEFECTO):
+    if None in (beta, gamma, S0, I0, R0, tol):
+        return no_update, no_update
 
-    if None in (beta, gamma, S0, I0, R0):
-        return go.Figure()
+    t, S, I, R, estadisticas = modelo_sir_rumor(beta, gamma, S0, I0, R0, tol=tol)
+    k = indices_lttb_varias(t, (S, I, R))
+    # solo los datos de las trazas: el layout ya está en figura_base()
+    return parche_trazas(*({"x": t[k], "y": serie[k]} for serie in (S, I, R))), texto_estadisticas_rk(estadisticas)
 
-    t, S, I, R = modelo_sir_rumor(beta, gamma, S0, I0, R0)
 
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=t, y=S, name="No conocen (S)", mode="lines"))
-    fig.add_trace(go.Scatter(x=t, y=I, name="Difunden (I)", mode="lines"))
-    fig.add_trace(go.Scatter(x=t, y=R, name="Abandonan (R)", mode="lines"))
+registrar_resumen("resumen-sir-rumor", ("beta_rumor", "gamma_rumor", "S0_rumor", "I0_rumor", "tol_rumor"),
+                  modelo_sir_rumor, "Máximo de difusores", "Fracción que llegó a conocer el rumor")
 
-    fig.update_layout(
-        title="Dinámica de difusión del rumor",
-        xaxis_title="Tiempo",
-        yaxis_title="Proporción de la población",
-        template="plotly_white",
-        height=550
-    )
 
-    return fig
+# Las réplicas van por bloques de BLOQUE_REPLICAS con el mismo generador:
+# el resultado depende solo de la semilla y entre bloques se informa el
+# progreso (y se puede cancelar).
+@callback_en_fondo(
+    Output("grafico-estocastico-rumor", "figure"),
+    Output("grafico-tamanos-rumor", "figure"),
+    Output("resumen-estocastico-rumor", "children"),
+    Input("estocastico-btn", "n_clicks"),
+    State("beta_rumor", "value"),
+    State("gamma_rumor", "value"),
+    State("S0_rumor", "value"),
+    State("I0_rumor", "value"),
+    State("R0_rumor", "value"),
+    State("N_rumor", "value"),
+    State("replicas_rumor", "value"),
+    State("metodo_estocastico_rumor", "value"),
+    State("semilla_rumor", "value"),
+    progress=Output("estocastico-progress", "value"),
+    cancel=Input("estocastico-cancel", "n_clicks"),
+    running=[
+        (Output("estocastico-btn", "disabled"), True, False),
+        (Output("estocastico-cancel", "disabled"), False, True),
+    ],
+    prevent_initial_call=True,
+)
+def simular_replicas(set_progress, n_clicks, beta, gamma, S0, I0, R0, N, replicas, metodo="tau", semilla=0):
+    if None in (beta, gamma, S0, I0, R0, N, replicas):
+        return no_update, no_update, no_update
+    replicas = max(1, min(int(replicas), REPLICAS_MAX))
+    rng = np.random.default_rng(None if semilla is None else int(semilla))
+    informar = limitar(set_progress)
+
+    bloques = []
+    try:
+        for inicio in range(0, replicas, BLOQUE_REPLICAS):
+            bloque = min(BLOQUE_REPLICAS, replicas - inicio)
+            t, *series = simular(beta, gamma, S0, I0, R0, N, replicas=bloque, metodo=metodo or "tau", rng=rng)
+            bloques.append(series)
+            informar(str(int(100 * (inicio + bloque) / replicas)))
+    except ValueError as e:
+        return no_update, no_update, html.P(f"No se pudo simular: {e}", className="page-text")
+    set_progress("100")
+    S, I, R = (np.concatenate(partes, axis=1) for partes in zip(*bloques))
+
+    # curva determinista de referencia con las mismas proporciones iniciales
+    N = int(N)
+    t_det, *deterministas = modelo_sir_rumor(beta, gamma, *(round(x * N) / N for x in (S0, I0, R0)))[:4]
+    k = indices_lttb_varias(t_det, deterministas)
+    t_det, deterministas = t_det[k], [det[k] for det in deterministas]
+    trazas = []
+    for X, det in zip((S, I, R), deterministas):
+        p5, p25, p50, p75, p95 = bandas(X, PERCENTILES)
+        trazas += [{"x": t, "y": p} for p in (p5, p95, p25, p75, p50)]
+        trazas.append({"x": t_det, "y": det})
+
+    resumen = resumen_replicas(beta, gamma, S0, N, S, I)
+    frecuencias, bordes = np.histogram(resumen["tamanos"], bins=CLASES_TAMANO)
+    histograma = {"x": (bordes[:-1] + bordes[1:]) / 2, "y": frecuencias / replicas}
+
+    cuantiles = resumen["percentiles_tamano"]
+    texto = [
+        html.P(f"{replicas} réplicas ({'Gillespie' if metodo == 'gillespie' else 'tau-leaping'}), N = {N}.",
+               className="page-text"),
+        html.P(f"Extinción temprana (tamaño final < {UMBRAL_BROTE:.0%} de S0): {resumen['p_extincion_temprana']:.1%} "
+               f"· aproximación de ramificación (γ/(β·S0))^I0: {resumen['p_ramificacion']:.1%}", className="page-text"),
+        html.P(f"Réplicas en que el rumor ya se extinguió en t = {t[-1]:g}: {resumen['p_extincion']:.1%}",
+               className="page-text"),
+        html.P(f"Tamaño final: mediana {cuantiles[50]:.4f}, 5–95 %: [{cuantiles[5]:.4f}, {cuantiles[95]:.4f}]",
+               className="page-text"),
+    ]
+    return parche_trazas(*trazas), parche_trazas(histograma), texto
+
+
+def construir_red(tipo, nodos, grado, p, semilla, aristas=None):
+    """Matriz de adyacencia pedida en la página (generador o archivo subido)."""
+    if tipo == "archivo":
+        if not aristas:
+            raise ValueError("sube primero un archivo con la lista de aristas")
+        datos = aristas.split(",", 1)[-1]
+        # max_size del Upload solo frena al navegador: se comprueba antes de decodificar
+        if len(datos) * 3 // 4 > ARCHIVO_MAX_BYTES:
+            raise ValueError(f"el archivo supera {ARCHIVO_MAX_BYTES // 2**20} MB")
+        return cargar_lista_aristas(io.BytesIO(base64.b64decode(datos)), nodos_max=NODOS_MAX,
+                                    aristas_max=ARISTAS_MAX)
+    nodos, grado = int(nodos), float(grado)
+    if not 10 <= nodos <= NODOS_MAX:
+        raise ValueError(f"el número de nodos debe estar entre 10 y {NODOS_MAX}")
+    if not 0 < grado < nodos:
+        raise ValueError("el grado medio debe ser mayor que 0 y menor que el número de nodos")
+    if nodos * grado / 2 > ARISTAS_MAX:
+        raise ValueError(f"nodos × grado medio / 2 = {nodos * grado / 2:.3g} aristas; el máximo es {ARISTAS_MAX:.0e}")
+    return generar_red(tipo, nodos, grado, p=float(p or 0.0), rng=semilla)
+
+
+@callback_en_fondo(
+    Output("grafico-red-rumor", "figure"),
+    Output("resumen-red-rumor", "children"),
+    Input("red-btn", "n_clicks"),
+    State("beta_rumor", "value"),
+    State("gamma_rumor", "value"),
+    State("I0_rumor", "value"),
+    State("R0_rumor", "value"),
+    State("red_tipo_rumor", "value"),
+    State("red_nodos_rumor", "value"),
+    State("red_grado_rumor", "value"),
+    State("red_recableado_rumor", "value"),
+    State("red_semilla_rumor", "value"),
+    State("red_aristas_rumor", "contents"),
+    progress=Output("red-progress", "value"),
+    cancel=Input("red-cancel", "n_clicks"),
+    running=[
+        (Output("red-btn", "disabled"), True, False),
+        (Output("red-cancel", "disabled"), False, True),
+    ],
+    prevent_initial_call=True,
+)
+def simular_en_red(set_progress, n_clicks, beta, gamma, I0, R0, tipo, nodos, grado, p, semilla=0, aristas=None):
+    if None in (beta, gamma, I0, R0, tipo, nodos, grado):
+        return no_update, no_update
+    rng = np.random.default_rng(None if semilla is None else int(semilla))
+    informar = limitar(set_progress)
+
+    try:
+        inicio = time.perf_counter()
+        A = construir_red(tipo, nodos, grado, p, rng, aristas)
+        construccion = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        t, S, I, R = simular_red(A, beta, gamma, I0, R0, dt=PASO_DEFECTO, rng=rng,
+                                 progreso=lambda f: informar(str(int(100 * f))))
+        simulacion = time.perf_counter() - inicio
+    except ValueError as e:
+        return no_update, html.P(f"No se pudo simular: {e}", className="page-text")
+    set_progress("100")
+
+    # mezcla homogénea con las mismas proporciones iniciales que la red
+    t_hom, S_hom, I_hom, R_hom, _ = modelo_sir_rumor(beta, gamma, S[0], I[0], R[0])
+    k = indices_lttb_varias(t_hom, (S_hom, I_hom, R_hom))
+    t_hom, S_hom, I_hom, R_hom = t_hom[k], S_hom[k], I_hom[k], R_hom[k]
+    datos = describir_red(A)
+    texto = [
+        html.P(f"Red {NOMBRES_RED[tipo]}: {datos['nodos']:,} nodos, {datos['aristas']:,} aristas, "
+               f"grado medio {datos['grado_medio']:.2f}, máximo {datos['grado_max']:,}.", className="page-text"),
+        html.P(f"Máximo de difusores: {I.max():.4f} en t ≈ {t[I.argmax()]:.1f} "
+               f"(mezcla homogénea: {I_hom.max():.4f} en t ≈ {t_hom[I_hom.argmax()]:.1f})", className="page-text"),
+        html.P(f"Llegaron a conocer el rumor: {1 - S[-1]:.4f} (mezcla homogénea: {1 - S_hom[-1]:.4f})",
+               className="page-text"),
+        html.P(f"Construcción de la red {construccion:.1f} s · {t.size - 1} pasos de dt = {t[1] - t[0]:g} "
+               f"en {simulacion:.1f} s", style={"fontSize": "12px", "color": "#555"}),
+    ]
+    series = [{"x": t, "y": X} for X in (S, I, R)] + [{"x": t_hom, "y": X} for X in (S_hom, I_hom, R_hom)]
+    return parche_trazas(*series), texto
@@ -1,8 +1,17 @@
+import functools
+
 import dash
 from dash import html, dcc, register_page
 import numpy as np
 import plotly.graph_objs as go
 
+from modelos.sir import TOL_DEFECTO, TOLERANCIAS, sir_adaptativo, texto_estadisticas_rk
+from utilidades.cliente import callback_modelo
+from utilidades.metricas import instrumentar
+from utilidades.resumen import registrar_resumen, tarjeta_resumen
+from utilidades.submuestreo import indices_lttb_varias
+from utilidades.serializacion import parche_trazas
+
 # Registrar la página
 register_page(
     __name__,
@@ -13,105 +22,111 @@ register_page(
 # ------------------------
 # Modelo SIR
 # ------------------------
-def modelo_sir(beta, gamma, S0, I0, R0, tmax=60, steps=600):
-    t = np.linspace(0, tmax, steps)
-    dt = t[1] - t[0]
-
-    S = np.zeros(steps)
-    I = np.zeros(steps)
-    R = np.zeros(steps)
-
-    S[0], I[0], R[0] = S0, I0, R0
+def modelo_sir(beta, gamma, S0, I0, R0, tmax=60, tol=TOL_DEFECTO):
+    return sir_adaptativo(beta, gamma, S0, I0, R0, tmax=tmax, tol=tol)
 
-    for k in range(steps - 1):
-        dS = -beta * S[k] * I[k]
-        dI = beta * S[k] * I[k] - gamma * I[k]
-        dR = gamma * I[k]
-
-        S[k+1] = S[k] + dS * dt
-        I[k+1] = I[k] + dI * dt
-        R[k+1] = R[k] + dR * dt
-
-    return t, S, I, R
+@functools.lru_cache(maxsize=1)
+def figura_base():
+    """Figura sin datos: los callbacks solo reemplazan x/y de las trazas."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=[], y=[], mode="lines", name="Susceptibles S(t)"))
+    fig.add_trace(go.Scatter(x=[], y=[], mode="lines", name="Infectados I(t)"))
+    fig.add_trace(go.Scatter(x=[], y=[], mode="lines", name="Recuperados R(t)"))
+    fig.update_layout(
+        title="Evolución del Modelo SIR",
+        xaxis_title="Tiempo",
+        yaxis_title="Proporción de la población",
+        template="plotly_white",
+        height=550
+    )
+    return fig
 
 # ------------------------
 # Layout adaptado a tu CSS
 # ------------------------
-layout = html.Div(className="page-container", children=[
-
-    html.H1("Resultados del Modelo SIR", className="page-title"),
-
-    html.Div(className="card", children=[
-        html.P(
-            "Este módulo muestra los resultados del modelo epidemiológico SIR, "
-            "permitiendo visualizar la evolución temporal de los individuos Susceptibles (S), "
-            "Infectados (I) y Recuperados (R).",
-            className="page-text"
-        )
-    ]),
-
-    html.Div(className="card", children=[
-        html.Div(className="input-block", children=[
-            html.Label("Tasa de contagio (β):", className="input-label"),
-            dcc.Input(id="beta", type="number", value=0.3, step=0.01, className="input-field")
+def layout():
+    return html.Div(className="page-container", children=[
+
+        html.H1("Resultados del Modelo SIR", className="page-title"),
+
+        html.Div(className="card", children=[
+            html.P(
+                "Este módulo muestra los resultados del modelo epidemiológico SIR, "
+                "permitiendo visualizar la evolución temporal de los individuos Susceptibles (S), "
+                "Infectados (I) y Recuperados (R).",
+                className="page-text"
+            )
         ]),
 
-        html.Div(className="input-block", children=[
-            html.Label("Tasa de recuperación (γ):", className="input-label"),
-            dcc.Input(id="gamma", type="number", value=0.1, step=0.01, className="input-field")
+        html.Div(className="card", children=[
+            html.Div(className="input-block", children=[
+                html.Label("Tasa de contagio (β):", className="input-label"),
+                dcc.Input(id="beta", type="number", value=0.3, step=0.01, className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Tasa de recuperación (γ):", className="input-label"),
+                dcc.Input(id="gamma", type="number", value=0.1, step=0.01, className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Susceptibles iniciales (S0):", className="input-label"),
+                dcc.Input(id="S0", type="number", value=0.99, step=0.01, className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Infectados iniciales (I0):", className="input-label"),
+                dcc.Input(id="I0", type="number", value=0.01, step=0.01, className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Recuperados iniciales (R0):", className="input-label"),
+                dcc.Input(id="R0", type="number", value=0.0, step=0.01, className="input-field")
+            ]),
+
+            html.Div(className="input-block", children=[
+                html.Label("Tolerancia del integrador:", className="input-label"),
+                dcc.Dropdown(id="tol", value=TOL_DEFECTO, clearable=False, className="input-field",
+                             options=[{"label": f"{tol:.0e}", "value": tol} for tol in TOLERANCIAS])
+            ])
         ]),
 
-        html.Div(className="input-block", children=[
-            html.Label("Susceptibles iniciales (S0):", className="input-label"),
-            dcc.Input(id="S0", type="number", value=0.99, step=0.01, className="input-field")
-        ]),
-
-        html.Div(className="input-block", children=[
-            html.Label("Infectados iniciales (I0):", className="input-label"),
-            dcc.Input(id="I0", type="number", value=0.01, step=0.01, className="input-field")
-        ]),
+        # resumen (pico y tamaño final) sin integrar
+        tarjeta_resumen("resumen-sir"),
 
-        html.Div(className="input-block", children=[
-            html.Label("Recuperados iniciales (R0):", className="input-label"),
-            dcc.Input(id="R0", type="number", value=0.0, step=0.01, className="input-field")
+        html.Div(className="graph-container", children=[
+            dcc.Graph(id="grafico-sir", figure=figura_base()),
+            # pasos y error estimado del integrador adaptativo
+            html.Div(id="estadisticas-sir", style={"fontSize": "12px", "color": "#555"})
         ])
-    ]),
-
-    html.Div(className="graph-container", children=[
-        dcc.Graph(id="grafico-sir")
     ])
-])
 
 # ------------------------
 # Callbacks
 # ------------------------
-from dash import callback, Input, Output
+from dash import Input, Output, no_update
 
-@callback(
+@callback_modelo(
+    "sir",
     Output("grafico-sir", "figure"),
+    Output("estadisticas-sir", "children"),
     Input("beta", "value"),
     Input("gamma", "value"),
     Input("S0", "value"),
     Input("I0", "value"),
-    Input("R0", "value")
+    Input("R0", "value"),
+    Input("tol", "value")
 )
-def actualizar(beta, gamma, S0, I0, R0):
-    if None in (beta, gamma, S0, I0, R0):
-        return go.Figure()
+@instrumentar
+def actualizar(beta, gamma, S0, I0, R0, tol=TOL_DEFECTO):
+    if None in (beta, gamma, S0, I0, R0, tol):
+        return no_update, no_update
 
-    t, S, I, R = modelo_sir(beta, gamma, S0, I0, R0)
+    t, S, I, R, estadisticas = modelo_sir(beta, gamma, S0, I0, R0, tol=tol)
+    k = indices_lttb_varias(t, (S, I, R))
+    # solo los datos de las trazas: el layout ya está en figura_base()
+    return parche_trazas(*({"x": t[k], "y": serie[k]} for serie in (S, I, R))), texto_estadisticas_rk(estadisticas)
 
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=t, y=S, mode="lines", name="Susceptibles S(t)"))
-    fig.add_trace(go.Scatter(x=t, y=I, mode="lines", name="Infectados I(t)"))
-    fig.add_trace(go.Scatter(x=t, y=R, mode="lines", name="Recuperados R(t)"))
-
-    fig.update_layout(
-        title="Evolución del Modelo SIR",
-        xaxis_title="Tiempo",
-        yaxis_title="Proporción de la población",
-        template="plotly_white",
-        height=550
-    )
 
-    return fig
+registrar_resumen("resumen-sir", ("beta", "gamma", "S0", "I0", "tol"), modelo_sir,
+                  "Pico de infectados", "Tamaño final de la epidemia")
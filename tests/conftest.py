@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# callbacks de Python (no los de assets/) y sin construir tablas
+os.environ.setdefault("CALLBACKS_CLIENTE", "0")
+os.environ.setdefault("TABLAS_SIR_CONSTRUIR", "0")
+os.environ.setdefault("TRABAJOS_DIR", tempfile.mkdtemp(prefix="trabajos-"))
+
+
+@pytest.fixture(scope="session")
+def app():
+    import app as aplicacion
+    return aplicacion.app
+
+
+@pytest.fixture
+def despachar(app):
+    """
+    POST a /_dash-update-component como lo haría el navegador: el
+    callback pasa por el despachador de Dash, no se llama a la función.
+    `entradas` y `estados` son dicts id -> valor (propiedad "value" salvo
+    que la clave sea "id.propiedad"); devuelve (código, respuesta JSON).
+    """
+    cliente = app.server.test_client()
+
+    def dependencias(valores):
+        lista = []
+        for clave, valor in valores.items():
+            id_, _, propiedad = clave.partition(".")
+            lista.append({"id": id_, "property": propiedad or "value", "value": valor})
+        return lista
+
+    def post(salida, entradas, estados=None):
+        salidas = [dict(zip(("id", "property"), s.split("."))) for s in salida.strip(".").split("...")]
+        entradas = dependencias(entradas)
+        cuerpo = {
+            "output": salida,
+            "outputs": salidas if "..." in salida else salidas[0],
+            "inputs": entradas,
+            "state": dependencias(estados or {}),
+            "changedPropIds": [f"{entradas[0]['id']}.{entradas[0]['property']}"],
+        }
+        respuesta = cliente.post("/_dash-update-component", json=cuerpo)
+        return respuesta.status_code, respuesta.get_json(silent=True)
+
+    return post
@@ -0,0 +1,105 @@
+import sqlite3
+
+import pytest
+
+from utilidades.cache_precios import (
+    INTERVALO_5MIN, INTERVALO_HORA, CachePrecios, remuestrear,
+)
+
+AHORA = 1_700_000_000.0
+
+
+def serie(desde_s, hasta_s, paso_s, precio=1.0):
+    return [(int(t * 1000), precio) for t in range(int(desde_s), int(hasta_s) + 1, paso_s)]
+
+
+class Descargas:
+    """Sustituye a la API: devuelve series con la granularidad de CoinGecko."""
+
+    def __init__(self):
+        self.llamadas = []
+
+    def dias(self, coin, days):
+        self.llamadas.append(("dias", days))
+        paso = INTERVALO_5MIN if days <= 1 else INTERVALO_HORA
+        return serie(AHORA - days * 86400, AHORA, paso)
+
+    def rango(self, coin, desde_s, hasta_s):
+        self.llamadas.append(("rango", desde_s, hasta_s))
+        paso = INTERVALO_5MIN if hasta_s - desde_s <= 86400 else INTERVALO_HORA
+        return serie(desde_s, hasta_s, paso, precio=2.0)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CachePrecios(str(tmp_path / "cripto.sqlite"))
+
+
+def pasos_s(df):
+    return set(df["timestamp"].diff().dropna() // 1000)
+
+
+def test_granularidades_en_series_separadas(cache):
+    api = Descargas()
+    diario = cache.obtener("btc", 1, api.dias, api.rango, ahora=AHORA)
+    semanal = cache.obtener("btc", 7, api.dias, api.rango, ahora=AHORA)
+    assert pasos_s(diario) == {INTERVALO_5MIN}
+    assert pasos_s(semanal) == {INTERVALO_HORA}
+    # la ventana de 1 día cabe en la serie horaria, pero no se responde con ella
+    assert pasos_s(cache.obtener("btc", 1, api.dias, api.rango, ahora=AHORA + 10)) == {INTERVALO_5MIN}
+    assert [l[0] for l in api.llamadas] == ["dias", "dias"]
+
+
+def test_cola_remuestreada_al_intervalo_de_la_serie(cache):
+    api = Descargas()
+    cache.obtener("btc", 7, api.dias, api.rango, ahora=AHORA)
+    df = cache.obtener("btc", 7, api.dias, api.rango, ahora=AHORA + 4 * 3600)
+    assert api.llamadas[-1][0] == "rango"
+    assert pasos_s(df) == {INTERVALO_HORA}
+    assert df["price"].iloc[-1] == 2.0
+
+
+def test_cola_mas_gruesa_que_la_serie_se_descarga_entera(cache):
+    api = Descargas()
+    cache.obtener("btc", 1, api.dias, api.rango, ahora=AHORA)
+    cache.obtener("btc", 1, api.dias, api.rango, ahora=AHORA + 2 * 86400)
+    assert [l[0] for l in api.llamadas] == ["dias", "dias"]
+
+
+def test_remuestrear_sigue_el_espaciado_desde_el_origen():
+    puntos = [(1_000, 1.0), (301_000, 2.0), (3_601_000, 3.0), (3_901_000, 4.0)]
+    assert remuestrear(puntos, INTERVALO_HORA, 1_000) == [(1_000, 1.0), (3_601_000, 3.0)]
+
+
+def test_esquema_anterior_se_descarta(tmp_path):
+    ruta = str(tmp_path / "vieja.sqlite")
+    con = sqlite3.connect(ruta)
+    con.execute("CREATE TABLE precios (coin TEXT, ts INTEGER, price REAL, PRIMARY KEY (coin, ts))")
+    con.execute("CREATE TABLE cobertura (coin TEXT PRIMARY KEY, desde INTEGER, actualizado REAL)")
+    con.execute("INSERT INTO cobertura VALUES ('btc', 0, ?)", (AHORA,))
+    con.commit()
+    con.close()
+
+    api = Descargas()
+    df = CachePrecios(ruta).obtener("btc", 7, api.dias, api.rango, ahora=AHORA)
+    assert not df.empty
+    assert api.llamadas[0][0] == "dias"
+
+
+def test_no_deja_conexiones_abiertas(cache, monkeypatch):
+    abiertas = []
+    conectar = sqlite3.connect
+
+    def registrar(*args, **kwargs):
+        con = conectar(*args, **kwargs)
+        abiertas.append(con)
+        return con
+
+    monkeypatch.setattr(sqlite3, "connect", registrar)
+    api = Descargas()
+    for _ in range(3):
+        cache.obtener("btc", 7, api.dias, api.rango, ahora=AHORA)
+    assert abiertas
+    for con in abiertas:
+        with pytest.raises(sqlite3.ProgrammingError):
+            con.execute("SELECT 1")
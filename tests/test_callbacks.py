@@ -0,0 +1,70 @@
+"""Callbacks de las páginas a través del despachador de Dash."""
+import pytest
+
+SEIR = ("..sim-graph.figure...analytic-output.children...eigs-text.children"
+        "...summary-metrics.children...solver-stats.children..")
+
+
+def test_paginas_responden(app):
+    import dash
+
+    cliente = app.server.test_client()
+    for pagina in dash.page_registry.values():
+        assert cliente.get(pagina["path"]).status_code == 200, pagina["path"]
+
+
+@pytest.mark.parametrize("I0", [10, 0.5])
+def test_simulacion_seir(despachar, I0):
+    codigo, respuesta = despachar(SEIR, {"sim-btn.n_clicks": 1}, {
+        "beta-slider": 0.5, "sigma-slider": 0.2, "gamma-slider": 1 / 7, "i0-input": I0, "tmax-input": 160,
+    })
+    assert codigo == 200
+    salida = respuesta["response"]
+    assert set(salida) == {"sim-graph", "analytic-output", "eigs-text", "summary-metrics", "solver-stats"}
+
+
+def test_resumen_sir(despachar):
+    codigo, respuesta = despachar("resumen-sir.children", {"beta": 0.3, "gamma": 0.1, "S0": 0.99, "I0": 0.01})
+    assert codigo == 200
+    assert "Pico de infectados" in str(respuesta["response"]["resumen-sir"]["children"])
+
+
+def test_contraste_sir(despachar):
+    codigo, respuesta = despachar("resumen-sir-contraste.children", {
+        "resumen-sir-btn.n_clicks": 1, "beta": 0.3, "gamma": 0.1, "S0": 0.99, "I0": 0.01, "tol": 1e-6,
+    })
+    assert codigo == 200
+    assert "Diferencia con la curva numérica" in respuesta["response"]["resumen-sir-contraste"]["children"]
+
+
+def test_grafico_sir(despachar):
+    codigo, respuesta = despachar("..grafico-sir.figure...estadisticas-sir.children..", {
+        "beta": 0.3, "gamma": 0.1, "S0": 0.99, "I0": 0.01, "R0": 0.0, "tol": 1e-6,
+    })
+    assert codigo == 200
+
+
+def test_simulacion_acoplada_desde_almacen(app, despachar):
+    from pages import Ejercicio3
+
+    estados = {"r": 1.0, "kx": 50.0, "b": 0.02, "a": 0.5, "n": 10.0, "m": 0.1, "x0": 10.0, "y0": 2.0,
+               "tmax": 123.0, "metodo": "auto"}
+    # los ids de las salidas duplicadas llevan el hash que les da Dash
+    salida = next(k for k in app.callback_map if "sim-pedido.data" in k)
+
+    # no está en el almacén: se pide el trabajo
+    codigo, respuesta = despachar(salida, {"simular.n_clicks": 1}, estados)
+    assert codigo == 200
+    pedido = respuesta["response"]["sim-pedido"]["data"]
+    assert pedido["params"][-1] == 123.0
+
+    data, _ = Ejercicio3.run_sim(lambda *_: None, pedido)
+
+    # ya está: se pinta sin trabajo
+    codigo, respuesta = despachar(salida, {"simular.n_clicks": 2}, estados)
+    assert codigo == 200
+    assert "sim-pedido" not in respuesta["response"]
+    assert respuesta["response"]["sim-store"]["data"]["clave"] == data["clave"]
+
+    metricas = app.server.test_client().get("/metrics").get_data(as_text=True)
+    assert 'cache_hits_total{cache="resultados_trabajos"}' in metricas
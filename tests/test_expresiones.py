@@ -0,0 +1,48 @@
+"""Lista blanca de modelos/expresiones.py: lo que compila y lo que se rechaza."""
+import numpy as np
+import pytest
+
+from modelos.expresiones import ExpresionInvalida, compilar
+
+# expresión -> la misma cuenta con NumPy
+ACEPTADAS = {
+    "-y": lambda x, y: -y,
+    "np.cos(x)": lambda x, y: np.cos(x),
+    "sin(x) - 0.2*y": lambda x, y: np.sin(x) - 0.2 * y,
+    "x**2 + abs(y)**-1.5": lambda x, y: x**2 + np.abs(y) ** -1.5,
+    "exp(-(x**2 + y**2)/2) * pi": lambda x, y: np.exp(-(x**2 + y**2) / 2) * np.pi,
+    "x % 3 + y // 2 - e": lambda x, y: x % 3 + y // 2 - np.e,
+    "x**(3*4) / 9**99": lambda x, y: x**12 / 9.0**99,
+    "(-8)**3 + y": lambda x, y: -512.0 + y,
+}
+
+# agrupadas por motivo; los argumentos no son cadenas para que el rechazo
+# venga de la función y no de la constante
+RECHAZADAS = {
+    "acceso a atributos": ["x.real", "np.__dict__", "().__class__.__bases__", "np.linalg.norm(x)", "x.__class__"],
+    "llamadas fuera de la lista": ["__import__(x)", "eval(x)", "open(x)", "np.load(x)", "getattr(x, y)", "vars(x)",
+                                   "(lambda: 1)()", "sin(x, out=y)", "exp()"],
+    "comprensiones": ["[x for x in (1, 2)]", "sum(x for x in y)", "{x: 1 for x in y}", "{x for x in y}"],
+    "exponentes grandes": ["9**9**9", "x**1000", "2**-400", "y**(2**10)", "x**(50*3)"],
+    "resultados que desbordan": ["(9**99)**99", "x + (10**99)**4", "(pi**60)**60", "exp(1000)**2"],
+    "constantes sin valor": ["1/0", "x + 2 % 0", "0**-1", "(-8)**(1/3)"],
+    "otras construcciones": ["x[0]", "'texto'", "True", "x if y else 1", "x < y", "x and y", "z + 1", "", "x;y"],
+}
+
+
+@pytest.mark.parametrize("texto", ACEPTADAS)
+def test_aceptada_coincide_con_numpy(texto):
+    x, y = np.meshgrid(np.linspace(-2, 2, 7), np.linspace(0.5, 3, 5))
+    np.testing.assert_allclose(compilar(texto)(x, y), ACEPTADAS[texto](x, y))
+
+
+@pytest.mark.parametrize("texto", [t for textos in RECHAZADAS.values() for t in textos])
+def test_rechazada(texto):
+    with pytest.raises(ExpresionInvalida):
+        compilar(texto)
+
+
+def test_escalares_no_desbordan_con_excepcion():
+    # lo que pasa la validación se evalúa también con floats de Python
+    for texto in ACEPTADAS:
+        compilar(texto)(1.5, 2.0)
@@ -0,0 +1,55 @@
+"""assets/modelos_cliente.js frente a modelos/sir.py (mismas cuentas en el navegador)."""
+import json
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from modelos.sir import sir_adaptativo, texto_estadisticas_rk
+from utilidades.submuestreo import indices_lttb_varias
+
+from conftest import RAIZ
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="hace falta node")
+
+# carga el asset con un window mínimo (sin Patch: devuelve la figura completa)
+PROGRAMA = """
+global.window = {dash_clientside: {no_update: null}};
+require(process.argv[1]);
+const casos = JSON.parse(process.argv[2]);
+const figura = {data: [{}, {}, {}], layout: {}};
+console.log(JSON.stringify(casos.map(c => window.dash_clientside.modelos.sir(...c, figura))));
+"""
+
+CASOS = [
+    # (beta, gamma, S0, I0, R0, tol)
+    (0.3, 0.1, 0.99, 0.01, 0.0, 1e-6),
+    (0.5, 0.2, 0.95, 0.05, 0.0, 1e-3),
+    (2.0, 0.05, 0.9, 0.01, 0.09, 1e-8),
+    (100.0, 0.01, 0.99, 0.01, 0.0, 1e-8),      # más de 1000 puntos: LTTB
+    (1e4, 0.1, 0.99, 0.01, 0.0, 1e-6),         # corta en PASOS_MAXIMO
+]
+
+
+@pytest.fixture(scope="module")
+def resultados_js():
+    asset = os.path.join(RAIZ, "assets", "modelos_cliente.js")
+    salida = subprocess.run(["node", "-e", PROGRAMA, asset, json.dumps(CASOS)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout)
+
+
+@pytest.mark.parametrize("n", range(len(CASOS)))
+def test_sir_igual_que_python(resultados_js, n):
+    beta, gamma, S0, I0, R0, tol = CASOS[n]
+    figura, texto = resultados_js[n]
+    t, S, I, R, estadisticas = sir_adaptativo(beta, gamma, S0, I0, R0, tol=tol)
+    k = indices_lttb_varias(t, (S, I, R))
+
+    assert texto == texto_estadisticas_rk(estadisticas)
+    # Math.pow y ** pueden diferir en el último bit del factor de paso
+    for traza, serie in zip(figura["data"], (S, I, R)):
+        np.testing.assert_allclose(traza["x"], t[k], rtol=1e-9, atol=0)
+        np.testing.assert_allclose(traza["y"], serie[k], rtol=1e-9, atol=1e-15)
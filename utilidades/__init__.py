@@ -0,0 +1 @@
+# Infraestructura compartida por las páginas (cachés, red, figuras).
@@ -0,0 +1,92 @@
+import functools
+import importlib
+import os
+import time
+
+import dash
+
+# ------------------------------------------------------
+# Carga de páginas con perfil de arranque
+# ------------------------------------------------------
+# En lugar de dejar que Dash importe la carpeta pages/ a ciegas, app.py
+# importa cada página aquí y mide cuánto tarda. Las páginas difieren sus
+# dependencias pesadas (scipy, pandas, plotly.express, requests) y sus
+# figuras al primer uso, así que la "inicialización" de una página con
+# layout función se mide en su primera llamada.
+
+MODULOS_PESADOS = ("pandas", "plotly.express", "scipy.integrate", "requests")
+
+
+class PerfilArranque:
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.paginas = {}
+        self.total_importacion = None
+
+    def importar_paginas(self, carpeta, paquete="pages"):
+        """Importa cada página de `carpeta` (mismo criterio que Dash) y mide su importación."""
+        for archivo in sorted(os.listdir(carpeta)):
+            if archivo.startswith((".", "_")) or not archivo.endswith(".py"):
+                continue
+            with open(os.path.join(carpeta, archivo), encoding="utf-8") as f:
+                if "register_page" not in f.read():
+                    continue
+            modulo = f"{paquete}.{archivo[:-3]}"
+            t0 = time.perf_counter()
+            pagina = importlib.import_module(modulo)
+            # lo mismo que hace Dash tras importar: el layout se define
+            # después de register_page, así que se copia al registro aquí
+            registro = dash.page_registry.get(modulo)
+            if registro is not None and not registro["supplied_layout"]:
+                registro["layout"] = getattr(pagina, "layout")
+            self.paginas[modulo] = {
+                "importacion": time.perf_counter() - t0,
+                "inicializacion": None,
+                # layout estático: se construyó durante la importación
+                "estatico": not callable(getattr(pagina, "layout", None)),
+            }
+        self.total_importacion = time.perf_counter() - self.inicio
+
+    def medir_layouts(self, registro):
+        """Envuelve los layouts función del registro de Dash para medir su primera llamada."""
+        for modulo, pagina in registro.items():
+            layout = pagina.get("layout")
+            if callable(layout) and modulo in self.paginas:
+                pagina["layout"] = self._medido(modulo, layout)
+
+    def _medido(self, modulo, layout):
+        @functools.wraps(layout)
+        def envoltura(*args, **kwargs):
+            if self.paginas[modulo]["inicializacion"] is not None:
+                return layout(*args, **kwargs)
+            t0 = time.perf_counter()
+            resultado = layout(*args, **kwargs)
+            self.paginas[modulo]["inicializacion"] = time.perf_counter() - t0
+            return resultado
+        return envoltura
+
+    def precargar(self, registro):
+        """
+        Modo ansioso: importa las dependencias pesadas y construye ya todos
+        los layouts función (midiendo su inicialización).
+        """
+        for modulo in MODULOS_PESADOS:
+            importlib.import_module(modulo)
+        for pagina in registro.values():
+            if callable(pagina.get("layout")):
+                pagina["layout"]()
+
+    def reporte(self):
+        lineas = [f"{'página':<32}{'importación (ms)':>18}{'inicialización (ms)':>22}"]
+        for modulo, t in sorted(self.paginas.items(), key=lambda kv: -kv[1]["importacion"]):
+            if t["estatico"]:
+                ini = "en importación"
+            elif t["inicializacion"] is None:
+                ini = "pendiente"
+            else:
+                ini = f"{t['inicializacion'] * 1000:.1f}"
+            lineas.append(f"{modulo:<32}{t['importacion'] * 1000:>18.1f}{ini:>22}")
+        if self.total_importacion is not None:
+            lineas.append(f"{'total hasta registrar páginas':<32}{self.total_importacion * 1000:>18.1f}")
+        return "\n".join(lineas)
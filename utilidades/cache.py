@@ -0,0 +1,163 @@
+import functools
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# ------------------------------------------------------
+# Caché LRU acotada en bytes para resultados de integración
+# ------------------------------------------------------
+# Registro de todas las cachés creadas, por nombre, para poder
+# consultar sus contadores desde un solo lugar.
+CACHES = {}
+
+
+def normalizar(valor, digitos=12):
+    """
+    Convierte un argumento en una clave estable: los números se pasan a
+    float redondeado a `digitos` cifras significativas (10 y 10.0 dan la
+    misma clave) y las secuencias se normalizan elemento a elemento.
+    """
+    if isinstance(valor, (bool, str, type(None))):
+        return valor
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        return float(f"{float(valor):.{digitos}g}")
+    if isinstance(valor, (list, tuple, np.ndarray)):
+        return tuple(normalizar(v, digitos) for v in valor)
+    return valor
+
+
+def tamano_bytes(valor):
+    """Tamaño aproximado en memoria de un resultado (arrays, tuplas, dicts)."""
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, (list, tuple)):
+        return sum(tamano_bytes(v) for v in valor)
+    if isinstance(valor, dict):
+        return sum(tamano_bytes(v) for v in valor.values())
+    if hasattr(valor, "__dict__"):
+        # objetos con arreglos dentro (p. ej. OdeSolution de solve_ivp)
+        return 64 + tamano_bytes(vars(valor))
+    return 64
+
+
+def _solo_lectura(valor, vistos=None):
+    # los resultados se comparten entre peticiones: nadie debe mutarlos.
+    # También los arreglos dentro de objetos (p. ej. los interpolantes y
+    # `ts` de una OdeSolution); `vistos` evita recorrer dos veces el mismo
+    # objeto si hay referencias circulares
+    vistos = set() if vistos is None else vistos
+    if id(valor) in vistos:
+        return valor
+    vistos.add(id(valor))
+    if isinstance(valor, np.ndarray):
+        valor.flags.writeable = False
+    elif isinstance(valor, (list, tuple)):
+        for v in valor:
+            _solo_lectura(v, vistos)
+    elif isinstance(valor, dict):
+        for v in valor.values():
+            _solo_lectura(v, vistos)
+    elif hasattr(valor, "__dict__") and not isinstance(valor, type):
+        _solo_lectura(vars(valor), vistos)
+    return valor
+
+
+class CacheLRU:
+    """
+    Caché LRU en memoria del proceso, limitada por tamaño total en bytes.
+    Al superar `max_bytes` se desalojan las entradas menos usadas.
+    Segura entre hilos (Flask sirve peticiones en paralelo).
+    """
+
+    def __init__(self, nombre, max_bytes):
+        self.nombre = nombre
+        self.max_bytes = int(max_bytes)
+        self._datos = OrderedDict()
+        self._tamanos = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        CACHES[nombre] = self
+
+    def obtener(self, clave):
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return True, self._datos[clave]
+            self.fallos += 1
+            return False, None
+
+    def guardar(self, clave, valor):
+        tam = tamano_bytes(valor)
+        if tam > self.max_bytes:
+            return valor
+        _solo_lectura(valor)
+        with self._lock:
+            if clave in self._datos:
+                self._bytes -= self._tamanos.pop(clave)
+                del self._datos[clave]
+            self._datos[clave] = valor
+            self._tamanos[clave] = tam
+            self._bytes += tam
+            while self._bytes > self.max_bytes:
+                viejo, _ = self._datos.popitem(last=False)
+                self._bytes -= self._tamanos.pop(viejo)
+                self.desalojos += 1
+        return valor
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+            self._tamanos.clear()
+            self._bytes = 0
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "entradas": len(self._datos),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def memoizar(nombre, max_bytes=None, ignorar=()):
+    """
+    Decorador: guarda el resultado de la función en una CacheLRU, con clave
+    en la tupla normalizada de sus argumentos. Los argumentos nombrados en
+    `ignorar` (p. ej. funciones de progreso) no forman parte de la clave.
+    El tamaño por defecto se toma de la variable de entorno CACHE_ODE_MB
+    (64 MB).
+    """
+    if max_bytes is None:
+        max_bytes = float(os.environ.get("CACHE_ODE_MB", 64)) * 1024 * 1024
+
+    def decorador(func):
+        cache = CacheLRU(nombre, max_bytes)
+
+        @functools.wraps(func)
+        def envoltura(*args, **kwargs):
+            clave = (normalizar(args), tuple(sorted(
+                (k, normalizar(v)) for k, v in kwargs.items() if k not in ignorar
+            )))
+            hallado, valor = cache.obtener(clave)
+            if hallado:
+                return valor
+            return cache.guardar(clave, func(*args, **kwargs))
+
+        envoltura.cache = cache
+        return envoltura
+
+    return decorador
+
+
+def estadisticas_caches():
+    """Contadores de todas las cachés registradas, por nombre."""
+    return {nombre: c.estadisticas() for nombre, c in CACHES.items()}
@@ -0,0 +1,190 @@
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+# ------------------------------------------------------
+# Caché persistente (SQLite) de historiales market_chart
+# ------------------------------------------------------
+# Por moneda e intervalo se guardan los puntos (timestamp en ms, precio) y
+# la "cobertura": desde qué instante hay datos continuos y cuándo se
+# actualizaron por última vez. Una petición (coin, days) se responde sin
+# red si la cobertura alcanza `days` hacia atrás y sigue fresca según el
+# TTL de ese `days`; si solo está vieja se descarga la cola que falta.
+#
+# CoinGecko elige la granularidad según la ventana (5 min hasta 1 día,
+# horaria hasta 90, diaria más allá; /range igual según su tramo), así
+# que cada granularidad es una serie aparte: una ventana de 1 día no se
+# mezcla con puntos horarios ni una de 7 días con puntos cada 5 min. La
+# cola se remuestrea al intervalo de la serie y, si /range la devolvería
+# más gruesa, se descarga la ventana entera.
+
+RUTA_DB = os.environ.get(
+    "CRIPTO_CACHE_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "cripto.sqlite"),
+)
+
+# TTL en segundos según la ventana pedida: las ventanas cortas se ven
+# con más detalle y necesitan datos más recientes.
+TTL_POR_DIAS = ((1, 60), (7, 300), (30, 900))
+TTL_MAXIMO = 3600
+DIAS_RETENCION = 90
+
+# intervalo en segundos de los puntos que devuelve CoinGecko
+INTERVALO_5MIN = 300
+INTERVALO_HORA = 3600
+INTERVALO_DIA = 86400
+
+# versión del esquema; una caché con otra versión se descarta entera
+VERSION_ESQUEMA = 2
+
+_ESQUEMA = """
+DROP TABLE IF EXISTS precios;
+DROP TABLE IF EXISTS cobertura;
+CREATE TABLE precios (
+    coin      TEXT    NOT NULL,
+    intervalo INTEGER NOT NULL,
+    ts        INTEGER NOT NULL,
+    price     REAL    NOT NULL,
+    PRIMARY KEY (coin, intervalo, ts)
+) WITHOUT ROWID;
+CREATE TABLE cobertura (
+    coin        TEXT    NOT NULL,
+    intervalo   INTEGER NOT NULL,
+    desde       INTEGER NOT NULL,
+    actualizado REAL    NOT NULL,
+    PRIMARY KEY (coin, intervalo)
+);
+"""
+
+
+def ttl(days):
+    for limite, segundos in TTL_POR_DIAS:
+        if days <= limite:
+            return segundos
+    return TTL_MAXIMO
+
+
+def intervalo(days):
+    """Granularidad (s) con la que CoinGecko responde una ventana de `days` días."""
+    if days <= 1:
+        return INTERVALO_5MIN
+    if days <= 90:
+        return INTERVALO_HORA
+    return INTERVALO_DIA
+
+
+def remuestrear(puntos, segundos, origen_ms):
+    """
+    Primer punto de cada intervalo de `segundos` contado desde `origen_ms`
+    (el final de la serie guardada), para que la cola siga su espaciado.
+    """
+    paso = segundos * 1000
+    por_intervalo = {}
+    for ts, p in sorted(puntos):
+        por_intervalo.setdefault((int(ts) - origen_ms) // paso, (ts, p))
+    return list(por_intervalo.values())
+
+
+class CachePrecios:
+
+    def __init__(self, ruta=RUTA_DB):
+        self.ruta = ruta
+        self._init_lock = threading.Lock()
+        self._listo = False
+
+    def _conectar(self):
+        # sqlite3.Connection como gestor de contexto solo confirma la
+        # transacción; closing() además la cierra
+        return contextlib.closing(sqlite3.connect(self.ruta, timeout=10))
+
+    @contextlib.contextmanager
+    def _conexion(self):
+        """Conexión de una sola transacción, cerrada al salir."""
+        if not self._listo:
+            with self._init_lock:
+                if not self._listo:
+                    os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+                    with self._conectar() as con:
+                        con.execute("PRAGMA journal_mode=WAL")
+                        if con.execute("PRAGMA user_version").fetchone()[0] != VERSION_ESQUEMA:
+                            con.executescript(_ESQUEMA)
+                            con.execute(f"PRAGMA user_version = {VERSION_ESQUEMA}")
+                    self._listo = True
+        with self._conectar() as con, con:
+            yield con
+
+    def cobertura(self, coin, intervalo):
+        """(desde_ms, actualizado_epoch) o None si la serie no está en caché."""
+        with self._conexion() as con:
+            fila = con.execute(
+                "SELECT desde, actualizado FROM cobertura WHERE coin = ? AND intervalo = ?",
+                (coin, intervalo),
+            ).fetchone()
+        return fila
+
+    def leer(self, coin, intervalo, desde_ms):
+        with self._conexion() as con:
+            filas = con.execute(
+                "SELECT ts, price FROM precios WHERE coin = ? AND intervalo = ? AND ts >= ? ORDER BY ts",
+                (coin, intervalo, int(desde_ms)),
+            ).fetchall()
+        return pd.DataFrame(filas, columns=["timestamp", "price"])
+
+    def guardar(self, coin, intervalo, puntos, desde_ms, actualizado):
+        """
+        Inserta los puntos [(ts_ms, precio), ...] en la serie `intervalo` y
+        amplía su cobertura. `desde_ms` es el inicio de la ventana descargada.
+        """
+        limite = int((actualizado - DIAS_RETENCION * 86400) * 1000)
+        with self._conexion() as con:
+            con.executemany(
+                "INSERT OR REPLACE INTO precios (coin, intervalo, ts, price) VALUES (?, ?, ?, ?)",
+                ((coin, intervalo, int(ts), float(p)) for ts, p in puntos),
+            )
+            con.execute(
+                "INSERT INTO cobertura (coin, intervalo, desde, actualizado) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(coin, intervalo) DO UPDATE SET "
+                "desde = MIN(desde, excluded.desde), actualizado = excluded.actualizado",
+                (coin, intervalo, int(desde_ms), float(actualizado)),
+            )
+            con.execute("DELETE FROM precios WHERE coin = ? AND intervalo = ? AND ts < ?",
+                        (coin, intervalo, limite))
+            con.execute("UPDATE cobertura SET desde = MAX(desde, ?) WHERE coin = ? AND intervalo = ?",
+                        (limite, coin, intervalo))
+
+    def obtener(self, coin, days, descargar_dias, descargar_rango, ahora=None):
+        """
+        Historial de `coin` para los últimos `days` días como DataFrame
+        (timestamp en ms, price).
+
+        descargar_dias(coin, days) y descargar_rango(coin, desde_s, hasta_s)
+        hacen la petición real y devuelven una lista [(ts_ms, precio), ...]
+        o None si falló.
+        """
+        ahora = time.time() if ahora is None else ahora
+        desde_ms = (ahora - days * 86400) * 1000
+        serie = intervalo(days)
+        cob = self.cobertura(coin, serie)
+
+        if cob is not None and cob[0] <= desde_ms:
+            desde_cache, actualizado = cob
+            if ahora - actualizado < ttl(days):
+                return self.leer(coin, serie, desde_ms)
+            # solo falta la cola desde la última actualización, si /range
+            # la devuelve al menos tan fina como la serie
+            if intervalo((ahora - actualizado) / 86400) <= serie:
+                puntos = descargar_rango(coin, actualizado, ahora)
+                if puntos is not None:
+                    self.guardar(coin, serie, remuestrear(puntos, serie, int(actualizado * 1000)),
+                                desde_cache, ahora)
+                return self.leer(coin, serie, desde_ms)
+
+        puntos = descargar_dias(coin, days)
+        if puntos is None:
+            return self.leer(coin, serie, desde_ms) if cob is not None else pd.DataFrame(columns=["timestamp", "price"])
+        self.guardar(coin, serie, puntos, desde_ms, ahora)
+        return self.leer(coin, serie, desde_ms)
@@ -0,0 +1,41 @@
+import os
+
+import dash
+from dash import ClientsideFunction, Output, State
+
+# ------------------------------------------------------
+# Callbacks evaluados en el navegador (modelos baratos)
+# ------------------------------------------------------
+# Los modelos cerrados o de pocos pasos (crecimiento exponencial, SIR con
+# Euler) se calculan en assets/modelos_cliente.js: cada cambio de un
+# parámetro se resuelve en el navegador sin tocar el servidor.
+# CALLBACKS_CLIENTE=0 vuelve a los callbacks de Python (depuración,
+# métricas de /metrics).
+#
+# Las funciones JS devuelven un dash_clientside.Patch, que solo existe en
+# versiones recientes de Dash. Para las anteriores reciben además la
+# figura actual (State de la primera salida "figure") y, sin Patch,
+# aplican las mismas asignaciones sobre una copia y devuelven la figura
+# completa.
+
+ACTIVO = os.environ.get("CALLBACKS_CLIENTE", "1") == "1"
+ESPACIO_JS = "modelos"
+
+
+def callback_modelo(funcion_js, *dependencias, **kwargs):
+    """
+    Como dash.callback, pero si ACTIVO registra en su lugar la función
+    `dash_clientside.modelos.<funcion_js>` con las mismas dependencias, más
+    la figura de salida como último argumento (respaldo sin Patch). La
+    función de Python queda como referencia y para el modo servidor.
+    """
+    def decorador(func):
+        if ACTIVO:
+            figura = next((State(d.component_id, "figure") for d in dependencias
+                           if isinstance(d, Output) and d.component_property == "figure"), None)
+            extra = (figura,) if figura is not None else ()
+            dash.clientside_callback(ClientsideFunction(ESPACIO_JS, funcion_js), *dependencias, *extra, **kwargs)
+            return func
+        return dash.callback(*dependencias, **kwargs)(func)
+
+    return decorador
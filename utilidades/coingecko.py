@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from utilidades.cache_precios import CachePrecios, RUTA_DB
+
+# ------------------------------------------------------
+# Cliente CoinGecko: sesión HTTP compartida y descargas concurrentes
+# ------------------------------------------------------
+# COINGECKO_API_URL permite apuntar a un servidor local de prueba.
+API_URL = os.environ.get("COINGECKO_API_URL", "https://api.coingecko.com/api/v3")
+TIMEOUT = 10
+MAX_CONEXIONES = 8
+
+_sesion = None
+_lock = threading.Lock()
+_pool = ThreadPoolExecutor(max_workers=MAX_CONEXIONES, thread_name_prefix="coingecko")
+
+COLUMNAS = ["timestamp", "price", "coin"]
+
+cache_precios = CachePrecios()
+
+# Monedas ofrecidas en el selector. La lista empaquetada sirve de respaldo
+# cuando todavía no hay copia en disco o no hay red.
+MONEDAS_COMUNES = [
+    ("bitcoin", "btc"), ("ethereum", "eth"), ("solana", "sol"), ("dogecoin", "doge"),
+    ("cardano", "ada"), ("litecoin", "ltc"), ("xrp", "xrp"),
+]
+RUTA_MONEDAS = os.environ.get(
+    "CRIPTO_MONEDAS_JSON", os.path.join(os.path.dirname(RUTA_DB), "monedas.json")
+)
+TTL_MONEDAS = 24 * 3600
+
+_refresco_en_curso = threading.Event()
+
+
+def sesion():
+    """Sesión requests única del proceso, con pool de conexiones keep-alive."""
+    global _sesion
+    with _lock:
+        if _sesion is None:
+            s = requests.Session()
+            adaptador = HTTPAdapter(pool_connections=MAX_CONEXIONES, pool_maxsize=MAX_CONEXIONES)
+            s.mount("https://", adaptador)
+            s.mount("http://", adaptador)
+            _sesion = s
+        return _sesion
+
+
+def _pedir_precios(url, params):
+    try:
+        r = sesion().get(url, params=params, timeout=TIMEOUT)
+        data = r.json()
+    except (requests.RequestException, ValueError):
+        return None
+    if not isinstance(data, dict) or "prices" not in data:
+        return None
+    return data["prices"]
+
+
+def descargar_dias(coin_id, days):
+    url = f"{API_URL}/coins/{coin_id}/market_chart"
+    return _pedir_precios(url, {"vs_currency": "usd", "days": days})
+
+
+def descargar_rango(coin_id, desde_s, hasta_s):
+    url = f"{API_URL}/coins/{coin_id}/market_chart/range"
+    return _pedir_precios(url, {"vs_currency": "usd", "from": int(desde_s), "to": int(hasta_s)})
+
+
+def obtener_precio(coin_id, days=7):
+    """
+    Historial de precios de los últimos `days` días. Pasa por la caché
+    persistente: sin red si hay datos frescos, solo la cola si están viejos.
+    """
+    df = cache_precios.obtener(coin_id, days, descargar_dias, descargar_rango)
+    if df.empty:
+        return pd.DataFrame(columns=COLUMNAS)
+
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    df["coin"] = coin_id
+    return df
+
+
+def obtener_precios(coin_ids, days=7):
+    """
+    Descarga el historial de todas las monedas en paralelo sobre la sesión
+    compartida y lo une con una sola concatenación. Las monedas sin datos
+    se omiten; si ninguna tiene datos se devuelve un DataFrame vacío.
+    """
+    coin_ids = list(dict.fromkeys(coin_ids or []))
+    if not coin_ids:
+        return pd.DataFrame(columns=COLUMNAS)
+
+    frames = list(_pool.map(lambda c: obtener_precio(c, days), coin_ids))
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=COLUMNAS)
+    return pd.concat(frames, ignore_index=True)
+
+
+# ------------------------------------------------------
+# Lista de monedas: perezosa, en disco y sin bloquear
+# ------------------------------------------------------
+def _formatear(monedas):
+    return [
+        {"label": f"{c['id'].capitalize()} ({c['symbol'].upper()})", "value": c["id"]}
+        for c in monedas
+    ]
+
+
+def _leer_monedas_disco():
+    try:
+        with open(RUTA_MONEDAS, encoding="utf-8") as f:
+            datos = json.load(f)
+        return datos["monedas"], datos["actualizado"]
+    except (OSError, ValueError, KeyError):
+        return None, 0.0
+
+
+def descargar_monedas():
+    """
+    Pide solo las monedas comunes (/coins/markets?ids=...) en lugar de la
+    lista completa de /coins/list, y guarda el resultado en disco.
+    """
+    ids = ",".join(c for c, _ in MONEDAS_COMUNES)
+    try:
+        r = sesion().get(f"{API_URL}/coins/markets",
+                         params={"vs_currency": "usd", "ids": ids}, timeout=TIMEOUT)
+        datos = r.json()
+        por_id = {c["id"]: c["symbol"] for c in datos}
+    except (requests.RequestException, ValueError, KeyError, TypeError):
+        return None
+
+    monedas = [{"id": c, "symbol": por_id[c]} for c, _ in MONEDAS_COMUNES if c in por_id]
+    if not monedas:
+        return None
+    os.makedirs(os.path.dirname(RUTA_MONEDAS) or ".", exist_ok=True)
+    tmp = RUTA_MONEDAS + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"monedas": monedas, "actualizado": time.time()}, f)
+    os.replace(tmp, RUTA_MONEDAS)
+    return monedas
+
+
+def _refrescar():
+    try:
+        descargar_monedas()
+    finally:
+        _refresco_en_curso.clear()
+
+
+def opciones_monedas(refrescar=True):
+    """
+    Opciones del selector sin tocar la red: copia en disco si existe, si no
+    la lista empaquetada. Si la copia falta o está vieja y `refrescar`
+    es True, se actualiza en un hilo aparte para la próxima visita.
+    """
+    monedas, actualizado = _leer_monedas_disco()
+    if refrescar and time.time() - actualizado > TTL_MONEDAS and not _refresco_en_curso.is_set():
+        _refresco_en_curso.set()
+        threading.Thread(target=_refrescar, name="coingecko-monedas", daemon=True).start()
+    if not monedas:
+        monedas = [{"id": c, "symbol": s} for c, s in MONEDAS_COMUNES]
+    return _formatear(monedas)
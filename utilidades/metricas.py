@@ -0,0 +1,208 @@
+import bisect
+import functools
+import threading
+import time
+
+import flask
+
+from utilidades.cache import estadisticas_caches
+
+# ------------------------------------------------------
+# Latencia por callback y endpoint /metrics (formato Prometheus)
+# ------------------------------------------------------
+# Cada petición a /_dash-update-component se mide desde Flask: duración
+# total y bytes de la respuesta, etiquetadas con el id del callback
+# (su "output", p. ej. "graph-seir.figure").
+#
+# Los callbacks decorados con @instrumentar reparten además su tiempo en
+# fases: lo que corre dentro de `with fase("figura")` cuenta como
+# construcción de la figura, `with fase("serializacion")` (lo usa
+# compactar_figura) como serialización, y el resto de la función como
+# cómputo. Lo que pasa entre el return del callback y el envío de la
+# respuesta (validación y to_json de Dash) también es serialización.
+#
+# Los contadores viven en memoria del proceso: con varios workers de
+# gunicorn cada uno expone los suyos. Los callbacks en segundo plano
+# corren en otro proceso, así que de ellos solo se ven total y bytes de
+# la petición que entrega el resultado.
+
+RUTA_CALLBACKS = "/_dash-update-component"
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BUCKETS_BYTES = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7)
+
+FASES = ("computo", "figura", "serializacion")
+
+
+class Histograma:
+    """Histograma acumulado con los buckets fijos de Prometheus (le=...)."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.cuentas = [0] * (len(self.buckets) + 1)   # el último es +Inf
+        self.suma = 0.0
+
+    def observar(self, valor):
+        self.cuentas[bisect.bisect_left(self.buckets, valor)] += 1
+        self.suma += valor
+
+    def lineas(self, nombre, etiquetas):
+        acumulado = 0
+        for limite, cuenta in zip(self.buckets + (float("inf"),), self.cuentas):
+            acumulado += cuenta
+            le = "+Inf" if limite == float("inf") else f"{limite:g}"
+            yield f'{nombre}_bucket{_etiquetas(etiquetas, le=le)} {acumulado}'
+        yield f"{nombre}_sum{_etiquetas(etiquetas)} {self.suma:.6g}"
+        yield f"{nombre}_count{_etiquetas(etiquetas)} {acumulado}"
+
+
+class Registro:
+    """Familias de histogramas: nombre -> {etiquetas -> Histograma}."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._familias = {}   # nombre -> (ayuda, buckets, {etiquetas: Histograma})
+
+    def familia(self, nombre, ayuda, buckets):
+        self._familias.setdefault(nombre, (ayuda, buckets, {}))
+
+    def observar(self, nombre, valor, **etiquetas):
+        _, buckets, series = self._familias[nombre]
+        clave = tuple(sorted(etiquetas.items()))
+        with self._lock:
+            if clave not in series:
+                series[clave] = Histograma(buckets)
+            series[clave].observar(valor)
+
+    def exportar(self):
+        lineas = []
+        with self._lock:
+            for nombre, (ayuda, _, series) in self._familias.items():
+                lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} histogram"]
+                for clave, h in sorted(series.items()):
+                    lineas += h.lineas(nombre, dict(clave))
+        return lineas
+
+
+REGISTRO = Registro()
+REGISTRO.familia("dash_callback_seconds",
+                 "Duración de los callbacks de Dash por fase (computo, figura, serializacion, total).",
+                 BUCKETS_SEGUNDOS)
+REGISTRO.familia("dash_callback_response_bytes",
+                 "Tamaño del cuerpo de la respuesta de cada callback.", BUCKETS_BYTES)
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _etiquetas(etiquetas, **extra):
+    todas = {**etiquetas, **extra}
+    if not todas:
+        return ""
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in todas.items()) + "}"
+
+
+# ------------------------------------------------------
+# Fases dentro de un callback
+# ------------------------------------------------------
+class fase:
+    """
+    Context manager que suma el tiempo de un bloque a la fase `nombre` de
+    la petición en curso. Las fases anidadas se descuentan de la externa.
+    Fuera de una petición de Flask (scripts, procesos de fondo) no hace nada.
+    """
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.activa = False
+
+    def __enter__(self):
+        if not flask.has_request_context() or "metricas_fases" not in flask.g:
+            return self
+        self.activa = True
+        self.hijos = 0.0
+        flask.g.metricas_pila.append(self)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if not self.activa:
+            return False
+        duracion = time.perf_counter() - self.t0
+        pila = flask.g.metricas_pila
+        pila.pop()
+        fases = flask.g.metricas_fases
+        fases[self.nombre] = fases.get(self.nombre, 0.0) + duracion - self.hijos
+        if pila:
+            pila[-1].hijos += duracion
+        return False
+
+
+def instrumentar(funcion):
+    """Decorador (debajo de @callback) que mide las fases del callback."""
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        if not flask.has_request_context():
+            return funcion(*args, **kwargs)
+        flask.g.metricas_fases = {}
+        flask.g.metricas_pila = []
+        try:
+            with fase("computo"):
+                return funcion(*args, **kwargs)
+        finally:
+            flask.g.metricas_fin_callback = time.perf_counter()
+    return envoltura
+
+
+# ------------------------------------------------------
+# Enganche con el servidor Flask
+# ------------------------------------------------------
+def _id_callback():
+    cuerpo = flask.request.get_json(silent=True) or {}
+    return cuerpo.get("output", "desconocido")
+
+
+def registrar(server, ruta="/metrics"):
+    """Mide las peticiones de callbacks de `server` y publica `ruta`."""
+
+    @server.before_request
+    def _inicio_callback():
+        if flask.request.path.endswith(RUTA_CALLBACKS):
+            flask.g.metricas_inicio = time.perf_counter()
+
+    @server.after_request
+    def _fin_callback(respuesta):
+        inicio = flask.g.get("metricas_inicio")
+        if inicio is None:
+            return respuesta
+        ahora = time.perf_counter()
+        callback = _id_callback()
+        REGISTRO.observar("dash_callback_seconds", ahora - inicio, callback=callback, fase="total")
+        fases = flask.g.get("metricas_fases")
+        if fases is not None:
+            fases["serializacion"] = fases.get("serializacion", 0.0) + ahora - flask.g.metricas_fin_callback
+            for nombre in FASES:
+                REGISTRO.observar("dash_callback_seconds", fases.get(nombre, 0.0), callback=callback, fase=nombre)
+        if not respuesta.direct_passthrough:
+            REGISTRO.observar("dash_callback_response_bytes", len(respuesta.get_data()), callback=callback)
+        return respuesta
+
+    @server.route(ruta)
+    def _metricas():
+        return exportar(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+
+def exportar():
+    """Texto de /metrics: histogramas de callbacks y contadores de las cachés."""
+    lineas = REGISTRO.exportar()
+    caches = estadisticas_caches()
+    for nombre, clave, tipo, ayuda in (
+        ("cache_hits_total", "aciertos", "counter", "Aciertos de la caché de resultados."),
+        ("cache_misses_total", "fallos", "counter", "Fallos de la caché de resultados."),
+        ("cache_evictions_total", "desalojos", "counter", "Entradas desalojadas por falta de espacio."),
+        ("cache_bytes", "bytes", "gauge", "Bytes ocupados por la caché."),
+    ):
+        lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}"]
+        lineas += [f"{nombre}{_etiquetas({'cache': c})} {e[clave]}" for c, e in sorted(caches.items())]
+    return "\n".join(lineas) + "\n"
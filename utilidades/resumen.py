@@ -0,0 +1,76 @@
+import dash
+from dash import Input, Output, html
+
+from modelos.sir import TOL_DEFECTO, contrastar_trayectoria
+from modelos.tablas_sir import resumen_sir
+from utilidades.metricas import instrumentar
+
+# ------------------------------------------------------
+# Resumen del SIR (pico y tamaño final) compartido por las páginas
+# ------------------------------------------------------
+# El resumen no integra: pico y tamaño final salen de la cantidad
+# conservada (Lambert W) y el tiempo del pico de las tablas de
+# modelos/tablas_sir.py (que integran el punto solo si faltan o si cae
+# fuera de la malla). Contrastarlo con la curva del integrador adaptativo
+# (la misma que dibuja la página) sí integra, así que solo se hace al
+# pulsar el botón.
+
+ESTILO_NOTA = {"fontSize": "12px", "color": "#555"}
+
+
+def tarjeta_resumen(id_resumen):
+    """Tarjeta con el resumen, el botón de contraste y su resultado."""
+    return html.Div(className="card", children=[
+        html.Div(id=id_resumen),
+        html.Button("Contrastar con la curva numérica", id=f"{id_resumen}-btn", n_clicks=0,
+                    style={"padding": "6px 10px"}),
+        html.Div(id=f"{id_resumen}-contraste", style=ESTILO_NOTA),
+    ])
+
+
+def registrar_resumen(id_resumen, parametros, modelo, etiqueta_pico, etiqueta_final):
+    """
+    Callbacks de la tarjeta `id_resumen`. `parametros` son los ids de β, γ,
+    S0, I0 y la tolerancia; `modelo(beta, gamma, S0, I0, R0, tol=...)` es
+    el integrador de la página (devuelve t, S, I, R y estadísticas).
+    """
+    beta, gamma, S0, I0, tol = parametros
+
+    @dash.callback(
+        Output(id_resumen, "children"),
+        *(Input(p, "value") for p in (beta, gamma, S0, I0)),
+    )
+    @instrumentar
+    def actualizar_resumen(beta, gamma, S0, I0):
+        resumen, origen = resumen_sir(beta, gamma, S0, I0)
+        if resumen is None:
+            return html.P("Sin resumen: se requiere γ > 0, β ≥ 0, S0 > 0 e I0 > 0.", className="page-text")
+        return [
+            html.P(f"{etiqueta_pico}: {resumen['pico_i']:.4f} en t ≈ {resumen['t_pico']:.1f}", className="page-text"),
+            html.P(f"{etiqueta_final} (S0 − S(∞)): {resumen['tamano_final']:.4f}", className="page-text"),
+            html.P(f"Tiempo del pico: {origen}.", style=ESTILO_NOTA),
+        ]
+
+    # cualquier cambio de parámetros borra el contraste anterior; solo el
+    # botón integra
+    @dash.callback(
+        Output(f"{id_resumen}-contraste", "children"),
+        Input(f"{id_resumen}-btn", "n_clicks"),
+        *(Input(p, "value") for p in (beta, gamma, S0, I0, tol)),
+        prevent_initial_call=True,
+    )
+    @instrumentar
+    def contrastar(_, beta, gamma, S0, I0, tol):
+        if dash.ctx.triggered_id != f"{id_resumen}-btn":
+            return None
+        resumen, _ = resumen_sir(beta, gamma, S0, I0)
+        if resumen is None:
+            return None
+        t, S, I, _, _ = modelo(beta, gamma, S0, I0, 0.0, tol=tol or TOL_DEFECTO)
+        contraste = contrastar_trayectoria(resumen, beta, gamma, S, I)
+        final = (f"tamaño final {contraste['error_final']:.2%}" if contraste["error_final"] is not None
+                 else f"la curva aún no termina en t = {t[-1]:g}")
+        return (f"Diferencia con la curva numérica: pico {contraste['error_pico']:.2%}, {final}; "
+                f"deriva de S + I − (γ/β)·ln S: {contraste['deriva']:.1e}.")
+
+    return actualizar_resumen, contrastar
@@ -0,0 +1,118 @@
+import base64
+import os
+
+import numpy as np
+
+from utilidades.metricas import fase
+
+# ------------------------------------------------------
+# Serialización compacta de figuras (opcional: FIGURAS_COMPACTAS=1)
+# ------------------------------------------------------
+# Los arreglos numéricos de las trazas se envían como "typed arrays" en
+# base64 ({"dtype": "f4", "bdata": ...}, formato que plotly.js entiende
+# desde la 2.28), en float32 cuando el redondeo no se nota en pantalla.
+# Con orjson instalado se usa además como codificador JSON de plotly.
+
+ACTIVO = os.environ.get("FIGURAS_COMPACTAS") == "1"
+
+# error de float32 admitido, relativo al rango de la serie (muy por
+# debajo de un píxel en cualquier gráfico de la app)
+TOLERANCIA_F32 = 1e-5
+CLAVES_ARREGLO = ("x", "y", "z")
+_DTYPES = {"f4": np.float32, "f8": np.float64, "i4": np.int32, "i2": np.int16, "u1": np.uint8}
+
+if ACTIVO:
+    try:
+        import orjson  # noqa: F401
+        import plotly.io as pio
+        pio.json.config.default_engine = "orjson"
+    except ImportError:
+        pass
+
+
+def a_float32_si_cabe(a):
+    """Devuelve `a` en float32 si el error de redondeo es despreciable."""
+    if a.dtype != np.float64 or a.size == 0:
+        return a
+    finitos = a[np.isfinite(a)]
+    if finitos.size == 0:
+        return a.astype(np.float32)
+    a32 = a.astype(np.float32)
+    with np.errstate(invalid="ignore", over="ignore"):
+        error = np.nanmax(np.abs(a32.astype(np.float64) - a))
+    rango = float(finitos.max() - finitos.min()) or float(np.abs(finitos).max()) or 1.0
+    return a32 if np.isfinite(error) and error <= TOLERANCIA_F32 * rango else a
+
+
+def codificar_arreglo(a, float32=True):
+    """Arreglo numérico -> {"dtype", "bdata"}; otros tipos se devuelven tal cual."""
+    a = np.asarray(a)
+    if a.dtype.kind not in "fiu" or a.ndim == 0:
+        return a
+    if float32:
+        a = a_float32_si_cabe(a.astype(np.float64, copy=False))
+    if a.dtype.kind in "iu":
+        a = a.astype(np.int32)
+    tipo = next((k for k, v in _DTYPES.items() if a.dtype == v), None)
+    if tipo is None:
+        a, tipo = a.astype(np.float64), "f8"
+    codificado = {"dtype": tipo, "bdata": base64.b64encode(np.ascontiguousarray(a).tobytes()).decode("ascii")}
+    if a.ndim > 1:
+        codificado["shape"] = ", ".join(str(n) for n in a.shape)
+    return codificado
+
+
+def decodificar_arreglo(valor):
+    """{"dtype", "bdata"} (como lo emite plotly >= 6) -> np.ndarray."""
+    a = np.frombuffer(base64.b64decode(valor["bdata"]), dtype=_DTYPES.get(valor["dtype"], valor["dtype"]))
+    if "shape" in valor:
+        a = a.reshape([int(n) for n in str(valor["shape"]).split(",")])
+    return a
+
+
+def compactar_figura(fig, float32=True, forzar=False):
+    """
+    Figura (go.Figure o dict) lista para devolver desde un callback. Si el
+    modo compacto está desactivado (y no se fuerza) la devuelve sin tocar.
+    """
+    if not (ACTIVO or forzar):
+        return fig
+    with fase("serializacion"):
+        if isinstance(fig, dict):
+            datos = {**fig, "data": [dict(t) for t in fig.get("data", [])]}
+        else:
+            datos = fig.to_dict()
+        for traza in datos.get("data", []):
+            for clave in CLAVES_ARREGLO:
+                valor = traza.get(clave)
+                if isinstance(valor, dict) and "bdata" in valor:
+                    valor = decodificar_arreglo(valor)
+                if isinstance(valor, (np.ndarray, list, tuple)) and len(valor) > 0:
+                    traza[clave] = codificar_arreglo(valor, float32)
+    return datos
+
+
+# ------------------------------------------------------
+# Actualizaciones parciales de figuras (dash.Patch)
+# ------------------------------------------------------
+# En lugar de reconstruir la figura, los callbacks reemplazan solo los
+# arreglos de las trazas (y los textos que cambian) de una figura base
+# que ya está en el navegador: layout y plantilla no viajan de nuevo.
+
+def parche_trazas(*trazas, parche=None):
+    """
+    Patch que asigna, en la traza i, las claves del dict trazas[i] (None
+    deja la traza sin tocar). Como en compactar_figura, x/y/z solo se
+    codifican (base64, float32 si cabe) si ACTIVO; si no, los arreglos
+    van como listas JSON, sin depender de que plotly.js lea typed arrays.
+    """
+    from dash import Patch
+
+    parche = Patch() if parche is None else parche
+    with fase("serializacion"):
+        for i, campos in enumerate(trazas):
+            for clave, valor in (campos or {}).items():
+                if ACTIVO and clave in CLAVES_ARREGLO:
+                    valor = codificar_arreglo(valor)
+                parche["data"][i][clave] = valor
+    return parche
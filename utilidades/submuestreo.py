@@ -0,0 +1,147 @@
+import os
+
+import numpy as np
+
+# ------------------------------------------------------
+# Submuestreo LTTB (Largest-Triangle-Three-Buckets) para las gráficas
+# ------------------------------------------------------
+# Un gráfico no puede mostrar más de un punto por píxel horizontal, así
+# que cada serie se reduce a ese presupuesto antes de construir las
+# trazas. LTTB elige en cada tramo el punto que forma el triángulo de
+# mayor área con sus vecinos, por lo que conserva picos y valles.
+
+ANCHO_PX = int(os.environ.get("GRAFICO_ANCHO_PX", 1000))
+PUNTOS_POR_PX = 1.0
+
+
+def presupuesto(ancho_px=None):
+    """Número de puntos por serie para un gráfico de `ancho_px` píxeles."""
+    return max(3, int((ancho_px or ANCHO_PX) * PUNTOS_POR_PX))
+
+
+def _numerico(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def indices_lttb(x, y, n_salida=None):
+    """
+    Índices (ordenados) de los puntos que LTTB conserva de la serie (x, y).
+    x debe ser creciente; puede ser numérico o datetime64.
+    """
+    n_salida = presupuesto() if n_salida is None else int(n_salida)
+    N = len(y)
+    if n_salida >= N or n_salida < 3:
+        return np.arange(N)
+
+    x = _numerico(x)
+    y = np.asarray(y, dtype=float)
+
+    # bordes de los n_salida - 2 tramos interiores (el primero y el último
+    # punto se conservan siempre)
+    bordes = (np.arange(n_salida - 1) * (N - 2) / (n_salida - 2)).astype(np.int64) + 1
+    bordes[-1] = N - 1
+
+    idx = np.empty(n_salida, dtype=np.int64)
+    idx[0], idx[-1] = 0, N - 1
+    a = 0
+    for i in range(n_salida - 2):
+        lo, hi = bordes[i], bordes[i + 1]
+        # promedio del tramo siguiente (el último punto en el último tramo)
+        sig_lo, sig_hi = (bordes[i + 1], bordes[i + 2]) if i + 2 < len(bordes) else (N - 1, N)
+        mx = x[sig_lo:sig_hi].mean()
+        my = np.nanmean(y[sig_lo:sig_hi]) if np.isfinite(y[sig_lo:sig_hi]).any() else y[a]
+
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - mx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (my - ay))
+        area = np.where(np.isfinite(area), area, -1.0)
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+
+    return idx
+
+
+def lttb(x, y, n_salida=None):
+    """Serie (x, y) reducida a n_salida puntos con LTTB."""
+    idx = indices_lttb(x, y, n_salida)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
+
+
+def indices_lttb_varias(x, ys, n_salida=None):
+    """
+    Índices comunes para varias series que comparten x (por ejemplo S, E,
+    I, R): unión de los índices LTTB de cada una, para que ningún pico se
+    pierda y todas las trazas sigan compartiendo el mismo eje.
+    """
+    return np.unique(np.concatenate([indices_lttb(x, y, n_salida) for y in ys]))
+
+
+# ------------------------------------------------------
+# Muestreo de soluciones densas (interpolantes de solve_ivp)
+# ------------------------------------------------------
+# Con el interpolante de la integración no hace falta fijar de antemano
+# cuántos puntos se guardan: cada vista se evalúa a la resolución de la
+# pantalla, solo en el tramo visible.
+
+SOBREMUESTREO = 4
+
+
+def muestrear_denso(sol, t0, t1, n_salida=None):
+    """
+    Evalúa el interpolante `sol` en [t0, t1] con una malla uniforme
+    SOBREMUESTREO veces más fina que el presupuesto y conserva, en cada
+    tramo de la malla, el mínimo y el máximo de cada variable (así no se
+    pierden los picos y no hace falta el bucle de LTTB). Devuelve t y Y
+    (forma (n_variables, len(t))).
+    """
+    n_salida = presupuesto() if n_salida is None else int(n_salida)
+    tramos = max(1, n_salida // 2)
+    t = np.linspace(t0, t1, tramos * 2 * SOBREMUESTREO)
+    Y = np.atleast_2d(sol(t))
+    bloques = Y.reshape(len(Y), tramos, 2 * SOBREMUESTREO)
+    inicio = np.arange(tramos) * 2 * SOBREMUESTREO
+    k = np.unique(np.concatenate([
+        (inicio + bloques.argmin(axis=2)).ravel(),
+        (inicio + bloques.argmax(axis=2)).ravel(),
+        [0, len(t) - 1],
+    ]))
+    return t[k], Y[:, k]
+
+
+def muestrear_denso_caja(sol, caja, n_salida=None, submuestras_por_paso=8):
+    """
+    Trayectoria de un sistema 2D dentro de la caja ((x0, x1), (y0, y1)):
+    localiza en qué tramos de tiempo está dentro (a partir de los pasos
+    del integrador) y reparte entre ellos n_salida puntos uniformes. Los
+    tramos se separan con NaN. Devuelve x, y.
+    """
+    n_salida = presupuesto() if n_salida is None else int(n_salida)
+    (x0, x1), (y0, y1) = caja
+
+    # localización: unas cuantas muestras por paso del integrador
+    pasos = np.asarray(sol.ts)
+    u = np.arange((len(pasos) - 1) * submuestras_por_paso + 1) / submuestras_por_paso
+    t = np.interp(u, np.arange(len(pasos)), pasos)
+    X, Y = sol(t)
+    dentro = (X >= x0) & (X <= x1) & (Y >= y0) & (Y <= y1)
+    # un punto de margen a cada lado para que los tramos lleguen al borde
+    dentro[1:] |= dentro[:-1].copy()
+    dentro[:-1] |= dentro[1:].copy()
+    if not dentro.any():
+        return np.array([]), np.array([])
+
+    # tramos consecutivos dentro de la caja
+    bordes = np.diff(np.r_[0, dentro.astype(np.int8), 0])
+    inicios, finales = np.flatnonzero(bordes == 1), np.flatnonzero(bordes == -1) - 1
+    duraciones = t[finales] - t[inicios]
+    total = duraciones.sum() or 1.0
+
+    xs, ys = [], []
+    for a, b, d in zip(inicios, finales, duraciones):
+        tt = np.linspace(t[a], t[b], max(2, int(n_salida * d / total)))
+        xx, yy = sol(tt)
+        xs += [xx, [np.nan]]
+        ys += [yy, [np.nan]]
+    return np.concatenate(xs[:-1]), np.concatenate(ys[:-1])
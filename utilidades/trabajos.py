@@ -0,0 +1,131 @@
+import functools
+import os
+import time
+
+import dash
+
+from utilidades.cache import CACHES, CacheLRU
+
+# ------------------------------------------------------
+# Trabajos en segundo plano (callbacks "background" de Dash)
+# ------------------------------------------------------
+# Con diskcache instalado (dash[diskcache]) los cálculos largos corren en
+# procesos aparte gestionados por DiskcacheManager: el worker web queda
+# libre, la página muestra el progreso y el usuario puede cancelar. Sin
+# diskcache los mismos callbacks se ejecutan en el worker, sin progreso.
+
+RUTA_TRABAJOS = os.environ.get(
+    "TRABAJOS_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "trabajos"),
+)
+EXPIRACION = 3600
+ALMACEN_MB = float(os.environ.get("TRABAJOS_ALMACEN_MB", 256))
+
+
+def _crear_gestor():
+    try:
+        import diskcache
+    except ImportError:
+        return None
+    return dash.DiskcacheManager(diskcache.Cache(RUTA_TRABAJOS), expire=EXPIRACION)
+
+
+GESTOR = _crear_gestor()
+
+
+# ------------------------------------------------------
+# Resultados compartidos entre procesos
+# ------------------------------------------------------
+# Lo que un trabajo deja para callbacks posteriores (p. ej. el
+# interpolante de una integración, que luego se evalúa al hacer zoom) se
+# guarda junto a los trabajos, en disco, para que lo vea cualquier
+# proceso. Sin diskcache todo corre en el worker y basta una caché local.
+
+def _crear_almacen():
+    try:
+        import diskcache
+    except ImportError:
+        return CacheLRU("resultados_trabajos", ALMACEN_MB * 2**20)
+    almacen = diskcache.Cache(os.path.join(RUTA_TRABAJOS, "resultados"), size_limit=int(ALMACEN_MB * 2**20))
+    ContadoresAlmacen(almacen)
+    return almacen
+
+
+class ContadoresAlmacen:
+    """
+    Aciertos y fallos del almacén en disco para /metrics, con la misma
+    forma que CacheLRU.estadisticas. diskcache los cuenta en su propia
+    base, así que incluyen las lecturas de los procesos de los trabajos.
+    diskcache no cuenta desalojos.
+    """
+
+    def __init__(self, almacen, nombre="resultados_trabajos"):
+        self.almacen = almacen
+        almacen.stats(enable=True)
+        CACHES[nombre] = self
+
+    def estadisticas(self):
+        aciertos, fallos = self.almacen.stats()
+        return {
+            "aciertos": aciertos,
+            "fallos": fallos,
+            "desalojos": 0,
+            "entradas": len(self.almacen),
+            "bytes": self.almacen.volume(),
+            "max_bytes": self.almacen.size_limit,
+        }
+
+
+ALMACEN = _crear_almacen()
+
+
+def guardar_resultado(clave, valor):
+    if isinstance(ALMACEN, CacheLRU):
+        ALMACEN.guardar(clave, valor)
+    else:
+        ALMACEN.set(clave, valor, expire=EXPIRACION)
+
+
+def leer_resultado(clave):
+    """Valor guardado con `guardar_resultado`, o None si expiró o no existe."""
+    if isinstance(ALMACEN, CacheLRU):
+        return ALMACEN.obtener(clave)[1]
+    return ALMACEN.get(clave)
+
+
+def callback_en_fondo(*dependencias, progress=None, cancel=None, running=None, **kwargs):
+    """
+    Como dash.callback, pero como trabajo en segundo plano cuando hay
+    gestor. La función recibe siempre `set_progress` como primer argumento
+    (sin gestor es una función que no hace nada).
+    """
+    def decorador(func):
+        if GESTOR is not None:
+            return dash.callback(
+                *dependencias, background=True, manager=GESTOR,
+                progress=progress, cancel=cancel, running=running, **kwargs
+            )(func)
+
+        @functools.wraps(func)
+        def sincrono(*args):
+            return func(lambda *_: None, *args)
+
+        return dash.callback(*dependencias, running=running, **kwargs)(sincrono)
+
+    return decorador
+
+
+def limitar(set_progress, intervalo=0.25):
+    """
+    Envuelve set_progress para no escribir en el gestor más de una vez
+    cada `intervalo` segundos (cada escritura es un acceso a disco).
+    """
+    ultimo = [0.0]
+
+    def informar(*valores):
+        ahora = time.perf_counter()
+        if ahora - ultimo[0] >= intervalo:
+            ultimo[0] = ahora
+            set_progress(*valores)
+
+    return informar